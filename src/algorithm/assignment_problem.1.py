@@ -1,5 +1,8 @@
 import pulp
 
+from assignment_problem import bottleneck_assignment
+from solver import solve
+
 
 """
 指派问题
@@ -18,10 +21,8 @@ import pulp
 """
 
 
-def solve_assignment():
-    # 创建问题
-    prob = pulp.LpProblem("工作分配问题", pulp.LpMinimize)
-
+def solve_assignment(backend="bottleneck"):
+    """backend="bottleneck" 使用内置瓶颈指派算法，backend="pulp" 使用 PuLP 混合整数规划模型"""
     # 定义工人和岗位
     workers = ["甲", "乙", "丙", "丁"]
     positions = ["A", "B", "C", "D"]
@@ -34,6 +35,21 @@ def solve_assignment():
         "丁": {"A": 4, "B": 6, "C": 5, "D": 6},
     }
 
+    if backend == "bottleneck":
+        matrix = [[times[w][p] for p in positions] for w in workers]
+        max_time, rows, cols = bottleneck_assignment(matrix)
+        print(f"最短完成时间：{max_time}小时")
+        print("\n分配方案：")
+        for r, c in zip(rows, cols):
+            w, p = workers[r], positions[c]
+            print(f"{w}分配到岗位{p}，完成时间：{times[w][p]}小时")
+        return
+    if backend != "pulp":
+        raise ValueError(f"未知的求解后端：{backend}")
+
+    # 创建问题
+    prob = pulp.LpProblem("工作分配问题", pulp.LpMinimize)
+
     # 创建决策变量
     x = pulp.LpVariable.dicts(
         "assign", ((w, p) for w in workers for p in positions), cat="Binary"
@@ -59,7 +75,7 @@ def solve_assignment():
             prob += max_time >= times[w][p] * x[w, p]
 
     # 求解
-    prob.solve()
+    solve(prob)
 
     # 输出结果
     if pulp.LpStatus[prob.status] == "Optimal":
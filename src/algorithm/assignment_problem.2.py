@@ -1,5 +1,10 @@
+from collections import deque, namedtuple
+
+import numpy as np
 import pulp
 
+from maximum_flow import dinic_max_flow
+from solver import solve, solve_matrix
 
 """
 指派问题（运输优化问题）
@@ -17,10 +22,523 @@ import pulp
 """
 
 
-def solve_transportation():
-    # 创建运输优化问题
-    prob = pulp.LpProblem("运输优化问题", pulp.LpMinimize)
+# 运输问题结果：运输量矩阵、总成本、各供应点剩余量、各需求点未满足量
+TransportationResult = namedtuple(
+    "TransportationResult", ["flows", "cost", "unused_supply", "unmet_demand"]
+)
+
+
+def _to_lanes(lanes, m, n):
+    """把稀疏 (供应点, 需求点, 单价) 三元组转换为线路数组 (供应点下标, 需求点下标, 单价)
+
+    只保存给出的线路，不生成 m×n 矩阵；位势法定价也只扫描这些线路。
+    """
+    triples = np.asarray(list(lanes), dtype=float)
+    if triples.size == 0:
+        triples = triples.reshape(0, 3)
+    if triples.ndim != 2 or triples.shape[1] != 3:
+        raise ValueError(f"线路应为 (k, 3) 的三元组，实际形状为 {triples.shape}")
+    rows = triples[:, 0].astype(np.int64)
+    cols = triples[:, 1].astype(np.int64)
+    if len(triples) and (
+        rows.min() < 0 or cols.min() < 0 or rows.max() >= m or cols.max() >= n
+    ):
+        raise ValueError("线路的供应点或需求点下标越界")
+    return rows, cols, triples[:, 2]
+
+
+def _two_smallest(sub, idx):
+    """每行最小、次小值及其位置（idx 为列的全局下标），只剩一列时次小值为 inf、位置为 -1"""
+    k = len(sub)
+    if sub.shape[1] == 1:
+        return (
+            idx[np.zeros(k, dtype=int)],
+            np.full(k, -1),
+            sub[:, 0],
+            np.full(k, np.inf),
+        )
+    part = np.argpartition(sub, 1, axis=1)[:, :2]
+    vals = np.take_along_axis(sub, part, axis=1)
+    swap = vals[:, 1] < vals[:, 0]
+    part[swap] = part[swap][:, ::-1]
+    vals[swap] = vals[swap][:, ::-1]
+    return idx[part[:, 0]], idx[part[:, 1]], vals[:, 0], vals[:, 1]
+
+
+def _vogel_initial_basis(cost, supply, demand):
+    """Vogel 近似法（VAM）求初始基可行解，返回 {(i, j): 运量}，恰好 m+n-1 个基格
+
+    每行/列缓存最小与次小单价，只在其依赖的行/列被划去时重新计算，避免每步扫描整个矩阵。
+    """
+    m, n = cost.shape
+    s = supply.astype(float)
+    d = demand.astype(float)
+    row_active = np.ones(m, dtype=bool)
+    col_active = np.ones(n, dtype=bool)
+    row_best = np.zeros(m, dtype=int)
+    row_v1 = np.zeros(m)
+    row_v2 = np.zeros(m)
+    col_best = np.zeros(n, dtype=int)
+    col_v1 = np.zeros(n)
+    col_v2 = np.zeros(n)
+    # 行缓存依赖的两列，列缓存依赖的两行，用于判断划线后是否需要刷新
+    row_dep = np.zeros((m, 2), dtype=int)
+    col_dep = np.zeros((n, 2), dtype=int)
+
+    def refresh_rows(rows):
+        cols = np.flatnonzero(col_active)
+        if len(rows) == 0 or len(cols) == 0:
+            return
+        best, second, v1, v2 = _two_smallest(cost[np.ix_(rows, cols)], cols)
+        row_best[rows], row_v1[rows], row_v2[rows] = best, v1, v2
+        row_dep[rows, 0], row_dep[rows, 1] = best, second
+
+    def refresh_cols(cols):
+        rows = np.flatnonzero(row_active)
+        if len(cols) == 0 or len(rows) == 0:
+            return
+        best, second, v1, v2 = _two_smallest(cost[np.ix_(rows, cols)].T, rows)
+        col_best[cols], col_v1[cols], col_v2[cols] = best, v1, v2
+        col_dep[cols, 0], col_dep[cols, 1] = best, second
+
+    refresh_rows(np.arange(m))
+    refresh_cols(np.arange(n))
+
+    basis = {}
+    last_row = last_col = 0
+    while row_active.any() and col_active.any():
+        rows = np.flatnonzero(row_active)
+        cols = np.flatnonzero(col_active)
+        # 罚数 = 次小单价 - 最小单价；只剩一个格子时取该格单价
+        row_pen = np.where(
+            np.isinf(row_v2[rows]), row_v1[rows], row_v2[rows] - row_v1[rows]
+        )
+        col_pen = np.where(
+            np.isinf(col_v2[cols]), col_v1[cols], col_v2[cols] - col_v1[cols]
+        )
+        r = int(np.argmax(row_pen))
+        c = int(np.argmax(col_pen))
+        if row_pen[r] >= col_pen[c]:
+            i = rows[r]
+            j = row_best[i]
+        else:
+            j = cols[c]
+            i = col_best[j]
+        x = min(s[i], d[j])
+        basis[i, j] = x
+        s[i] -= x
+        d[j] -= x
+        last_row, last_col = i, j
+        # 每步只划去一条线（同时满足时划行，最后一行除外），保证基格数为 m+n-1
+        if s[i] <= 0 and (d[j] > 0 or len(rows) > 1):
+            row_active[i] = False
+            refresh_cols(np.flatnonzero(col_active & (col_dep == i).any(axis=1)))
+        else:
+            col_active[j] = False
+            refresh_rows(np.flatnonzero(row_active & (row_dep == j).any(axis=1)))
+
+    # 浮点误差导致剩余的行或列，以 0 运量接入最后一个基格所在的行/列，补全生成树
+    for j in np.flatnonzero(col_active):
+        basis.setdefault((last_row, j), 0.0)
+    for i in np.flatnonzero(row_active):
+        basis.setdefault((i, last_col), 0.0)
+    return basis
+
+
+def transportation_simplex(
+    supply, demand, costs=None, lanes=None, max_iterations=None
+):
+    """运输单纯形法（位势法 MODI 的网络单纯形实现），返回 TransportationResult
+
+    supply、demand 为供应量、需求量数组；costs 与 lanes 恰好给出其一：costs 为 m×n 稠密成本矩阵
+    （inf 表示禁止），lanes 为稀疏三元组 (供应点下标, 需求点下标, 单价) 的可迭代对象或 (k, 3) 数组
+    （未列出的线路视为禁止）。供需不平衡时自动添加虚拟需求点/供应点。存在禁止线路时先用供需割检验判断可行性。
+
+    基以生成树的父指针保存，每个树边记录方向、单价与运量。稠密输入用 Vogel 近似法求初始基，
+    禁止的格子作为大 M 人工边；三元组输入以一个人工根节点连接全部供需点作为初始基，
+    不展开为稠密矩阵。检验数只在线路数组上分块轮转计算，找到负检验数即换基；
+    换基后只有被切下的子树需要重挂，位势与深度只在该子树上更新。
+    """
+    supply = np.asarray(supply, dtype=float)
+    demand = np.asarray(demand, dtype=float)
+    m0, n0 = len(supply), len(demand)
+    if (costs is None) == (lanes is None):
+        raise ValueError("costs 与 lanes 须恰好给出其一")
+    dense = costs is not None
+    if dense:
+        cost = np.asarray(costs, dtype=float)
+        if cost.shape != (m0, n0):
+            raise ValueError(f"成本矩阵形状应为 {(m0, n0)}，实际为 {cost.shape}")
+    else:
+        lane_i, lane_j, lane_c = _to_lanes(lanes, m0, n0)
+
+    # 供需不平衡时添加虚拟节点，单价为 0（虚拟节点与所有节点之间都有线路）
+    gap = supply.sum() - demand.sum()
+    if gap > 0:
+        demand = np.append(demand, gap)
+        if dense:
+            cost = np.hstack([cost, np.zeros((m0, 1))])
+        else:
+            lane_i = np.concatenate([lane_i, np.arange(m0)])
+            lane_j = np.concatenate([lane_j, np.full(m0, n0)])
+            lane_c = np.concatenate([lane_c, np.zeros(m0)])
+    elif gap < 0:
+        supply = np.append(supply, -gap)
+        if dense:
+            cost = np.vstack([cost, np.zeros((1, n0))])
+        else:
+            lane_i = np.concatenate([lane_i, np.full(n0, m0)])
+            lane_j = np.concatenate([lane_j, np.arange(n0)])
+            lane_c = np.concatenate([lane_c, np.zeros(n0)])
+    m, n = len(supply), len(demand)
+    if dense:
+        lane_i, lane_j = np.nonzero(np.isfinite(cost))
+        lane_c = cost[lane_i, lane_j]
+    num_lanes = len(lane_c)
+    if m == 0 or n == 0:
+        return TransportationResult(
+            np.zeros((m0, n0)), 0.0, supply[:m0].copy(), demand[:n0].copy()
+        )
+
+    artificial = not dense or num_lanes < m * n
+    if num_lanes < m * n:
+        # 可行性与运量无关地由最大流判定，大 M 只需保证最优解不走人工边
+        check_transportation_feasibility(
+            dict(enumerate(supply)), dict(enumerate(demand)), zip(lane_i, lane_j)
+        )
+    # 任一交换回路至多含 min(m, n) 个 + 格和 - 格，M 超过其线路单价部分的代价即可，与运量无关
+    if num_lanes:
+        big_m = 1.0 + min(m, n) * np.ptp(lane_c) + np.abs(lane_c).max()
+    else:
+        big_m = 1.0
+
+    # 节点 0..m-1 为供应点，m..m+n-1 为需求点，m+n 为人工根节点；
+    # 树边保存在子节点上：direction 为 +1 表示边由父节点指向子节点，arc 为线路下标（人工边为 -1）
+    size = m + n + 1
+    parent = [-1] * size
+    direction = [0] * size
+    arc_cost = [0.0] * size
+    flow = [0.0] * size
+    arc = [-1] * size
+    children = [[] for _ in range(size)]
+    if dense:
+        basis_cost = np.where(np.isfinite(cost), cost, big_m)
+        basis = _vogel_initial_basis(basis_cost, supply, demand)
+        lane_of = np.full((m, n), -1, dtype=np.int64)
+        lane_of[lane_i, lane_j] = np.arange(num_lanes)
+        adjacency = [[] for _ in range(m + n)]
+        for i, j in basis:
+            adjacency[i].append(m + j)
+            adjacency[m + j].append(i)
+        root = 0
+        seen = [False] * (m + n)
+        seen[root] = True
+        queue = deque([root])
+        while queue:
+            node = queue.popleft()
+            for other in adjacency[node]:
+                if seen[other]:
+                    continue
+                seen[other] = True
+                i, j = (node, other - m) if node < m else (other, node - m)
+                parent[other] = node
+                direction[other] = 1 if other >= m else -1
+                arc_cost[other] = basis_cost[i, j]
+                flow[other] = basis[i, j]
+                arc[other] = lane_of[i, j]
+                children[node].append(other)
+                queue.append(other)
+    else:
+        # 人工根节点：供应点 -> 根 -> 需求点，单价均为大 M
+        root = m + n
+        for node in range(m + n):
+            parent[node] = root
+            direction[node] = -1 if node < m else 1
+            arc_cost[node] = big_m
+            flow[node] = supply[node] if node < m else demand[node - m]
+        children[root] = list(range(m + n))
+
+    # 生成树按先序存放：子树 x 恰为 order[pos[x] : pos[x] + subtree[x]]，
+    # 换基时子树的移动、位势与深度的平移都是数组切片操作
+    order = []
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        order.append(node)
+        stack.extend(children[node])
+    del children
+    order = np.array(order, dtype=np.int64)
+    pos = np.zeros(size, dtype=np.int64)
+    pos[order] = np.arange(len(order))
+    subtree = [1] * size
+    depth = np.zeros(size, dtype=np.int64)
+    potential = np.zeros(size)
+    for node in order[1:].tolist():
+        up = parent[node]
+        depth[node] = depth[up] + 1
+        potential[node] = potential[up] + direction[node] * arc_cost[node]
+    for node in order[:0:-1].tolist():
+        subtree[parent[node]] += subtree[node]
+
+    # 检验数 c_ij + π_i - π_j，线路 (i, j) 对应边 i -> m + j
+    lane_head = lane_j + m
+    eps = 1e-9 * (1 + (big_m if artificial else np.abs(lane_c).max(initial=0)))
+    # 运量容差按供需量的量级取，不能随包含大 M 的单价放大
+    flow_eps = 1e-9 * max(1.0, supply.max(initial=0), demand.max(initial=0))
+    block = min(num_lanes, 1 << 14)
+    cursor = 0
+    iteration = 0
+    optimal = False
+    while max_iterations is None or iteration < max_iterations:
+        # 从上次停下的位置分块轮转扫描，遇到负检验数的块即选其中最小者入基
+        entering = None
+        scanned = 0
+        while scanned < num_lanes:
+            stop = min(cursor + block, num_lanes)
+            reduced = (
+                lane_c[cursor:stop]
+                + potential[lane_i[cursor:stop]]
+                - potential[lane_head[cursor:stop]]
+            )
+            k = int(np.argmin(reduced))
+            scanned += stop - cursor
+            if reduced[k] < -eps:
+                entering = cursor + k
+                cursor = stop % num_lanes
+                break
+            cursor = stop % num_lanes
+        if entering is None:
+            optimal = True
+            break
+        iteration += 1
+
+        # 入基边 tail -> head 与树上 head 到 tail 的路径构成闭回路，两侧分别上溯到公共祖先
+        tail, head = int(lane_i[entering]), int(lane_head[entering])
+        tail_side, head_side = [], []
+        x, y = tail, head
+        while x != y:
+            if depth[x] >= depth[y]:
+                tail_side.append(x)
+                x = parent[x]
+            else:
+                head_side.append(y)
+                y = parent[y]
+        # 沿回路方向：tail 一侧由祖先向下走，顺向边增加；head 一侧向上走，逆向边减少。
+        # 从祖先出发按回路方向取最后一个阻塞边出基
+        theta = np.inf
+        leaving = None
+        for x in reversed(tail_side):
+            if direction[x] < 0 and flow[x] <= theta:
+                theta, leaving, on_head = flow[x], x, False
+        for y in head_side:
+            if direction[y] > 0 and flow[y] <= theta:
+                theta, leaving, on_head = flow[y], y, True
+        for x in tail_side:
+            flow[x] += theta if direction[x] > 0 else -theta
+        for y in head_side:
+            flow[y] += -theta if direction[y] > 0 else theta
+
+        # 删去出基边后切下以 leaving 为根的子树 T，改以入基边在 T 内的端点 inner 为根挂到 outer 下
+        inner, outer = (head, tail) if on_head else (tail, head)
+        inner_side, outer_side = (
+            (head_side, tail_side) if on_head else (tail_side, head_side)
+        )
+        cut = inner_side.index(leaving)
+        path = inner_side[: cut + 1]
+        moved = subtree[leaving]
+        start = int(pos[leaving])
+
+        # T 的新先序：inner 原子树，接着依次是路径上每个节点原子树去掉下一级分支的部分；
+        # 每段内深度平移同一个常数
+        pieces = []
+        shifts = []
+        new_depth = depth[outer] + 1
+        lo = hi = None
+        for t, node in enumerate(path):
+            node_lo, node_hi = int(pos[node]), int(pos[node]) + subtree[node]
+            if lo is None:
+                pieces.append(order[node_lo:node_hi])
+            else:
+                pieces.append(order[node_lo:lo])
+                pieces.append(order[hi:node_hi])
+                shifts.append(new_depth + t - depth[node])
+            shifts.append(new_depth + t - depth[node])
+            lo, hi = node_lo, node_hi
+        block_nodes = np.concatenate(pieces)
+        depth_shift = np.repeat(shifts, [len(piece) for piece in pieces])
+
+        # 路径上的边反向，入基边挂在 inner 上；子树大小按新的父子关系重算
+        new_parent, new_direction = outer, 1 if inner == head else -1
+        new_cost, new_flow, new_arc = lane_c[entering], theta, entering
+        below = 0
+        for node in path:
+            old = parent[node], direction[node], arc_cost[node], flow[node], arc[node]
+            parent[node], direction[node] = new_parent, new_direction
+            arc_cost[node], flow[node], arc[node] = new_cost, new_flow, new_arc
+            new_parent, new_direction = node, -old[1]
+            new_cost, new_flow, new_arc = old[2], old[3], old[4]
+            size_before = subtree[node]
+            subtree[node] = moved - below
+            below = size_before
+        # 公共祖先以上的子树大小不变，只需修正两侧回路上的节点
+        for node in inner_side[cut + 1 :]:
+            subtree[node] -= moved
+        for node in outer_side:
+            subtree[node] += moved
+
+        # 从先序中取出 T，插到 outer 子树的末尾
+        rest = np.concatenate([order[:start], order[start + moved :]])
+        outer_pos = int(pos[outer])
+        if outer_pos > start:
+            outer_pos -= moved
+        insert = outer_pos + subtree[outer] - moved
+        order = np.concatenate([rest[:insert], block_nodes, rest[insert:]])
+        lo, hi = min(start, insert), max(start, insert) + moved
+        pos[order[lo:hi]] = np.arange(lo, hi)
+
+        # T 内各树边关系不变，位势与深度整体平移
+        delta = (
+            potential[outer] + direction[inner] * lane_c[entering] - potential[inner]
+        )
+        potential[block_nodes] += delta
+        depth[block_nodes] += depth_shift
+
+    flows = np.zeros((m, n))
+    for node in range(m + n + 1):
+        if parent[node] < 0:
+            continue
+        if arc[node] >= 0:
+            flows[lane_i[arc[node]], lane_j[arc[node]]] += flow[node]
+        elif flow[node] > flow_eps:
+            if not optimal:
+                raise ValueError("达到最大迭代次数时仍有运量经由人工边，尚未得到可行解")
+            raise ValueError("运输问题无可行解：部分运量只能经由禁止的线路")
+    real = flows[:m0, :n0]
+    total_cost = float(
+        sum(flow[node] * lane_c[k] for node, k in enumerate(arc) if k >= 0)
+    )
+    unused = flows[:m0, n0] if n > n0 else np.zeros(m0)
+    unmet = flows[m0, :n0] if m > m0 else np.zeros(n0)
+    return TransportationResult(real, total_cost, unused, unmet)
+
+
+def check_transportation_feasibility(supply, demand, lanes):
+    """供需割检验：判断仅使用给定线路能否满足全部需求，不可行时抛出 ValueError
+
+    supply、demand 为 {节点: 数量} 字典，lanes 为 (供应点, 需求点, ...) 的可迭代对象。
+    先做线性时间的必要条件检查（总量、无线路的需求点），再在
+    源点 -> 供应点 -> 需求点 -> 汇点 网络上求最大流；最大流小于总需求时，
+    最小割给出一组需求点，其总需求超过与之相连的全部供应点的供应量。
+    """
+    total_demand = sum(demand.values())
+    # 供需量可能为小数，比较总量时留出相对舍入误差
+    tol = 1e-9 * max(1.0, total_demand)
+    if sum(supply.values()) < total_demand - tol:
+        raise ValueError("运输问题无可行解：总供应量小于总需求量")
+    # 没有需求（包括没有需求点或没有供应点时需求全为零）总是可行的，网络中也不存在源汇点
+    if total_demand <= tol:
+        return
+
+    network = {}
+    served = set()
+    for lane in lanes:
+        s, d = lane[0], lane[1]
+        network[("supply", s), ("demand", d)] = total_demand
+        served.add(d)
+    unreachable = [d for d, q in demand.items() if q > 0 and d not in served]
+    if unreachable:
+        raise ValueError(f"运输问题无可行解：需求点{unreachable}没有可用线路")
+
+    for s, q in supply.items():
+        network["source", ("supply", s)] = q
+    for d, q in demand.items():
+        network[("demand", d), "sink"] = q
+    result = dinic_max_flow(network, "source", "sink")
+    if result.value < total_demand - tol:
+        short = [d for d in demand if ("demand", d) not in result.source_side]
+        raise ValueError(
+            f"运输问题无可行解：需求点{short}的总需求超过与其相连的供应点的总供应量"
+        )
+
+
+def _merge_lanes(lanes):
+    """合并重复的 (供应点, 需求点) 线路，保留单价最低的一条；运量不受限时其余线路不会更优"""
+    merged = {}
+    for s, d, c in lanes:
+        if (s, d) not in merged or c < merged[s, d]:
+            merged[s, d] = c
+    return [(s, d, c) for (s, d), c in merged.items()]
+
+
+def build_sparse_transportation_model(supply, demand, lanes, name="运输优化问题"):
+    """只为允许的线路建模的运输问题，返回 (模型, {(供应点, 需求点): 运量变量})
+
+    lanes 为 (供应点, 需求点, 单价) 的可迭代对象，变量数与约束中的非零元数都与线路数成正比；
+    重复的线路只保留单价最低的一条。需求约束为 == 需求量；供需平衡时供应约束同样为 == 供应量，
+    总供应量多于总需求量时为 <= 供应量（允许有剩余）。建模前先做供需割检验，无可行解时提前报错。
+    """
+    lanes = _merge_lanes(lanes)
+    check_transportation_feasibility(supply, demand, lanes)
+    prob = pulp.LpProblem(name, pulp.LpMinimize)
+
+    # 创建决策变量（运输量），只覆盖允许的线路
+    x = {}
+    outgoing = {s: [] for s in supply}
+    incoming = {d: [] for d in demand}
+    objective = []
+    for k, (s, d, c) in enumerate(lanes):
+        if s not in supply or d not in demand:
+            raise ValueError(f"线路{s}->{d}的端点不在供应点或需求点中")
+        var = pulp.LpVariable(f"transport_{k}", lowBound=0)
+        x[s, d] = var
+        outgoing[s].append(var)
+        incoming[d].append(var)
+        objective.append(c * var)
+
+    # 目标函数：最小化总运输成本
+    prob += pulp.lpSum(objective)
+
+    # 约束条件1：供应点的供应量约束，供需平衡时每个供应点都必须运完
+    total_demand = sum(demand.values())
+    balanced = abs(sum(supply.values()) - total_demand) <= 1e-9 * max(1.0, total_demand)
+    for s, terms in outgoing.items():
+        if balanced:
+            prob += pulp.lpSum(terms) == supply[s]
+        elif terms:
+            prob += pulp.lpSum(terms) <= supply[s]
+
+    # 约束条件2：需求点的需求量约束
+    for d, terms in incoming.items():
+        prob += pulp.lpSum(terms) == demand[d]
+    return prob, x
 
+
+def build_transportation_arrays(supply, demand, lanes):
+    """稀疏运输模型的矩阵形式，返回 (c, A_ub, b_ub, A_eq, b_eq, keys)
+
+    keys[k] = (供应点, 需求点) 对应变量 x[k]；A_ub 为供应约束，A_eq 为需求约束，
+    均为 COO 三元组，非零元数等于线路数。重复线路的合并与供需割检验同 build_sparse_transportation_model。
+    """
+    lanes = _merge_lanes(lanes)
+    check_transportation_feasibility(supply, demand, lanes)
+    supply_index = {s: r for r, s in enumerate(supply)}
+    demand_index = {d: r for r, d in enumerate(demand)}
+    for s, d, _ in lanes:
+        if s not in supply_index or d not in demand_index:
+            raise ValueError(f"线路{s}->{d}的端点不在供应点或需求点中")
+    c = np.array([cost for _, _, cost in lanes], dtype=float)
+    k = np.arange(len(lanes))
+    ones = np.ones(len(lanes))
+    A_ub = (ones, np.array([supply_index[s] for s, _, _ in lanes], dtype=int), k)
+    A_eq = (ones, np.array([demand_index[d] for _, d, _ in lanes], dtype=int), k)
+    b_ub = np.array([supply[s] for s in supply], dtype=float)
+    b_eq = np.array([demand[d] for d in demand], dtype=float)
+    return c, A_ub, b_ub, A_eq, b_eq, [(s, d) for s, d, _ in lanes]
+
+
+def solve_transportation(backend="simplex"):
+    """backend="simplex" 使用内置运输单纯形法，backend="pulp" 使用 PuLP 线性规划模型，
+    backend="matrix" 使用矩阵形式模型交给 solve_matrix"""
     # 定义供应点和需求点
     supply_points = ["煤场A", "煤场B", "煤场C"]
     demand_points = ["工厂X", "工厂Y", "工厂Z"]
@@ -44,38 +562,56 @@ def solve_transportation():
         ("煤场C", "工厂Z"): 7,
     }
 
-    # 创建决策变量（运输量）
-    x = pulp.LpVariable.dicts(
-        "transport", ((s, d) for s in supply_points for d in demand_points), lowBound=0
-    )
-
-    # 目标函数：最小化总运输成本
-    prob += pulp.lpSum(
-        x[s, d] * costs[s, d] for s in supply_points for d in demand_points
-    )
-
-    # 约束条件1：供应点的供应量约束
-    for s in supply_points:
-        prob += pulp.lpSum(x[s, d] for d in demand_points) == supply[s]
+    if backend == "simplex":
+        matrix = np.array([[costs[s, d] for d in demand_points] for s in supply_points])
+        result = transportation_simplex(
+            [supply[s] for s in supply_points],
+            [demand[d] for d in demand_points],
+            matrix,
+        )
+        print(f"最小运输成本：{result.cost}万元")
+        print("\n运输方案：")
+        for a, s in enumerate(supply_points):
+            for b, d in enumerate(demand_points):
+                amount = result.flows[a, b]
+                if amount > 0:
+                    print(
+                        f"从{s}运输到{d}：{amount}万吨，成本：{amount * costs[s, d]}万元"
+                    )
+        return
+    if backend == "matrix":
+        lanes = [(s, d, c) for (s, d), c in costs.items()]
+        *arrays, keys = build_transportation_arrays(supply, demand, lanes)
+        result = solve_matrix(*arrays)
+        if result.status != "Optimal":
+            print("问题无解")
+            return
+        print(f"最小运输成本：{result.objective}万元")
+        print("\n运输方案：")
+        for (s, d), amount in zip(keys, result.x):
+            if amount > 0:
+                print(f"从{s}运输到{d}：{amount}万吨，成本：{amount * costs[s, d]}万元")
+        return
+    if backend != "pulp":
+        raise ValueError(f"未知的求解后端：{backend}")
 
-    # 约束条件2：需求点的需求量约束
-    for d in demand_points:
-        prob += pulp.lpSum(x[s, d] for s in supply_points) == demand[d]
+    # 只为存在的线路建模，这里每对煤场-工厂之间都有线路
+    lanes = [(s, d, c) for (s, d), c in costs.items()]
+    prob, x = build_sparse_transportation_model(supply, demand, lanes)
 
     # 求解
-    prob.solve()
+    solve(prob)
 
     # 输出结果
     if pulp.LpStatus[prob.status] == "Optimal":
         total_cost = pulp.value(prob.objective)
         print(f"最小运输成本：{total_cost}万元")
         print("\n运输方案：")
-        for s in supply_points:
-            for d in demand_points:
-                if pulp.value(x[s, d]) > 0:
-                    print(
-                        f"从{s}运输到{d}：{pulp.value(x[s, d])}万吨，成本：{pulp.value(x[s, d]) * costs[s, d]}万元"
-                    )
+        for (s, d), var in x.items():
+            if pulp.value(var) > 0:
+                print(
+                    f"从{s}运输到{d}：{pulp.value(var)}万吨，成本：{pulp.value(var) * costs[s, d]}万元"
+                )
     else:
         print("问题无解")
 
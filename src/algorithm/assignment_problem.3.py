@@ -1,5 +1,8 @@
 import pulp
 
+from resource_allocation import allocate_resources
+from solver import solve
+
 
 """
 指派问题(创建投资组合优化问题)
@@ -17,10 +20,8 @@ import pulp
 """
 
 
-def solve_investment():
-    # 创建投资组合优化问题
-    prob = pulp.LpProblem("投资组合优化", pulp.LpMaximize)
-
+def solve_investment(backend="dp"):
+    """backend="dp" 使用内置动态规划，backend="pulp" 使用 PuLP 0-1 规划模型"""
     # 定义项目和投资额选项
     projects = ["甲", "乙", "丙"]
     investments = [1, 2, 3, 4]  # 投资额（百万元）
@@ -32,6 +33,25 @@ def solve_investment():
         "丙": {1: 5, 2: 8, 3: 11, 4: 15},
     }
 
+    if backend == "dp":
+        # 每个项目可以不投资（0档），总投资额不超过4
+        tables = {p: {0: 0, **returns[p]} for p in projects}
+        allocation, total_return = allocate_resources(tables, 4, exact=False)
+        print(f"最大收益：{total_return}百万元")
+
+        print("\n投资方案：")
+        for p, i in allocation.items():
+            if i > 0:
+                print(f"项目{p}投资{i}百万元，收益{returns[p][i]}百万元")
+
+        print(f"\n总投资额：{sum(allocation.values())}百万元")
+        return
+    if backend != "pulp":
+        raise ValueError(f"未知的求解后端：{backend}")
+
+    # 创建投资组合优化问题
+    prob = pulp.LpProblem("投资组合优化", pulp.LpMaximize)
+
     # 创建决策变量（是否选择某个项目的某个投资额）
     x = pulp.LpVariable.dicts(
         "invest", ((p, i) for p in projects for i in investments), cat="Binary"
@@ -48,7 +68,7 @@ def solve_investment():
         prob += pulp.lpSum(x[p, i] for i in investments) <= 1
 
     # 求解
-    prob.solve()
+    solve(prob)
 
     # 输出结果
     if pulp.LpStatus[prob.status] == "Optimal":
@@ -1,5 +1,8 @@
 import pulp
 
+from linear_program import LinearModel, highspy
+from solver import solve
+
 
 """
 指派问题(创建生产规划问题)
@@ -17,14 +20,23 @@ import pulp
 """
 
 
-def solve_production_planning():
-    # 创建生产规划问题
-    prob = pulp.LpProblem("生产规划问题", pulp.LpMaximize)
+def build_production_model(materials, profit, products=("I", "II")):
+    """生产规划的持久化模型，第 i 行对应 materials 的第 i 种原材料
 
-    # 创建决策变量（两种产品的生产量）
-    x1 = pulp.LpVariable("产品I", lowBound=0)  # 产品I的生产量
-    x2 = pulp.LpVariable("产品II", lowBound=0)  # 产品II的生产量
+    修改库存用 model.set_rhs(i, 新现有量)，修改利润用 model.set_objective(j, 新利润)，
+    再次 solve() 时从上一个最优基热启动。
+    """
+    A = [[materials[m][p] for p in products] for m in materials]
+    b = [materials[m]["现有量"] for m in materials]
+    c = [profit[p] for p in products]
+    return LinearModel(c, A, b, maximize=True)
 
+
+def solve_production_planning(backend=None):
+    """backend="simplex" 使用可热启动的 LinearModel（HiGHS），backend="pulp" 使用 PuLP 线性规划模型；
+    默认在安装了 highspy 时用 "simplex"，否则回退到 "pulp"。"""
+    if backend is None:
+        backend = "pulp" if highspy is None else "simplex"
     # 定义原材料消耗系数
     materials = {
         "甲": {"I": 1, "II": 1, "现有量": 4},
@@ -35,6 +47,43 @@ def solve_production_planning():
     # 定义单位利润（万元/吨）
     profit = {"I": 9, "II": 12}
 
+    if backend == "simplex":
+        model = build_production_model(materials, profit)
+        result = model.solve()
+        if result.status != "Optimal":
+            print("问题无解")
+            return
+        x1_value, x2_value = result.x
+        print(f"最大利润：{result.objective}万元")
+        print(f"\n生产方案：")
+        print(f"产品I生产量：{x1_value:.2f}吨")
+        print(f"产品II生产量：{x2_value:.2f}吨")
+
+        # 剩余量、影子价格及其有效范围都直接取自最优基，无需代入或重复求解
+        sensitivity = model.sensitivity()
+        print(f"\n原材料使用情况：")
+        for i, material in enumerate(materials):
+            remaining = sensitivity.slack[i]
+            used = materials[material]["现有量"] - remaining
+            low, high = sensitivity.rhs_ranges[i]
+            print(
+                f"{material}材料：使用{used:.2f}，剩余{remaining:.2f}，"
+                f"影子价格{sensitivity.duals[i]:.2f}万元/吨"
+                f"（现有量在[{low:.2f}, {high:.2f}]内有效）"
+            )
+        surplus = [m for m, r in zip(materials, sensitivity.slack) if r > 1e-9]
+        print(f"\n尚有剩余的原材料：{'、'.join(surplus) or '无'}")
+        return
+    if backend != "pulp":
+        raise ValueError(f"未知的求解后端：{backend}")
+
+    # 创建生产规划问题
+    prob = pulp.LpProblem("生产规划问题", pulp.LpMaximize)
+
+    # 创建决策变量（两种产品的生产量）
+    x1 = pulp.LpVariable("产品I", lowBound=0)  # 产品I的生产量
+    x2 = pulp.LpVariable("产品II", lowBound=0)  # 产品II的生产量
+
     # 目标函数：最大化总利润
     prob += profit["I"] * x1 + profit["II"] * x2
 
@@ -53,7 +102,7 @@ def solve_production_planning():
     )  # 丙材料约束
 
     # 求解
-    prob.solve()
+    solve(prob)
 
     # 输出结果
     if pulp.LpStatus[prob.status] == "Optimal":
@@ -1,5 +1,8 @@
 import pulp
 
+from resource_allocation import allocate_resources
+from solver import solve
+
 
 """
 指派问题(商品分配问题)
@@ -25,10 +28,8 @@ import pulp
 """
 
 
-def solve_assignment():
-    # 创建最大化问题
-    prob = pulp.LpProblem("商品分配问题", pulp.LpMaximize)
-
+def solve_assignment(backend="dp"):
+    """backend="dp" 使用内置动态规划，backend="pulp" 使用 PuLP 0-1 规划模型"""
     # 定义商店和分配策略
     stores = ["甲", "乙", "丙", "丁"]
     strategies = {
@@ -47,6 +48,28 @@ def solve_assignment():
         "丁": {"A": 4, "B": 5, "C": 6, "D": 6, "E": 6},
     }
 
+    if backend == "dp":
+        # 以箱数为档位，每个商店可以不供应（0箱），箱数之和必须等于5
+        tables = {
+            s: {0: 0, **{strategies[t]: profits[s][t] for t in strategies}}
+            for s in stores
+        }
+        allocation, total_profit = allocate_resources(tables, 5)
+        strategy_of = {boxes: t for t, boxes in strategies.items()}
+        print(f"最大总利润：{total_profit}百元")
+
+        print("\n分配方案：")
+        for s, boxes in allocation.items():
+            if boxes > 0:
+                t = strategy_of[boxes]
+                print(f"商店{s}分配{boxes}箱（策略{t}），利润{profits[s][t]}百元")
+        return
+    if backend != "pulp":
+        raise ValueError(f"未知的求解后端：{backend}")
+
+    # 创建最大化问题
+    prob = pulp.LpProblem("商品分配问题", pulp.LpMaximize)
+
     # 创建决策变量（商店s是否采用策略t）
     x = pulp.LpVariable.dicts(
         "assign", ((s, t) for s in stores for t in strategies), cat="Binary"
@@ -63,7 +86,7 @@ def solve_assignment():
     prob += pulp.lpSum(strategies[t] * x[s, t] for s in stores for t in strategies) == 5
 
     # 求解
-    prob.solve()
+    solve(prob)
 
     # 输出结果
     if pulp.LpStatus[prob.status] == "Optimal":
@@ -1,5 +1,8 @@
 import pulp
 
+from assignment_problem import solve_assignment_dict
+from solver import solve
+
 
 """
 指派问题(商品分配问题)
@@ -47,10 +50,8 @@ import pulp
 """
 
 
-def solve_assignment():
-    # 创建任务分配问题最小化问题
-    prob = pulp.LpProblem("任务分配问题", pulp.LpMinimize)
-
+def solve_assignment(backend="hungarian"):
+    """backend="hungarian" 使用内置匈牙利算法，backend="pulp" 使用 PuLP + CBC 求解 0-1 规划"""
     # 定义人员和机器
     people = ["甲", "乙", "丙", "丁"]
     machines = ["A", "B", "C", "D"]
@@ -63,6 +64,23 @@ def solve_assignment():
         "丁": {"A": 8, "B": 7, "C": 8, "D": 5},
     }
 
+    if backend == "hungarian":
+        assignment, total_cost = solve_assignment_dict(costs)
+        print(f"最小总成本：{total_cost}百元")
+
+        print("\n分配方案：")
+        for p in people:
+            m = assignment[p]
+            print(f"{p}分配到机器{m}，成本{costs[p][m]}百元")
+            if p == "乙":  # 特别输出乙的分配
+                print(f"  乙应由机器{m}执行   ")
+        return
+    if backend != "pulp":
+        raise ValueError(f"未知的求解后端：{backend}")
+
+    # 创建任务分配问题最小化问题
+    prob = pulp.LpProblem("任务分配问题", pulp.LpMinimize)
+
     # 创建决策变量（是否分配某人到某机器）
     x = pulp.LpVariable.dicts(
         "assign", ((p, m) for p in people for m in machines), cat="Binary"
@@ -80,7 +98,7 @@ def solve_assignment():
         prob += pulp.lpSum(x[p, m] for p in people) == 1
 
     # 求解
-    prob.solve()
+    solve(prob)
 
     # 输出结果
     if pulp.LpStatus[prob.status] == "Optimal":
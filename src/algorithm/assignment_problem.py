@@ -1,5 +1,13 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
 import pulp
 
+from solver import solve, solve_matrix, table_to_array
+
 """
 指派问题
 
@@ -38,10 +46,267 @@ import pulp
 """
 
 
-def solve_assignment_problem():
-    # 创建指派问题
-    prob = pulp.LpProblem("工件分配问题", pulp.LpMinimize)
+def linear_sum_assignment(cost, maximize=False):
+    """最短增广路（Jonker-Volgenant / 匈牙利算法）求解指派问题
+
+    cost 为 n×m 的稠密成本矩阵，允许 n != m（矩形矩阵时较少的一侧全部被分配）。
+    maximize=True 时求最大化。返回 (row_ind, col_ind)，row_ind 按升序排列。
+    复杂度 O(n²m)，内层对列的松弛与求最小值均用 NumPy 向量化完成。
+    """
+    cost = np.asarray(cost, dtype=float)
+    if cost.ndim != 2:
+        raise ValueError("成本矩阵必须是二维数组")
+    if not np.all(np.isfinite(cost)):
+        raise ValueError("成本矩阵不能包含 inf 或 nan")
+    if maximize:
+        cost = -cost
+
+    # 保证行数不超过列数，行多于列时转置求解
+    transposed = cost.shape[0] > cost.shape[1]
+    if transposed:
+        cost = cost.T
+    n, m = cost.shape
+    if n == 0:
+        empty = np.empty(0, dtype=int)
+        return empty, empty
+
+    # 对偶势 u（行）、v（列），下标 0 为哨兵
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    # p[j]：分配到第 j 列的行（1 起始，0 表示空闲）；way[j]：增广路上第 j 列的前驱列
+    p = np.zeros(m + 1, dtype=int)
+    way = np.zeros(m + 1, dtype=int)
+
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            free = ~used[1:]
+            # 用当前行更新所有未访问列的最短距离
+            reduced = cost[i0 - 1] - u[i0] - v[1:]
+            better = free & (reduced < minv[1:])
+            minv[1:][better] = reduced[better]
+            way[1:][better] = j0
+            # 取距离最小的未访问列
+            masked = np.where(free, minv[1:], np.inf)
+            j1 = int(np.argmin(masked)) + 1
+            delta = masked[j1 - 1]
+            # 调整对偶势，保持已访问列上的等式成立
+            u[p[used]] += delta
+            v[used] -= delta
+            minv[~used] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        # 沿增广路翻转匹配
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+
+    cols = np.nonzero(p[1:])[0]
+    rows = p[1:][cols] - 1
+    if transposed:
+        rows, cols = cols, rows
+    order = np.argsort(rows)
+    return rows[order], cols[order]
+
+
+def hopcroft_karp(adj, n_right):
+    """Hopcroft-Karp 二分图最大匹配，adj[u] 为左侧顶点 u 可连的右侧顶点，O(E·sqrt(V))
+
+    返回 (match_left, 匹配数)，match_left[u] 为 u 匹配的右侧顶点（未匹配为 -1）。
+    """
+    n_left = len(adj)
+    match_left = [-1] * n_left
+    match_right = [-1] * n_right
+    size = 0
+    while True:
+        # BFS：从所有未匹配的左侧顶点出发分层
+        dist = [-1] * n_left
+        queue = deque(u for u in range(n_left) if match_left[u] == -1)
+        for u in queue:
+            dist[u] = 0
+        found = False
+        while queue:
+            u = queue.popleft()
+            for v in adj[u]:
+                w = match_right[v]
+                if w == -1:
+                    found = True
+                elif dist[w] == -1:
+                    dist[w] = dist[u] + 1
+                    queue.append(w)
+        if not found:
+            return match_left, size
+
+        # DFS：沿分层图寻找互不相交的最短增广路（迭代实现，it 为当前弧）
+        it = [0] * n_left
+        for root in range(n_left):
+            if match_left[root] != -1:
+                continue
+            stack = [root]
+            chosen = []
+            while stack:
+                u = stack[-1]
+                if it[u] == len(adj[u]):
+                    dist[u] = -1  # 死路，本轮不再访问
+                    stack.pop()
+                    if chosen:
+                        chosen.pop()
+                        it[stack[-1]] += 1
+                    continue
+                v = adj[u][it[u]]
+                w = match_right[v]
+                if w == -1:
+                    # 找到增广路，沿栈翻转匹配
+                    chosen.append(v)
+                    for x, y in zip(stack, chosen):
+                        match_left[x] = y
+                        match_right[y] = x
+                    size += 1
+                    break
+                if dist[w] == dist[u] + 1:
+                    chosen.append(v)
+                    stack.append(w)
+                else:
+                    it[u] += 1
+
+
+def bottleneck_assignment(cost):
+    """瓶颈指派：使所选元素中的最大值最小，返回 (瓶颈值, row_ind, col_ind)
+
+    在去重排序后的成本值上二分阈值，每个阈值用 Hopcroft-Karp 判断只使用 <= 阈值的元素
+    能否得到完美匹配，复杂度 O(n^2.5 log n)。行数多于列数时转置求解。
+    """
+    cost = np.asarray(cost)
+    if cost.ndim != 2:
+        raise ValueError("成本矩阵必须是二维数组")
+    transposed = cost.shape[0] > cost.shape[1]
+    if transposed:
+        cost = cost.T
+    n, m = cost.shape
+    if n == 0:
+        empty = np.empty(0, dtype=int)
+        return None, empty, empty
+
+    values = np.unique(cost)
+    # 每行至少要选一个元素，瓶颈值不小于各行最小值中的最大者
+    lo = int(np.searchsorted(values, cost.min(axis=1).max()))
+    if n == m:
+        lo = max(lo, int(np.searchsorted(values, cost.min(axis=0).max())))
+    hi = len(values) - 1
+    best = None
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        adj = [np.flatnonzero(row <= values[mid]).tolist() for row in cost]
+        match, size = hopcroft_karp(adj, m)
+        if size == n:
+            best = (mid, match)
+            hi = mid - 1
+        else:
+            lo = mid + 1
+
+    mid, match = best
+    rows = np.arange(n)
+    cols = np.asarray(match)
+    if transposed:
+        rows, cols = cols, rows
+        order = np.argsort(rows)
+        rows, cols = rows[order], cols[order]
+    return values[mid].item(), rows, cols
+
+
+def _solve_instance(cost, maximize):
+    """批量求解的单个实例：返回 (row_ind, col_ind, 目标值)"""
+    cost = np.asarray(cost, dtype=float)
+    rows, cols = linear_sum_assignment(cost, maximize=maximize)
+    return rows, cols, cost[rows, cols].sum()
+
+
+# 批量求解复用的进程池：(进程数, ProcessPoolExecutor)，首次需要并行时创建
+_batch_pool = None
 
+
+def _shared_pool(workers):
+    """返回模块级共享进程池，进程数变化时重建，避免每次调用都付出进程启动的开销"""
+    global _batch_pool
+    if _batch_pool is None or _batch_pool[0] != workers:
+        if _batch_pool is not None:
+            _batch_pool[1].shutdown()
+        _batch_pool = (workers, ProcessPoolExecutor(max_workers=workers))
+    return _batch_pool[1]
+
+
+def solve_assignment_batch(
+    costs, maximize=False, workers=None, parallel_threshold=50000, executor=None
+):
+    """在进程内批量求解多个独立的指派问题，返回 (各实例的 (row_ind, col_ind) 列表, 目标值数组)
+
+    costs 为形状 (k, n, m) 的三维数组或由二维矩阵组成的列表（各矩阵形状可以不同）。
+    全部使用内置匈牙利算法求解，不经过 PuLP 建模、临时文件和 CBC 子进程。
+    成本矩阵元素总数低于 parallel_threshold 时串行求解（进程间通信比求解本身更慢）；
+    否则分发到 executor，未给出时使用模块级共享进程池（workers 默认 CPU 数，workers=1 时始终串行）。
+    """
+    instances = list(costs)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    size = sum(np.size(c) for c in instances)
+    if size < parallel_threshold or (workers == 1 and executor is None):
+        results = [_solve_instance(c, maximize) for c in instances]
+    else:
+        if executor is None:
+            executor = _shared_pool(workers)
+        # 小实例求解只需微秒级，按块分发以摊薄进程间通信开销
+        chunksize = max(1, len(instances) // (workers * 4))
+        results = list(
+            executor.map(
+                _solve_instance, instances, repeat(maximize), chunksize=chunksize
+            )
+        )
+    assignments = [(rows, cols) for rows, cols, _ in results]
+    objectives = np.array([objective for _, _, objective in results])
+    return assignments, objectives
+
+
+def solve_assignment_dict(costs, maximize=False):
+    """以嵌套字典 costs[worker][task] 为输入求解指派问题
+
+    返回 (assignment, objective)，assignment 为 worker -> task 的字典。
+    """
+    workers = list(costs)
+    tasks = list(next(iter(costs.values()))) if costs else []
+    matrix = [[costs[w][t] for t in tasks] for w in workers]
+    rows, cols = linear_sum_assignment(matrix, maximize=maximize)
+    assignment = {workers[r]: tasks[c] for r, c in zip(rows, cols)}
+    objective = sum(costs[w][t] for w, t in assignment.items())
+    return assignment, objective
+
+
+def build_assignment_arrays(cost):
+    """指派问题的矩阵形式，返回 (c, A_ub, b_ub, A_eq, b_eq)，变量 x[i * m + j] 对应 (i, j)
+
+    约束矩阵为 COO 三元组，直接由下标数组生成。n <= m 时每行恰好指派一次、每列至多一次，
+    n > m 时反之；约束矩阵全单模，LP 松弛的最优顶点即为 0-1 解。
+    """
+    cost = np.asarray(cost, dtype=float)
+    n, m = cost.shape
+    k = np.arange(n * m)
+    ones = np.ones(n * m)
+    by_row = (ones, k // m, k)
+    by_col = (ones, k % m, k)
+    if n <= m:
+        return cost.ravel(), by_col, np.ones(m), by_row, np.ones(n)
+    return cost.ravel(), by_row, np.ones(n), by_col, np.ones(m)
+
+
+def solve_assignment_problem(backend="hungarian"):
+    """backend="hungarian" 使用内置匈牙利算法，backend="pulp" 使用 PuLP + CBC 求解 0-1 规划，
+    backend="matrix" 把加工时间表一次性转换为数组后交给 solve_matrix"""
     # 工人和工件
     workers = ["甲", "乙", "丙", "丁"]
     tasks = ["A", "B", "C", "D"]
@@ -54,6 +319,32 @@ def solve_assignment_problem():
         "丁": {"A": 17, "B": 9, "C": 15, "D": 13},
     }
 
+    if backend == "hungarian":
+        assignment, total_time = solve_assignment_dict(times)
+        print("最优分配方案：")
+        for i in workers:
+            j = assignment[i]
+            print(f"{i}工人 -> {j}工件，加工时间：{times[i][j]}")
+        print(f"\n总加工时间：{total_time}")
+        return
+    if backend == "matrix":
+        cost, _, _ = table_to_array(times, workers, tasks)
+        result = solve_matrix(*build_assignment_arrays(cost), ub=1.0)
+        if result.status != "Optimal":
+            print("问题无解")
+            return
+        print("最优分配方案：")
+        for k in np.flatnonzero(result.x > 0.5):
+            i, j = workers[k // len(tasks)], tasks[k % len(tasks)]
+            print(f"{i}工人 -> {j}工件，加工时间：{times[i][j]}")
+        print(f"\n总加工时间：{round(result.objective)}")
+        return
+    if backend != "pulp":
+        raise ValueError(f"未知的求解后端：{backend}")
+
+    # 创建指派问题
+    prob = pulp.LpProblem("工件分配问题", pulp.LpMinimize)
+
     # 决策变量：x[i][j] = 1 表示工人i分配给工件j
     x = pulp.LpVariable.dicts(
         "x", ((i, j) for i in workers for j in tasks), cat="Binary"
@@ -71,7 +362,7 @@ def solve_assignment_problem():
         prob += pulp.lpSum(x[i, j] for i in workers) == 1
 
     # 求解
-    prob.solve()
+    solve(prob)
 
     # 输出结果
     if pulp.LpStatus[prob.status] == "Optimal":
@@ -2,36 +2,281 @@
 1路和2路公交车都将在10分钟内均匀随机地到达同一车站，则它们相隔4分钟内到达该站的概率为（   ）。
 """
 
-import random
+import math
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from statistics import NormalDist
+
 import numpy as np
 
+# 蒙特卡洛估计结果：点估计、标准误差、置信区间及实际试验次数
+MonteCarloResult = namedtuple(
+    "MonteCarloResult", ["probability", "std_error", "ci_low", "ci_high", "n_trials"]
+)
+
+
+def _count_hits(rng, n_trials, window, gap, chunk_size):
+    """按块抽样并统计 |t1-t2| <= gap 的次数，内存占用与 chunk_size 成正比"""
+    hits = 0
+    remaining = n_trials
+    while remaining > 0:
+        size = min(chunk_size, remaining)
+        t1 = rng.uniform(0, window, size)  # 第一辆车到达时间
+        t2 = rng.uniform(0, window, size)  # 第二辆车到达时间
+        hits += int(np.count_nonzero(np.abs(t1 - t2) <= gap))
+        remaining -= size
+    return hits
+
+
+def _worker_hits(seed_seq, n_trials, window, gap, chunk_size):
+    """子进程入口：使用独立的随机数流统计命中次数"""
+    return _count_hits(
+        np.random.default_rng(seed_seq), n_trials, window, gap, chunk_size
+    )
+
+
+def _parallel_hits(seed_seq, n_trials, window, gap, chunk_size, workers, executor):
+    """将 n_trials 拆分到 executor 的 workers 个进程，每个进程使用 SeedSequence.spawn 派生的独立随机数流
+
+    各进程的命中次数为整数，合并结果精确；同一 seed 与 workers 下结果完全一致。
+    """
+    streams = seed_seq.spawn(workers)
+    base, extra = divmod(n_trials, workers)
+    sizes = [base + (1 if k < extra else 0) for k in range(workers)]
+    futures = [
+        executor.submit(_worker_hits, stream, size, window, gap, chunk_size)
+        for stream, size in zip(streams, sizes)
+        if size > 0
+    ]
+    return sum(f.result() for f in futures)
+
+
+def _adaptive_hits(
+    seed_seq,
+    window,
+    gap,
+    chunk_size,
+    workers,
+    executor,
+    tolerance,
+    z,
+    batch_size,
+    max_trials,
+):
+    """分批模拟直到置信区间半宽不超过 tolerance，返回 (命中次数, 试验次数)
+
+    每批结束后用当前估计推算所需总次数并直接补足，避免逐批小步试探。
+    方差估计使用 (hits+1)/(n+2)，防止 p 估计为 0 或 1 时过早停止。
+    executor 为 None 时串行模拟，否则各批次复用同一个进程池。
+    """
+    rng = np.random.default_rng(seed_seq) if executor is None else None
+    hits = 0
+    n = 0
+    target = min(batch_size, max_trials)
+    while True:
+        size = target - n
+        if rng is not None:
+            hits += _count_hits(rng, size, window, gap, chunk_size)
+        else:
+            (batch_seq,) = seed_seq.spawn(1)
+            hits += _parallel_hits(
+                batch_seq, size, window, gap, chunk_size, workers, executor
+            )
+        n = target
+        p = (hits + 1) / (n + 2)
+        required = math.ceil(z * z * p * (1 - p) / (tolerance * tolerance))
+        if required <= n or n >= max_trials:
+            return hits, n
+        target = min(max(required, n + batch_size), max_trials)
+
+
+def _summarize(hits, n_trials, confidence):
+    """由命中次数计算点估计、标准误差和正态近似置信区间"""
+    p = hits / n_trials
+    std_error = (p * (1 - p) / n_trials) ** 0.5
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    return MonteCarloResult(
+        p, std_error, max(0.0, p - z * std_error), min(1.0, p + z * std_error), n_trials
+    )
+
 
 # 蒙特卡洛模拟方法
-def monte_carlo_simulation(n_trials=1000000):
-    count = 0
-    for _ in range(n_trials):
-        t1 = random.uniform(0, 10)  # 第一辆车到达时间
-        t2 = random.uniform(0, 10)  # 第二辆车到达时间
-        if abs(t1 - t2) <= 4:
-            count += 1
-    return count / n_trials
+def monte_carlo_simulation(
+    n_trials=1000000,
+    window=10,
+    gap=4,
+    seed=None,
+    chunk_size=1000000,
+    confidence=0.95,
+    workers=1,
+    tolerance=None,
+    batch_size=100000,
+    max_trials=10**10,
+):
+    """向量化蒙特卡洛模拟，返回 MonteCarloResult
+
+    seed 固定随机数种子以便复现；chunk_size 控制每批抽样数量，保证 10⁹ 级试验次数下内存有界。
+    workers > 1 时将试验拆分到多个进程并行执行，整个调用只创建一个进程池。
+    给定 tolerance 时进入目标精度模式：忽略 n_trials，以 batch_size 为起点分批模拟，
+    直到 confidence 置信水平下的区间半宽不超过 tolerance（最多 max_trials 次）。
+    """
+    if tolerance is None and n_trials <= 0:
+        raise ValueError("n_trials 必须为正整数")
+    if chunk_size <= 0:
+        raise ValueError("chunk_size 必须为正整数")
+    if workers <= 0:
+        raise ValueError("workers 必须为正整数")
+    if tolerance is not None:
+        if tolerance <= 0:
+            raise ValueError("tolerance 必须为正数")
+        if batch_size <= 0 or max_trials <= 0:
+            raise ValueError("batch_size 和 max_trials 必须为正整数")
+    seed_seq = np.random.SeedSequence(seed)
+    # 目标精度模式的各批次复用同一个进程池，只付出一次进程启动的开销
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        if tolerance is not None:
+            z = NormalDist().inv_cdf(0.5 + confidence / 2)
+            hits, n_trials = _adaptive_hits(
+                seed_seq,
+                window,
+                gap,
+                chunk_size,
+                workers,
+                executor,
+                tolerance,
+                z,
+                batch_size,
+                max_trials,
+            )
+        elif executor is None:
+            rng = np.random.default_rng(seed_seq)
+            hits = _count_hits(rng, n_trials, window, gap, chunk_size)
+        else:
+            hits = _parallel_hits(
+                seed_seq, n_trials, window, gap, chunk_size, workers, executor
+            )
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return _summarize(hits, n_trials, confidence)
 
 
 # 几何概率方法
-def geometric_probability():
+@lru_cache(maxsize=4096)
+def geometric_probability(window=10, gap=4):
+    """两辆车在 [0, window] 内均匀到达，相隔 gap 以内到达的概率（解析解）"""
+    if window <= 0 or gap < 0:
+        raise ValueError("window 必须为正数，gap 不能为负数")
+    if gap >= window:
+        return 1.0
+
     # 总面积
-    total_area = 10 * 10
+    total_area = window * window
 
-    # |t1-t2| <= 4 的区域面积
-    # 这是一个宽度为4的带状区域
-    favorable_area = 10 * 8 - 16  # 总带宽区域减去超出正方形的部分
+    # |t1-t2| <= gap 的区域面积
+    # 这是一个宽度为 2*gap 的带状区域，等于正方形减去两个直角边为 window-gap 的三角形
+    favorable_area = total_area - (window - gap) ** 2
 
     probability = favorable_area / total_area
     return probability
 
 
+def _area_above(width, height, gap):
+    """矩形 [0,width]×[0,height] 内满足 y - x > gap 的区域面积（gap 可为负）
+
+    被积函数 x -> |{y : y - x > gap}| 分段线性，在分段点之间用梯形公式即为精确值。
+    """
+
+    def length(x):
+        return min(max(height - max(x + gap, 0.0), 0.0), height)
+
+    kinks = (min(max(p, 0.0), width) for p in (-gap, height - gap))
+    xs = sorted({0.0, float(width), *kinks})
+    return sum((b - a) * (length(a) + length(b)) / 2 for a, b in zip(xs, xs[1:]))
+
+
+@lru_cache(maxsize=4096)
+def unequal_window_probability(window1, window2, gap):
+    """t1 在 [0, window1]、t2 在 [0, window2] 内均匀到达时 |t1-t2| <= gap 的概率（解析解）"""
+    if window1 <= 0 or window2 <= 0 or gap < 0:
+        raise ValueError("window 必须为正数，gap 不能为负数")
+    total_area = window1 * window2
+    outside = _area_above(window1, window2, gap) + _area_above(window2, window1, gap)
+    return (total_area - outside) / total_area
+
+
+@lru_cache(maxsize=4096)
+def k_bus_probability(k, window=10, gap=4):
+    """k 辆车在 [0, window] 内均匀到达，全部在 gap 时间跨度内到达的概率
+
+    k 个均匀变量极差 R 的分布函数：P(R <= r) = k·r^(k-1) - (k-1)·r^k，r = gap/window。
+    """
+    if k < 1:
+        raise ValueError("k 必须为正整数")
+    if window <= 0 or gap < 0:
+        raise ValueError("window 必须为正数，gap 不能为负数")
+    if k == 1 or gap >= window:
+        return 1.0
+    r = gap / window
+    return k * r ** (k - 1) - (k - 1) * r**k
+
+
+@lru_cache(maxsize=4096)
+def arrival_probability(windows, gap, grid_size=20001):
+    """通用求解：第 i 辆车在区间 windows[i] = (lo, hi) 内均匀到达，全部在 gap 跨度内到达的概率
+
+    存在解析解时直接返回（两辆车、或各车窗口相同），否则数值积分：
+    P = Σ_i ∫ f_i(s) Π_{j≠i} P(s <= t_j <= s+gap) ds，即枚举最早到达的车 i 及其到达时刻 s，
+    在包含所有分段点的网格上用梯形公式向量化求积。windows 需为可哈希的元组以便缓存。
+    """
+    windows = tuple((float(lo), float(hi)) for lo, hi in windows)
+    if not windows:
+        raise ValueError("windows 不能为空")
+    if any(hi <= lo for lo, hi in windows) or gap < 0:
+        raise ValueError("每个窗口必须满足 lo < hi，gap 不能为负数")
+    k = len(windows)
+    if k == 1:
+        return 1.0
+    if len(set(windows)) == 1:
+        lo, hi = windows[0]
+        return k_bus_probability(k, hi - lo, gap)
+    if k == 2:
+        # 平移两个窗口后化为从 0 开始的矩形与带状区域的交
+        (a0, a1), (b0, b1) = windows
+        shift = b0 - a0
+        w1, w2 = a1 - a0, b1 - b0
+        outside = _area_above(w1, w2, gap - shift) + _area_above(w2, w1, gap + shift)
+        return (w1 * w2 - outside) / (w1 * w2)
+
+    return _strip_probability(windows, gap, grid_size)
+
+
+def _strip_probability(windows, gap, grid_size):
+    """数值积分：枚举最早到达的车及其时刻，其余车落在 [s, s+gap] 内的概率连乘"""
+    lows = np.array([lo for lo, _ in windows])
+    highs = np.array([hi for _, hi in windows])
+    lengths = highs - lows
+    breakpoints = np.concatenate([lows, highs, lows - gap, highs - gap])
+    total = 0.0
+    for i in range(len(windows)):
+        s = np.linspace(lows[i], highs[i], grid_size)
+        inner = breakpoints[(breakpoints > lows[i]) & (breakpoints < highs[i])]
+        s = np.unique(np.concatenate([s, inner]))
+        # 其余车到达时间落在 [s, s+gap] 内的概率，形状为 (k, 网格点数)
+        covered = np.minimum(highs[:, None], s + gap) - np.maximum(lows[:, None], s)
+        prob = np.clip(covered, 0.0, None) / lengths[:, None]
+        prob[i] = 1.0 / lengths[i]
+        total += np.trapezoid(np.prod(prob, axis=0), s)
+    return float(total)
+
+
 if __name__ == "__main__":
-    probability = monte_carlo_simulation()
-    print(f"两辆公交车在4分钟内到达的概率为：{probability:.3f}")
+    result = monte_carlo_simulation(seed=0)
+    print(
+        f"两辆公交车在4分钟内到达的概率为：{result.probability:.3f}"
+        f"（95%置信区间 [{result.ci_low:.4f}, {result.ci_high:.4f}]）"
+    )
     probability = geometric_probability()
     print(f"两辆公交车在4分钟内到达的概率为：{probability:.3f}")
@@ -1,5 +1,8 @@
 import pulp  # Python for Mathematical Programming
 
+from linear_program import solve_lp_2d
+from solver import solve
+
 """
 线性规划问题（最小值）
 
@@ -7,7 +10,29 @@ import pulp  # Python for Mathematical Programming
 """
 
 
-def solve_linear_programming():
+def solve_linear_programming(backend="exact"):
+    """backend="exact" 使用内置有理数精确求解（Seidel 随机增量算法），backend="pulp" 使用 PuLP 求解"""
+    if backend == "exact":
+        constraints = [
+            (2, 3, "<=", 30),  # 2x+3y≤30
+            (1, 2, ">=", 10),  # x+2y≥10
+            (1, -1, ">=", 0),  # x≥y
+            (1, 0, ">=", 5),  # x≥5
+            (0, 1, ">=", 0),  # y≥0
+        ]
+        result = solve_lp_2d((2, 3), constraints)
+        if result.status != "Optimal":
+            print("问题无解")
+            return
+        x_value, y_value = result.x
+        print(f"最优解：")
+        print(f"x = {float(x_value)}")
+        print(f"y = {float(y_value)}")
+        print(f"目标函数最大值 2x+3y = {float(result.objective)}")
+        return
+    if backend != "pulp":
+        raise ValueError(f"未知的求解后端：{backend}")
+
     # 创建最大化问题
     prob = pulp.LpProblem("线性规划问题", pulp.LpMinimize)
 
@@ -24,7 +49,7 @@ def solve_linear_programming():
     prob += x >= y  # x≥y
 
     # 求解
-    prob.solve()
+    solve(prob)
 
     # 输出结果
     if pulp.LpStatus[prob.status] == "Optimal":
@@ -1,5 +1,8 @@
 import pulp  # Python for Mathematical Programming
 
+from linear_program import solve_integer_lp_2d
+from solver import solve
+
 """
 线性规划问题（最大值）
 
@@ -7,13 +10,36 @@ import pulp  # Python for Mathematical Programming
 """
 
 
-def solve_linear_programming():
+def solve_linear_programming(backend="exact"):
+    """backend="exact" 使用内置有理数精确 LP 加分支定界，backend="pulp" 使用 PuLP 整数规划"""
+    if backend == "exact":
+        constraints = [
+            (1, 0, "<=", 4),  # x≤4
+            (0, 1, "<=", 3),  # y≤3
+            (1, 2, "<=", 8),  # x+2y≤8
+            (1, 0, ">=", 0),  # x≥0
+            (0, 1, ">=", 0),  # y≥0
+        ]
+        result = solve_integer_lp_2d((2, 3), constraints, maximize=True)
+        if result.status != "Optimal":
+            print("问题无解")
+            return
+        x_value, y_value = result.x
+        print(f"最优解：")
+        print(f"x = {float(x_value)}")
+        print(f"y = {float(y_value)}")
+        print(f"目标函数最大值 2x+3y = {float(result.objective)}")
+        return
+    if backend != "pulp":
+        raise ValueError(f"未知的求解后端：{backend}")
+
     # 创建最大化问题
     prob = pulp.LpProblem("线性规划问题", pulp.LpMaximize)
 
     # 创建变量
-    x = pulp.LpVariable("x", upBound=4)  # x≤4
-    y = pulp.LpVariable("y", upBound=3)  # y≤3
+    # 题目要求 x、y 为非负整数
+    x = pulp.LpVariable("x", lowBound=0, upBound=4, cat="Integer")  # x≤4
+    y = pulp.LpVariable("y", lowBound=0, upBound=3, cat="Integer")  # y≤3
 
     # 目标函数：最大化 2x+3y
     prob += 2 * x + 3 * y
@@ -22,7 +48,7 @@ def solve_linear_programming():
     prob += x + 2 * y <= 8  # x+2y≤8
 
     # 求解
-    prob.solve()
+    solve(prob)
 
     # 输出结果
     if pulp.LpStatus[prob.status] == "Optimal":
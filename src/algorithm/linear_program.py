@@ -1,5 +1,18 @@
+import math
+import random
+from collections import namedtuple
+from fractions import Fraction
+
+import numpy as np
 import pulp  # Python for Mathematical Programming
 
+try:
+    import highspy
+except ImportError:  # 未安装 highspy 时 LinearModel 不可用
+    highspy = None
+
+from solver import solve
+
 """
 线性规划问题
 
@@ -9,7 +22,438 @@ import pulp  # Python for Mathematical Programming
 """
 
 
-def solve_clothing_problem():
+# 线性规划求解结果：状态（与 pulp.LpStatus 相同的字符串）、变量取值、目标值、本次单纯形迭代次数
+LpSolution = namedtuple("LpSolution", ["status", "x", "objective", "iterations"])
+
+# 灵敏度分析结果（均按原目标方向）：各行松弛量 b - A x、影子价格、检验数、
+# 右端项范围 (m, 2) 与目标系数范围 (n, 2)，范围内当前最优基保持不变
+Sensitivity = namedtuple(
+    "Sensitivity",
+    ["slack", "duals", "reduced_costs", "rhs_ranges", "objective_ranges"],
+)
+
+
+# HiGHS 未能给出确定结论的模型状态
+_UNDETERMINED = (
+    ()
+    if highspy is None
+    else (
+        highspy.HighsModelStatus.kUnknown,
+        highspy.HighsModelStatus.kUnboundedOrInfeasible,
+    )
+)
+
+
+class LinearModel:
+    """持久化的线性规划模型：底层为一个 highspy.Highs 实例，求解后保留最优基
+
+    min/max c·x，s.t. A[i]·x (senses[i]) b[i]，lb <= x <= ub，senses 取 "<="、">="、"="。
+    set_objective、set_rhs、set_bounds 只把改动的行/列通过 changeColsCost、changeRowsBounds、
+    changeColsBounds 传给 HiGHS，不重建模型；再次 solve() 时 HiGHS 从上一个最优基热启动
+    （只改右端项或变量界时走对偶单纯形，只改目标系数时走原始单纯形），基矩阵的分解也随之更新。
+    """
+
+    def __init__(self, c, A, b, senses=None, lb=0.0, ub=np.inf, maximize=False):
+        if highspy is None:
+            raise ValueError("求解器不可用：highspy")
+        A = np.atleast_2d(np.asarray(A, dtype=float))
+        m, n = A.shape
+        if len(b) != m or len(c) != n:
+            raise ValueError("c、A、b 的维数不一致")
+        senses = list(senses or ["<="] * m)
+        for sense in senses:
+            if sense not in ("<=", ">=", "="):
+                raise ValueError(f"未知的约束类型：{sense}")
+        self.m, self.n = m, n
+        self.maximize = maximize
+        self._A = A
+        self._senses = np.array(senses, dtype=object)
+        self._b = np.asarray(b, dtype=float).copy()
+        self._c = np.asarray(c, dtype=float).copy()
+        self._lb = np.broadcast_to(np.asarray(lb, dtype=float), n).copy()
+        self._ub = np.broadcast_to(np.asarray(ub, dtype=float), n).copy()
+        self._optimal = False
+
+        lp = highspy.HighsLp()
+        lp.num_col_ = n
+        lp.num_row_ = m
+        lp.col_cost_ = self._c
+        lp.col_lower_ = self._lb
+        lp.col_upper_ = self._ub
+        lp.row_lower_, lp.row_upper_ = self._row_bounds(np.arange(m))
+        # 按列压缩存储约束矩阵
+        rows, cols = np.nonzero(A.T)
+        lp.a_matrix_.format_ = highspy.MatrixFormat.kColwise
+        lp.a_matrix_.num_col_ = n
+        lp.a_matrix_.num_row_ = m
+        lp.a_matrix_.start_ = np.concatenate([[0], np.cumsum(np.count_nonzero(A, 0))])
+        lp.a_matrix_.index_ = cols
+        lp.a_matrix_.value_ = A.T[rows, cols]
+        if maximize:
+            lp.sense_ = highspy.ObjSense.kMaximize
+        self._highs = highspy.Highs()
+        self._highs.setOptionValue("output_flag", False)
+        # 预处理在小模型上无收益，且会把无界问题报告为“无界或不可行”
+        self._highs.setOptionValue("presolve", "off")
+        self._highs.passModel(lp)
+
+    def _row_bounds(self, rows):
+        """第 rows 行的 (行下界, 行上界)"""
+        b = self._b[rows]
+        senses = self._senses[rows]
+        lower = np.where(senses == "<=", -np.inf, b)
+        upper = np.where(senses == ">=", np.inf, b)
+        return lower, upper
+
+    def set_objective(self, cols, values):
+        """修改目标系数 c[cols] = values，下次 solve 从当前基做原始单纯形热启动"""
+        self._c[cols] = values
+        cols = np.atleast_1d(np.arange(self.n)[cols])
+        self._highs.changeColsCost(len(cols), cols, self._c[cols])
+        self._optimal = False
+
+    def set_rhs(self, rows, values):
+        """修改右端项 b[rows] = values，下次 solve 从当前基做对偶单纯形热启动"""
+        self._b[rows] = values
+        rows = np.atleast_1d(np.arange(self.m)[rows])
+        lower, upper = self._row_bounds(rows)
+        self._highs.changeRowsBounds(len(rows), rows, lower, upper)
+        self._optimal = False
+
+    def set_bounds(self, cols, lb=None, ub=None):
+        """修改变量界，None 表示保持不变"""
+        if lb is not None:
+            self._lb[cols] = lb
+        if ub is not None:
+            self._ub[cols] = ub
+        cols = np.atleast_1d(np.arange(self.n)[cols])
+        self._highs.changeColsBounds(len(cols), cols, self._lb[cols], self._ub[cols])
+        self._optimal = False
+
+    def _run(self):
+        """运行 HiGHS，返回 (状态, 单纯形迭代次数)"""
+        h = self._highs
+        h.run()
+        if h.getModelStatus() in _UNDETERMINED:
+            # 热启动偶尔无法判定状态（退化循环等），丢弃旧基冷启动重解一次
+            h.clearSolver()
+            h.run()
+        status = {
+            highspy.HighsModelStatus.kOptimal: "Optimal",
+            highspy.HighsModelStatus.kInfeasible: "Infeasible",
+            highspy.HighsModelStatus.kUnbounded: "Unbounded",
+        }.get(h.getModelStatus(), "Not Solved")
+        return status, max(h.getInfo().simplex_iteration_count, 0)
+
+    def solve(self):
+        """从当前基出发求解，返回 LpSolution；非最优时 x 与 objective 为 None"""
+        status, iterations = self._run()
+        self._optimal = status == "Optimal"
+        if status != "Optimal":
+            return LpSolution(status, None, None, iterations)
+        x = np.array(self._highs.getSolution().col_value)
+        return LpSolution(status, x, self._c @ x, iterations)
+
+    def sensitivity(self):
+        """由最近一次 solve 的最优基直接给出灵敏度分析结果，无需重复求解
+
+        影子价格与检验数取自 HiGHS 的 row_dual、col_dual，目标系数范围与起作用约束的
+        右端项范围取自 getRanging()。不起作用的约束（松弛量非零，行在基中）的右端项
+        只要不越过当前行值，最优基就不变；getRanging 对基中的行给出的是行值本身的范围，
+        因此这部分直接由行值得到。
+        """
+        if not self._optimal:
+            raise ValueError("模型尚未求得最优解，请先调用 solve()")
+        h = self._highs
+        solution = h.getSolution()
+        activity = np.array(solution.row_value)
+        basis = h.getBasis()
+        basic_rows = np.array(
+            [s == highspy.HighsBasisStatus.kBasic for s in basis.row_status], dtype=bool
+        )
+        reduced_costs = np.array(solution.col_dual)
+
+        status, ranging = h.getRanging()
+        if status == highspy.HighsStatus.kOk:
+            rhs_ranges = np.column_stack(
+                [ranging.row_bound_dn.value_, ranging.row_bound_up.value_]
+            )
+            objective_ranges = np.column_stack(
+                [
+                    ranging.col_cost_dn.value_[: self.n],
+                    ranging.col_cost_up.value_[: self.n],
+                ]
+            )
+        else:
+            # 约束矩阵全为零时 HiGHS 不做灵敏度分析：各行都在基中，各列只受自身检验数约束
+            basic_rows[:] = True
+            rhs_ranges = np.empty((self.m, 2))
+            objective_ranges = self._bound_ranges(basis.col_status, reduced_costs)
+        senses = self._senses
+        rhs_ranges[basic_rows, 0] = np.where(senses == ">=", -np.inf, activity)[
+            basic_rows
+        ]
+        rhs_ranges[basic_rows, 1] = np.where(senses == "<=", np.inf, activity)[
+            basic_rows
+        ]
+
+        # 加 0.0 把 -0.0 规范为 0.0
+        return Sensitivity(
+            self._b - activity,
+            np.array(solution.row_dual) + 0.0,
+            reduced_costs + 0.0,
+            rhs_ranges,
+            objective_ranges,
+        )
+
+    def _bound_ranges(self, col_status, reduced_costs):
+        """列不出现在任何约束中时的目标系数范围：非基变量的系数可向不利方向变化 |检验数|"""
+        ranges = np.empty((self.n, 2))
+        for j, (status, d) in enumerate(zip(col_status, reduced_costs)):
+            c = self._c[j]
+            if self._lb[j] == self._ub[j]:
+                ranges[j] = -np.inf, np.inf
+            elif status == highspy.HighsBasisStatus.kLower:
+                ranges[j] = (-np.inf, c - d) if self.maximize else (c - d, np.inf)
+            elif status == highspy.HighsBasisStatus.kUpper:
+                ranges[j] = (c - d, np.inf) if self.maximize else (-np.inf, c - d)
+            else:
+                ranges[j] = c, c
+        return ranges
+
+    def solve_integer(self, integer=None, tol=1e-6, max_nodes=100000):
+        """整数规划，integer 为整数变量下标（默认全部变量），由 HiGHS 的分支定界求解
+
+        只临时把这些列标记为整数，结束后恢复为连续变量；tol 为整数可行性容差，
+        超过 max_nodes 个节点返回 "Not Solved"。
+        """
+        integer = np.arange(self.n) if integer is None else np.asarray(integer)
+        h = self._highs
+        h.setOptionValue("mip_feasibility_tolerance", tol)
+        h.setOptionValue("mip_max_nodes", max_nodes)
+        kinds = [highspy.HighsVarType.kInteger] * len(integer)
+        h.changeColsIntegrality(len(integer), integer, kinds)
+        try:
+            status, iterations = self._run()
+            x = np.array(h.getSolution().col_value) if status == "Optimal" else None
+        finally:
+            kinds = [highspy.HighsVarType.kContinuous] * len(integer)
+            h.changeColsIntegrality(len(integer), integer, kinds)
+            # 整数规划没有可用于灵敏度分析的最优基
+            self._optimal = False
+        if x is None:
+            return LpSolution(status, None, None, iterations)
+        x[integer] = np.round(x[integer])
+        return LpSolution(status, x, self._c @ x, iterations)
+
+
+def _halfplanes_2d(constraints):
+    """把 (a, b, sense, r) 约束统一为 a·x + b·y <= r 的 Fraction 三元组"""
+    halfplanes = []
+    for a, b, sense, r in constraints:
+        if sense not in ("<=", ">=", "="):
+            raise ValueError(f"未知的约束类型：{sense}")
+        a, b, r = Fraction(a), Fraction(b), Fraction(r)
+        if sense in ("<=", "="):
+            halfplanes.append((a, b, r))
+        if sense in (">=", "="):
+            halfplanes.append((-a, -b, -r))
+    return halfplanes
+
+
+def _box_size_2d(halfplanes):
+    """可行域所有顶点及离原点最近点的坐标上界
+
+    每个约束乘以分母的最小公倍数化为整数系数后，两直线交点坐标为整数行列式之比，
+    分母至少为 1，故 |x|, |y| <= 2·R·B，R、B 为右端项与系数绝对值的最大值。
+    """
+    rhs = coef = 1
+    for a, b, r in halfplanes:
+        scale = math.lcm(a.denominator, b.denominator, r.denominator)
+        rhs = max(rhs, abs(r * scale))
+        coef = max(coef, abs(a * scale), abs(b * scale))
+    return 2 * rhs * coef + 1
+
+
+def _lexmin_on_line(line, halfplanes, c):
+    """在直线 a·x + b·y = r 上满足 halfplanes 的点中，求 (c·p, x, y) 字典序最小者
+
+    直线参数化为 p0 + t·d，每个约束给出 t 的一个上界或下界；无可行点时返回 None。
+    """
+    a, b, r = line
+    norm = a * a + b * b
+    p0 = (a * r / norm, b * r / norm)
+    d = (-b, a)
+    low = high = None
+    for ga, gb, gr in halfplanes:
+        slope = ga * d[0] + gb * d[1]
+        room = gr - ga * p0[0] - gb * p0[1]
+        if slope == 0:
+            if room < 0:
+                return None
+        elif slope > 0:
+            high = room / slope if high is None else min(high, room / slope)
+        else:
+            low = room / slope if low is None else max(low, room / slope)
+    if low is not None and high is not None and low > high:
+        return None
+    # 目标值沿直线不变时依次按 x、y 取最小，保证最优点唯一
+    direction = next(k for k in (c[0] * d[0] + c[1] * d[1], d[0], d[1]) if k != 0)
+    t = low if direction > 0 else high
+    return (p0[0] + t * d[0], p0[1] + t * d[1])
+
+
+def _seidel_2d(c, halfplanes, size, rng):
+    """Seidel 随机增量算法：在 [-size, size]² 内求字典序最优点，返回 (点, 重算次数)
+
+    约束随机排列后逐个加入，当前最优点违反新约束时最优点必落在其边界上，
+    在已加入的约束下解一维问题；第 i 个约束触发重算的概率至多为 2/i，期望时间 O(n)。
+    """
+    active = [(1, 0, size), (-1, 0, size), (0, 1, size), (0, -1, size)]
+    p = (size if c[0] < 0 else -size, size if c[1] < 0 else -size)
+    order = list(halfplanes)
+    rng.shuffle(order)
+    steps = 0
+    for h in order:
+        if h[0] * p[0] + h[1] * p[1] > h[2]:
+            steps += 1
+            p = _lexmin_on_line(h, active, c)
+            if p is None:
+                return None, steps
+        active.append(h)
+    return p, steps
+
+
+def solve_lp_2d(objective, constraints, maximize=False, seed=None):
+    """两变量线性规划的进程内精确求解，返回 LpSolution，x 为 Fraction 二元组 (x, y)
+
+    objective = (c1, c2)；constraints 为 (a, b, sense, r) 四元组，表示 a·x + b·y (sense) r，
+    sense 取 "<="、">="、"="，变量界也写成约束。全部系数转为 fractions.Fraction，结果无舍入误差。
+    先在足够大的包围盒内求解；最优点落在盒边界时把盒子放大一倍，目标值仍改善即判定无界。
+    """
+    halfplanes = []
+    for a, b, r in _halfplanes_2d(constraints):
+        if a == 0 and b == 0:
+            if r < 0:
+                return LpSolution("Infeasible", None, None, 0)
+        else:
+            halfplanes.append((a, b, r))
+    c = tuple(Fraction(v) for v in objective)
+    if maximize:
+        c = (-c[0], -c[1])
+    rng = random.Random(seed)
+    size = _box_size_2d(halfplanes)
+    p, steps = _seidel_2d(c, halfplanes, size, rng)
+    if p is None:
+        return LpSolution("Infeasible", None, None, steps)
+    value = c[0] * p[0] + c[1] * p[1]
+    if max(abs(p[0]), abs(p[1])) == size:
+        q, more = _seidel_2d(c, halfplanes, 2 * size, rng)
+        steps += more
+        if c[0] * q[0] + c[1] * q[1] < value:
+            return LpSolution("Unbounded", None, None, steps)
+    return LpSolution("Optimal", p, -value if maximize else value, steps)
+
+
+def solve_integer_lp_2d(
+    objective, constraints, maximize=False, seed=None, max_columns=20000
+):
+    """两变量整数线性规划：在由 LP 松弛确定的有限整数盒内逐列枚举，返回 LpSolution
+
+    先用 solve_lp_2d 求 x、y 各自的最小、最大值，得到包住可行域的整数盒；可行域无界时
+    抛出 ValueError，需用约束给出两个变量的上下界。沿盒子较窄的坐标轴逐列枚举：固定该坐标后，
+    另一坐标的可行整数构成一个区间，最优点必在区间端点，每列只需 O(约束数) 次有理数运算。
+    列数超过 max_columns 时不做枚举，直接返回 "Not Solved"；最优解不唯一时取 (x, y) 字典序最小者。
+    """
+    constraints = list(constraints)
+    halfplanes = _halfplanes_2d(constraints)
+    c = tuple(Fraction(v) for v in objective)
+    if maximize:
+        c = (-c[0], -c[1])
+    steps = 0
+    box = []
+    for unit in ((1, 0), (0, 1)):
+        ends = []
+        for upper in (False, True):
+            result = solve_lp_2d(unit, constraints, upper, seed)
+            steps += result.iterations
+            if result.status == "Infeasible":
+                return LpSolution("Infeasible", None, None, steps)
+            if result.status == "Unbounded":
+                raise ValueError("可行域无界，请用约束给出两个变量的上下界")
+            ends.append(result.objective)
+        box.append((math.ceil(ends[0]), math.floor(ends[1])))
+
+    axis = 0 if box[0][1] - box[0][0] <= box[1][1] - box[1][0] else 1
+    other = 1 - axis
+    low, high = box[axis]
+    if high - low + 1 > max_columns:
+        return LpSolution("Not Solved", None, None, steps)
+    best = None
+    for v in range(low, high + 1):
+        steps += 1
+        # 固定 p[axis] = v 后，每个约束给出 p[other] 的一个上界或下界
+        lo, hi = box[other]
+        for h in halfplanes:
+            room = h[2] - h[axis] * v
+            if h[other] > 0:
+                hi = min(hi, math.floor(room / h[other]))
+            elif h[other] < 0:
+                lo = max(lo, math.ceil(room / h[other]))
+            elif room < 0:
+                hi = lo - 1
+            if lo > hi:
+                break
+        if lo > hi:
+            continue
+        w = hi if c[other] < 0 else lo
+        p = (v, w) if axis == 0 else (w, v)
+        key = (c[0] * p[0] + c[1] * p[1], p)
+        if best is None or key < best:
+            best = key
+    if best is None:
+        return LpSolution("Infeasible", None, None, steps)
+    value, p = best
+    x = (Fraction(p[0]), Fraction(p[1]))
+    return LpSolution("Optimal", x, -value if maximize else value, steps)
+
+
+def build_clothing_model(top_rates=(5, 6, 7, 8), bottom_rates=(6, 7, 8, 9), days=15):
+    """服装生产问题的持久化模型：前 k 列为各组做上衣的天数，后 k 列为做裤子的天数
+
+    第 0 行要求上衣与裤子数量相等，第 1..k 行为各组总工作天数（= days）；
+    修改工期用 model.set_rhs(slice(1, None), days)，修改日产量需重建模型。
+    """
+    k = len(top_rates)
+    A = np.zeros((k + 1, 2 * k))
+    A[0, :k] = top_rates
+    A[0, k:] = -np.asarray(bottom_rates)
+    A[1:, :k] = np.eye(k)
+    A[1:, k:] = np.eye(k)
+    c = np.concatenate([top_rates, np.zeros(k)])
+    b = np.concatenate([[0.0], np.broadcast_to(days, k)])
+    return LinearModel(c, A, b, senses=["="] * (k + 1), maximize=True)
+
+
+def solve_clothing_problem(backend=None):
+    """backend="simplex" 使用 LinearModel.solve_integer（HiGHS 分支定界），backend="pulp" 使用 PuLP 整数规划模型；
+    默认在安装了 highspy 时用 "simplex"，否则回退到 "pulp"。"""
+    if backend is None:
+        backend = "pulp" if highspy is None else "simplex"
+    if backend == "simplex":
+        result = build_clothing_model().solve_integer()
+        if result.status != "Optimal":
+            print("问题无解")
+            return
+        days = np.round(result.x).astype(int)
+        print(f"最多可以生产 {round(result.objective)} 套衣服")
+        print("\n具体安排：")
+        for g, group in enumerate("甲乙丙丁"):
+            print(f"{group}组：做上衣 {days[g]} 天，做裤子 {days[g + 4]} 天")
+        return
+    if backend != "pulp":
+        raise ValueError(f"未知的求解后端：{backend}")
+
     # 创建线性规划问题
     prob = pulp.LpProblem("服装生产规划", pulp.LpMaximize)
 
@@ -37,7 +481,7 @@ def solve_clothing_problem():
     prob += xd + yd == 15  # 丁组总工作天数为15
 
     # 求解
-    prob.solve()
+    solve(prob)
 
     # 输出结果
     if pulp.LpStatus[prob.status] == "Optimal":
@@ -1,5 +1,10 @@
+from collections import deque, namedtuple
+
+import numpy as np
 import pulp
 
+from solver import solve
+
 """
 在军事演习中，张司令希望将部队尽快从A地通过公路网（见下图）运送到F地：
 复制
@@ -16,13 +21,239 @@ C ---6-- E ---15-- F
 """
 
 
-def solve_max_flow():
-    # 创建最大流问题
-    prob = pulp.LpProblem("最大流问题", pulp.LpMaximize)
+# 最大流结果：流量值、各边流量、最小割源点侧节点集合及割边
+MaxFlowResult = namedtuple(
+    "MaxFlowResult", ["value", "flows", "source_side", "cut_edges"]
+)
+
+
+class FlowNetwork:
+    """基于 CSR 邻接数组的残量网络，使用 Dinic 算法（BFS 分层 + 当前弧优化）求最大流
+
+    capacities 为 {(u, v): 容量} 字典。每条边对应一条正向弧和一条容量为 0 的反向弧，
+    所有弧按起点排序存放，start[u]:start[u+1] 为节点 u 的出弧区间，rev[a] 为弧 a 的反向弧。
+    自环边不在任何增广路上，流量恒为 0，但保留在网络中，之后仍可更新其容量。
+    """
+
+    def __init__(self, capacities):
+        self.edges = list(capacities)
+        nodes = {}
+        for u, v in self.edges:
+            nodes.setdefault(u, len(nodes))
+            nodes.setdefault(v, len(nodes))
+        self.nodes = list(nodes)
+        self.index = nodes
+
+        m = len(self.edges)
+        tails = np.empty(2 * m, dtype=np.int64)
+        heads = np.empty(2 * m, dtype=np.int64)
+        caps = [0] * (2 * m)
+        for e, (u, v) in enumerate(self.edges):
+            c = capacities[u, v]
+            if c < 0:
+                raise ValueError(f"边{u}->{v}的容量不能为负数")
+            tails[2 * e], heads[2 * e], caps[2 * e] = nodes[u], nodes[v], c
+            tails[2 * e + 1], heads[2 * e + 1] = nodes[v], nodes[u]
+
+        # 按起点排序得到 CSR 布局，position[a] 为原第 a 条弧排序后的位置
+        order = np.argsort(tails, kind="stable")
+        position = np.empty_like(order)
+        position[order] = np.arange(2 * m)
+        self.start = np.searchsorted(tails[order], np.arange(len(nodes) + 1)).tolist()
+        self.head = heads[order].tolist()
+        self.cap = [caps[a] for a in order.tolist()]
+        self.rev = position[order ^ 1].tolist()
+        # 原始边 e 对应的正向弧位置
+        self.arc_of_edge = position[0::2].tolist()
+        self.capacity = caps[0::2]
+        self.edge_index = {edge: e for e, edge in enumerate(self.edges)}
+        self.source = None
+        self.sink = None
+        self.value = 0
+
+    def _bfs(self, s):
+        """在残量网络上构建分层图，返回各节点层号（不可达为 -1）"""
+        level = [-1] * len(self.nodes)
+        level[s] = 0
+        queue = deque([s])
+        start, head, cap = self.start, self.head, self.cap
+        while queue:
+            u = queue.popleft()
+            for a in range(start[u], start[u + 1]):
+                v = head[a]
+                if cap[a] > 0 and level[v] < 0:
+                    level[v] = level[u] + 1
+                    queue.append(v)
+        return level
+
+    def _augment(self, s, t, limit=float("inf")):
+        """Dinic 主循环：反复分层并在分层图上找阻塞流，返回本次增加的流量"""
+        start, head, cap, rev = self.start, self.head, self.cap, self.rev
+        total = 0
+        while total < limit:
+            level = self._bfs(s)
+            if level[t] < 0:
+                break
+            # 当前弧：每个节点下一条待检查的出弧
+            it = start[:-1]
+            path = []  # 当前增广路上的弧
+            u = s
+            while total < limit:
+                if u == t:
+                    # 找到增广路，按瓶颈容量增广并退回到第一条饱和弧的起点
+                    delta = min(min(cap[a] for a in path), limit - total)
+                    for a in path:
+                        cap[a] -= delta
+                        cap[rev[a]] += delta
+                    total += delta
+                    if total >= limit:
+                        break
+                    k = next(k for k, a in enumerate(path) if cap[a] == 0)
+                    del path[k:]
+                    u = head[path[-1]] if path else s
+                    continue
+                end = start[u + 1]
+                a = it[u]
+                while a < end and not (cap[a] > 0 and level[head[a]] == level[u] + 1):
+                    a += 1
+                it[u] = a
+                if a < end:
+                    path.append(a)
+                    u = head[a]
+                elif u == s:
+                    break
+                else:
+                    # 死路：该节点在本轮分层图中不再可用，回退一步并跳过这条弧
+                    level[u] = -1
+                    a = path.pop()
+                    u = head[rev[a]]
+                    it[u] += 1
+        return total
+
+    def max_flow(self, source, sink):
+        """计算 source 到 sink 的最大流，返回 MaxFlowResult
+
+        网络会保留残量图和当前流，之后可用 set_capacity / change_capacity 增量更新。
+        换用新的源汇点时先清空已有流量。
+        """
+        if source == sink:
+            raise ValueError("源点和汇点不能是同一个节点")
+        if (source, sink) != (self.source, self.sink):
+            self._reset()
+            self.source, self.sink = source, sink
+        s, t = self.index[source], self.index[sink]
+        self.value += self._augment(s, t)
+        return self.result()
+
+    def _reset(self):
+        """清空全部流量，恢复初始残量网络"""
+        for e, a in enumerate(self.arc_of_edge):
+            self.cap[a] = self.capacity[e]
+            self.cap[self.rev[a]] = 0
+        self.value = 0
+
+    def set_capacity(self, u, v, capacity):
+        """把已有边 u->v 的容量改为 capacity，并只通过局部增广/退流恢复最优，返回新的最大流值
+
+        容量增加：直接放宽残量后继续增广。
+        容量减少到低于当前流量 f 时，先把该边流量降到新容量，产生的多余流量 f - capacity
+        优先在残量网络中从 u 绕行到 v；无法绕行的部分沿残量路径从 u 退回源点、
+        从汇点退回 v，最大流值相应减少，最后再尝试从源点重新增广。
+        """
+        if capacity < 0:
+            raise ValueError(f"边{u}->{v}的容量不能为负数")
+        e = self.edge_index.get((u, v))
+        if e is None:
+            raise KeyError(f"网络中不存在边{u}->{v}，新增边需要重新构建网络")
+        a = self.arc_of_edge[e]
+        r = self.rev[a]
+        flow = self.capacity[e] - self.cap[a]
+        self.capacity[e] = capacity
+        if self.source is None:
+            self.cap[a] = capacity
+            return self.value
+
+        s, t = self.index[self.source], self.index[self.sink]
+        if capacity >= flow:
+            self.cap[a] = capacity - flow
+        else:
+            excess = flow - capacity
+            self.cap[a] = 0
+            self.cap[r] -= excess
+            x, y = self.index[u], self.index[v]
+            # 多余流量先尝试从 u 绕行到 v，总流量不变
+            excess -= self._augment(x, y, excess)
+            if excess > 0:
+                # 剩余部分从 u 退回源点、从汇点退回 v
+                if x != s:
+                    self._augment(x, s, excess)
+                if y != t:
+                    self._augment(t, y, excess)
+                self.value -= excess
+        self.value += self._augment(s, t)
+        return self.value
+
+    def change_capacity(self, u, v, delta):
+        """把边 u->v 的容量增加 delta（可为负数），返回新的最大流值"""
+        e = self.edge_index.get((u, v))
+        if e is None:
+            raise KeyError(f"网络中不存在边{u}->{v}，新增边需要重新构建网络")
+        return self.set_capacity(u, v, self.capacity[e] + delta)
+
+    def result(self):
+        """根据当前残量网络整理流量、最小割"""
+        flows = {
+            edge: self.capacity[e] - self.cap[self.arc_of_edge[e]]
+            for e, edge in enumerate(self.edges)
+        }
+        level = self._bfs(self.index[self.source])
+        source_side = {self.nodes[v] for v, lv in enumerate(level) if lv >= 0}
+        cut_edges = [
+            (u, v) for u, v in self.edges if u in source_side and v not in source_side
+        ]
+        return MaxFlowResult(self.value, flows, source_side, cut_edges)
 
-    # 定义节点集合
-    nodes = ["A", "B", "C", "D", "E", "F"]
 
+def build_max_flow_model(capacities, source, sink, name="最大流问题"):
+    """由边容量字典构建最大流线性规划模型，返回 (模型, 各边流量变量字典)
+
+    只为实际存在的边创建变量（容量作为变量上界），每个中间节点一条流量守恒约束，
+    模型规模为 O(V+E)。目标为源点的净流出量。
+    """
+    prob = pulp.LpProblem(name, pulp.LpMaximize)
+
+    # 每条边一个流量变量，0 <= flow <= 容量
+    flows = {
+        (i, j): pulp.LpVariable(f"flow_{k}", lowBound=0, upBound=c)
+        for k, ((i, j), c) in enumerate(capacities.items())
+    }
+
+    # 按节点汇总流入、流出的边
+    inflow = {}
+    outflow = {}
+    for (i, j), flow in flows.items():
+        outflow.setdefault(i, []).append(flow)
+        inflow.setdefault(j, []).append(flow)
+
+    # 目标函数：最大化源点的净流出量
+    prob += pulp.lpSum(outflow.get(source, [])) - pulp.lpSum(inflow.get(source, []))
+
+    # 约束条件：除源点和汇点外，每个节点流入等于流出
+    for node in inflow.keys() | outflow.keys():
+        if node not in (source, sink):
+            prob += pulp.lpSum(inflow.get(node, [])) == pulp.lpSum(
+                outflow.get(node, [])
+            )
+    return prob, flows
+
+
+def dinic_max_flow(capacities, source, sink):
+    """用 Dinic 算法求 capacities 描述的网络中 source 到 sink 的最大流"""
+    return FlowNetwork(capacities).max_flow(source, sink)
+
+
+def solve_max_flow(backend="dinic"):
+    """backend="dinic" 使用内置 Dinic 算法，backend="pulp" 使用 PuLP 线性规划模型"""
     # 定义边的初始容量
     capacities = {
         ("A", "B"): 13,
@@ -35,45 +266,26 @@ def solve_max_flow():
         ("E", "F"): 14,  # 受B->E=5, C->E=2, D->E=3限制，总和为10
     }
 
-    # 创建流量变量
-    flows = pulp.LpVariable.dicts(
-        "flow", ((i, j) for i in nodes for j in nodes), lowBound=0
-    )
-
-    # 目标函数：最大化到达F的总流量
-    prob += pulp.lpSum(flows[j, "F"] for j in nodes if (j, "F") in capacities)
-
-    # 约束条件1：流量不超过容量
-    for i, j in capacities:
-        prob += flows[i, j] <= capacities[i, j]
-
-    # 约束条件2：节点B的流量分配
-    prob += flows["A", "B"] <= 13  # B的输入限制
-    prob += flows["B", "F"] + flows["B", "E"] <= flows["A", "B"]  # B的输出不超过输入
-    prob += flows["B", "F"] <= 8  # B到F的容量限制
-    prob += flows["B", "E"] <= 5  # B到E的容量限制
+    if backend == "dinic":
+        result = dinic_max_flow(capacities, "A", "F")
+        print(f"从A地到F地的最大运量是：{result.value}千人/小时")
 
-    # 约束条件3：节点C的流量分配
-    prob += flows["A", "C"] <= 2  # C的输入限制
-    prob += flows["C", "E"] <= flows["A", "C"]  # C的输出不超过输入
-
-    # 约束条件4：节点D的流量分配
-    prob += flows["A", "D"] <= 3  # D的输入限制
-    prob += flows["D", "E"] <= flows["A", "D"]  # D的输出不超过输入
+        print("\n各路段的流量分配：")
+        for (i, j), flow_value in result.flows.items():
+            if flow_value > 0:
+                print(f"{i}->{j}: {flow_value:.1f}千人/小时")
 
-    # 约束条件5：节点E的流量分配
-    inflow_E = pulp.lpSum(flows[j, "E"] for j in ["B", "C", "D"])
-    prob += flows["E", "F"] <= inflow_E  # E的输出不超过总输入
-    prob += flows["E", "F"] <= 15  # E到F的容量限制
+        print("\n最小割：")
+        for i, j in result.cut_edges:
+            print(f"{i}->{j}: {capacities[i, j]}千人/小时")
+        return
+    if backend != "pulp":
+        raise ValueError(f"未知的求解后端：{backend}")
 
-    # 约束条件6：不存在的边流量为0
-    for i in nodes:
-        for j in nodes:
-            if (i, j) not in capacities:
-                prob += flows[i, j] == 0
+    prob, flows = build_max_flow_model(capacities, "A", "F")
 
     # 求解
-    prob.solve()
+    solve(prob)
 
     # 输出结果
     if pulp.LpStatus[prob.status] == "Optimal":
@@ -81,8 +293,8 @@ def solve_max_flow():
         print(f"从A地到F地的最大运量是：{max_flow_value}千人/小时")
 
         print("\n各路段的流量分配：")
-        for i, j in capacities:
-            flow_value = pulp.value(flows[i, j])
+        for (i, j), flow in flows.items():
+            flow_value = pulp.value(flow)
             if flow_value > 0:
                 print(f"{i}->{j}: {flow_value:.1f}千人/小时")
     else:
@@ -1,5 +1,7 @@
 import pulp
 
+from solver import solve
+
 """
 流水线调度问题
 
@@ -17,102 +19,187 @@ import pulp
 """
 
 
-def solve_flow_shop():
-    # 创建流水线调度问题
+def _left_shifted_starts(sequence, times, stages):
+    """按给定顺序用正向递推 C[k,s] = max(C[k-1,s], C[k,s-1]) + t 计算最早开始时间
+
+    MIP 只约束完成时间的下界，非关键工序的开始时间可能被无谓地推后，这里统一左移。
+    """
+    starts = {}
+    ready = {s: 0 for s in stages}
+    for i in sequence:
+        finish = 0
+        starts[i] = {}
+        for s in stages:
+            starts[i][s] = max(ready[s], finish)
+            finish = starts[i][s] + times[i][s]
+            ready[s] = finish
+    return starts
+
+
+def _build_big_m_model(products, times, stages):
+    """原始的产品下标模型：相邻位置的先后关系用大 M 约束表达，约束数 O(n³m)
+
+    返回 (模型, 完工时间变量, 提取结果的函数)。
+    """
     prob = pulp.LpProblem("流水线调度问题", pulp.LpMinimize)
+    n = len(products)
 
-    # 定义数据
-    products = ["甲", "乙", "丙", "丁"]
-    times = {
-        "甲": {"design": 13, "manufacture": 15, "inspect": 20},
-        "乙": {"design": 10, "manufacture": 20, "inspect": 18},
-        "丙": {"design": 20, "manufacture": 16, "inspect": 10},
-        "丁": {"design": 8, "manufacture": 10, "inspect": 15},
+    # 决策变量：每个产品在各阶段的开始时间
+    start = {
+        s: pulp.LpVariable.dicts(f"{s}_start", products, lowBound=0) for s in stages
     }
 
-    # 决策变量：每个产品的开始时间
-    design_start = pulp.LpVariable.dicts("design_start", products, lowBound=0)
-    manufacture_start = pulp.LpVariable.dicts("manufacture_start", products, lowBound=0)
-    inspect_start = pulp.LpVariable.dicts("inspect_start", products, lowBound=0)
-
     # 决策变量：产品顺序（二进制变量）
     sequence = pulp.LpVariable.dicts(
-        "seq", ((i, j) for i in products for j in range(len(products))), cat="Binary"
+        "seq", ((i, j) for i in products for j in range(n)), cat="Binary"
     )
 
     # 目标函数：最小化最后一个产品的完成时间
     makespan = pulp.LpVariable("makespan", lowBound=0)
     prob += makespan
 
-    # 约束条件
-    M = 1000  # 大数
+    # 大数取全部加工时间之和，任何开始时间都不会超过它
+    M = sum(times[i][s] for i in products for s in stages)
 
     # 1. 每个位置只能安排一个产品
-    for j in range(len(products)):
+    for j in range(n):
         prob += pulp.lpSum(sequence[i, j] for i in products) == 1
 
     # 2. 每个产品只能安排一次
     for i in products:
-        prob += pulp.lpSum(sequence[i, j] for j in range(len(products))) == 1
+        prob += pulp.lpSum(sequence[i, j] for j in range(n)) == 1
 
-    # 3. 工序顺序约束
+    # 3. 工序顺序约束：后一阶段必须在前一阶段完成后开始
     for i in products:
-        # 制造必须在设计完成后开始
-        prob += manufacture_start[i] >= design_start[i] + times[i]["design"]
-        # 检验必须在制造完成后开始
-        prob += inspect_start[i] >= manufacture_start[i] + times[i]["manufacture"]
+        for prev, cur in zip(stages, stages[1:]):
+            prob += start[cur][i] >= start[prev][i] + times[i][prev]
         # 完工时间约束
-        prob += makespan >= inspect_start[i] + times[i]["inspect"]
+        prob += makespan >= start[stages[-1]][i] + times[i][stages[-1]]
 
     # 4. 相邻产品的同步等待约束
     for i in products:
         for k in products:
             if i != k:
-                for j in range(len(products) - 1):
-                    # 如果产品i在位置j，产品k在位置j+1
-                    # 设计部门约束 后一个产品必须等前一个产品设计完成
-                    prob += design_start[k] >= (
-                        design_start[i]
-                        + times[i]["design"]
-                        - M * (2 - sequence[i, j] - sequence[k, j + 1])
-                    )
-                    # 制造部门约束 后一个产品必须等前一个产品制造完成
-                    prob += manufacture_start[k] >= (
-                        manufacture_start[i]
-                        + times[i]["manufacture"]
-                        - M * (2 - sequence[i, j] - sequence[k, j + 1])
-                    )
-                    # 检验部门约束 后一个产品必须等前一个产品检验完成
-                    prob += inspect_start[k] >= (
-                        inspect_start[i]
-                        + times[i]["inspect"]
-                        - M * (2 - sequence[i, j] - sequence[k, j + 1])
-                    )
+                for j in range(n - 1):
+                    # 如果产品i在位置j，产品k在位置j+1，则每个部门后一个产品必须等前一个产品完成
+                    for s in stages:
+                        prob += start[s][k] >= (
+                            start[s][i]
+                            + times[i][s]
+                            - M * (2 - sequence[i, j] - sequence[k, j + 1])
+                        )
+
+    def extract():
+        optimal_sequence = []
+        for j in range(n):
+            for i in products:
+                if pulp.value(sequence[i, j]) > 0.5:
+                    optimal_sequence.append(i)
+        return optimal_sequence, _left_shifted_starts(optimal_sequence, times, stages)
 
-    # 求解
-    prob.solve()
+    return prob, makespan, extract
 
-    # 输出结果
-    if pulp.LpStatus[prob.status] == "Optimal":
-        # 获取最优序列
+
+def _build_position_model(products, times, stages):
+    """位置下标模型（Wagner/Wilson）：完成时间按顺序位置而非产品编号索引
+
+    C[k, s] 为第 k 个位置在阶段 s 的完成时间，只需 O(n·m) 个连续变量和 O(n·m) 个约束，
+    且不需要大 M。返回 (模型, 完工时间变量, 提取结果的函数)。
+    """
+    prob = pulp.LpProblem("流水线调度问题_位置模型", pulp.LpMinimize)
+    n = len(products)
+    positions = range(n)
+
+    # 决策变量：z[i, k] = 1 表示产品i安排在位置k
+    z = pulp.LpVariable.dicts(
+        "z", ((i, k) for i in products for k in positions), cat="Binary"
+    )
+    # 决策变量：位置k在阶段s的完成时间
+    completion = pulp.LpVariable.dicts(
+        "C", ((k, s) for k in positions for s in stages), lowBound=0
+    )
+
+    # 目标函数：最小化最后一个位置在最后阶段的完成时间
+    makespan = completion[n - 1, stages[-1]]
+    prob += makespan
+
+    # 1. 每个位置只能安排一个产品，每个产品只能安排一次
+    for k in positions:
+        prob += pulp.lpSum(z[i, k] for i in products) == 1
+    for i in products:
+        prob += pulp.lpSum(z[i, k] for k in positions) == 1
+
+    for k in positions:
+        for idx, s in enumerate(stages):
+            # 位置k在阶段s的加工时间
+            duration = pulp.lpSum(times[i][s] * z[i, k] for i in products)
+            # 2. 同一位置：必须等本产品上一阶段完成
+            if idx == 0:
+                prob += completion[k, s] >= duration
+            else:
+                prob += completion[k, s] >= completion[k, stages[idx - 1]] + duration
+            # 3. 同一阶段：必须等上一位置的产品完成
+            if k > 0:
+                prob += completion[k, s] >= completion[k - 1, s] + duration
+
+    def extract():
         optimal_sequence = []
-        for j in range(len(products)):
+        for k in positions:
             for i in products:
-                if pulp.value(sequence[i, j]) == 1:
+                if pulp.value(z[i, k]) > 0.5:
                     optimal_sequence.append(i)
+        return optimal_sequence, _left_shifted_starts(optimal_sequence, times, stages)
+
+    return prob, makespan, extract
+
+
+def solve_flow_shop(model="position", times=None, stages=None):
+    """model="position" 使用位置下标模型，model="big_m" 使用原始大 M 模型
+
+    times 为 {产品: {阶段: 加工时间}}，默认使用题目中的四个产品；stages 为阶段顺序，
+    默认取 times 中第一个产品的阶段顺序。返回 (最优顺序, 最短完成时间, 各工序开始时间)，无解时返回 None。
+    """
+    if times is None:
+        # 定义数据
+        times = {
+            "甲": {"design": 13, "manufacture": 15, "inspect": 20},
+            "乙": {"design": 10, "manufacture": 20, "inspect": 18},
+            "丙": {"design": 20, "manufacture": 16, "inspect": 10},
+            "丁": {"design": 8, "manufacture": 10, "inspect": 15},
+        }
+    products = list(times)
+    if stages is None:
+        stages = list(next(iter(times.values())))
+    stage_names = {"design": "设计", "manufacture": "制造", "inspect": "检验"}
+
+    if model == "position":
+        prob, makespan, extract = _build_position_model(products, times, stages)
+    elif model == "big_m":
+        prob, makespan, extract = _build_big_m_model(products, times, stages)
+    else:
+        raise ValueError(f"未知的模型：{model}")
 
-        print(f"最优生产顺序：{'->'.join(optimal_sequence)}")
-        print(f"最短完成时间：{int(pulp.value(makespan))}天")
+    # 求解
+    solve(prob)
+
+    # 输出结果
+    if pulp.LpStatus[prob.status] == "Optimal":
+        optimal_sequence, starts = extract()
+
+        total_time = pulp.value(makespan)
+
+        print(f"最优生产顺序：{'->'.join(map(str, optimal_sequence))}")
+        print(f"最短完成时间：{round(total_time)}天")
 
         # 输出详细时间安排
         print("\n详细时间安排：")
         for i in products:
             print(f"\n{i}产品：")
-            print(f"设计开始时间：{int(pulp.value(design_start[i]))}天")
-            print(f"制造开始时间：{int(pulp.value(manufacture_start[i]))}天")
-            print(f"检验开始时间：{int(pulp.value(inspect_start[i]))}天")
-    else:
-        print("问题无解")
+            for s in stages:
+                print(f"{stage_names.get(s, s)}开始时间：{round(starts[i][s])}天")
+        return optimal_sequence, total_time, starts
+    print("问题无解")
+    return None
 
 
 if __name__ == "__main__":
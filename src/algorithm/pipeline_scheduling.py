@@ -1,5 +1,11 @@
+import math
+import random
+import time
+from collections import namedtuple
 from itertools import permutations
 
+import numpy as np
+
 """
 流水线调度问题
 
@@ -31,66 +37,468 @@ from itertools import permutations
 检验        |    |    |丁  |甲  |乙  |丙
 """
 
+# 调度结果：作业顺序、最大完工时间、是否已证明最优（启发式或超时截断的结果为 False）
+ScheduleResult = namedtuple("ScheduleResult", ["sequence", "makespan", "proven"])
+
 
 def calculate_completion_time(sequence, times):
-    """计算给定顺序的完成时间"""
-    n = len(sequence)
-    # 初始化每个部门的完成时间
-    design_end = [0] * n  # 设计部门完成时间
-    manufacture_end = [0] * n  # 制造部门完成时间
-    inspect_end = [0] * n  # 检验部门完成时间
-
-    # 计算第一个项目的各阶段完成时间
-    design_end[0] = times[sequence[0]]["design"]
-    manufacture_end[0] = design_end[0] + times[sequence[0]]["manufacture"]
-    inspect_end[0] = manufacture_end[0] + times[sequence[0]]["inspect"]
-
-    # 计算后续项目的完成时间
-    for i in range(1, n):
-        # 设计阶段：必须等前一个项目的设计完成
-        design_end[i] = design_end[i - 1] + times[sequence[i]]["design"]
-
-        # 制造阶段：必须等当前项目设计完成且前一个项目制造完成
-        manufacture_end[i] = (
-            max(design_end[i], manufacture_end[i - 1])
-            + times[sequence[i]]["manufacture"]
-        )
+    """计算给定顺序的完成时间，阶段按 times 中各项目字典的键顺序，阶段数不限"""
+    stages = list(times[sequence[0]])
+    return makespan(sequence, times, stages)
 
-        # 检验阶段：必须等当前项目制造完成且前一个项目检验完成
-        inspect_end[i] = (
-            max(manufacture_end[i], inspect_end[i - 1]) + times[sequence[i]]["inspect"]
-        )
 
-    # 返回最后一个项目的检验完成时间
-    return inspect_end[-1]
+def batch_makespan(sequences, processing_times):
+    """批量计算多个候选顺序的最大完工时间
+
+    sequences 为 (k × n) 的作业下标排列数组，processing_times 为 (n × m) 的加工时间矩阵，
+    返回长度为 k 的最大完工时间数组。只对阶段做 Python 循环，作业与候选顺序两个维度
+    均由 NumPy 前缀和与累积最大值完成。
+    """
+    sequences = np.atleast_2d(np.asarray(sequences, dtype=np.intp))
+    p = np.asarray(processing_times)
+    if p.ndim != 2:
+        raise ValueError("加工时间矩阵必须是二维数组")
+    if sequences.shape[1] == 0:
+        return np.zeros(sequences.shape[0], dtype=p.dtype)
+    # 上一阶段各位置作业的完成时间，形状 (k × n)
+    prev = np.zeros(sequences.shape, dtype=p.dtype)
+    for j in range(p.shape[1]):
+        prev = _max_plus_scan(prev, p[sequences, j], axis=1)
+    return prev[:, -1]
+
+
+def johnson_sequence(jobs, first, second):
+    """Johnson 规则求两台机器流水作业 F2||Cmax 的最优顺序，O(n log n)
+
+    first[j]、second[j] 分别为作业 j 在第一、第二台机器上的加工时间。
+    第一道工序短于第二道的作业按第一道工序升序排在前面，其余按第二道工序降序排在后面。
+    """
+    head = sorted((j for j in jobs if first[j] < second[j]), key=lambda j: first[j])
+    tail = sorted(
+        (j for j in jobs if first[j] >= second[j]),
+        key=lambda j: second[j],
+        reverse=True,
+    )
+    return tuple(head + tail)
 
 
-def find_optimal_sequence():
-    # 定义各项目各阶段所需时间
-    times = {
-        "甲": {"design": 13, "manufacture": 15, "inspect": 20},
-        "乙": {"design": 10, "manufacture": 20, "inspect": 18},
-        "丙": {"design": 20, "manufacture": 16, "inspect": 10},
-        "丁": {"design": 8, "manufacture": 10, "inspect": 15},
-    }
+def johnson_reducible(times, stages):
+    """判断三台机器问题能否精确化归为两台机器：min(阶段1) >= max(阶段2) 或 min(阶段3) >= max(阶段2)"""
+    if len(stages) != 3:
+        return False
+    s1, s2, s3 = stages
+    max_middle = max(t[s2] for t in times.values())
+    return (
+        min(t[s1] for t in times.values()) >= max_middle
+        or min(t[s3] for t in times.values()) >= max_middle
+    )
 
-    # 所有可能的项目顺序
-    projects = ["甲", "乙", "丙", "丁"]
-    all_sequences = list(permutations(projects))
 
-    # 找出最优顺序
+def johnson_schedule(times, stages):
+    """对两阶段或可化归的三阶段问题用 Johnson 规则求最优顺序，不适用时返回 None"""
+    jobs = list(times)
+    if len(stages) == 2:
+        s1, s2 = stages
+        first = {j: times[j][s1] for j in jobs}
+        second = {j: times[j][s2] for j in jobs}
+    elif johnson_reducible(times, stages):
+        s1, s2, s3 = stages
+        # 构造虚拟两台机器：(p1 + p2, p2 + p3)
+        first = {j: times[j][s1] + times[j][s2] for j in jobs}
+        second = {j: times[j][s2] + times[j][s3] for j in jobs}
+    else:
+        return None
+    return johnson_sequence(jobs, first, second)
+
+
+def makespan(sequence, times, stages):
+    """计算任意阶段数下给定顺序的最大完工时间"""
+    end = [0] * len(stages)
+    for job in sequence:
+        prev = 0
+        for k, stage in enumerate(stages):
+            # 必须等本作业上一阶段完成且上一作业本阶段完成
+            prev = max(prev, end[k]) + times[job][stage]
+            end[k] = prev
+    return end[-1]
+
+
+def brute_force_sequence(times, stages):
+    """枚举全部排列求最优顺序，仅适用于很小的规模"""
     min_time = float("inf")  # 初始化最小完成时间为无穷大
     optimal_sequence = None  # 初始化最优顺序为None
 
-    for sequence in all_sequences:
-        time = calculate_completion_time(sequence, times)
-        if time < min_time:
-            min_time = time
+    for sequence in permutations(times):
+        span = makespan(sequence, times, stages)
+        if span < min_time:
+            min_time = span
             optimal_sequence = sequence
 
     return optimal_sequence, min_time
 
 
+def _processing_matrix(times, stages):
+    """把 times 字典转换为 (作业数 × 阶段数) 的加工时间矩阵"""
+    jobs = list(times)
+    return jobs, np.array([[times[j][s] for s in stages] for j in jobs])
+
+
+def _max_plus_scan(a, p, axis=0):
+    """沿 axis 求 e[i] = max(e[i-1], a[i]) + p[i]（e[-1] = 0，a >= 0），无逐元素 Python 循环
+
+    展开递推得 e[i] = C[i] + max_{l<=i}(a[l] - C[l-1])，其中 C 为 p 的前缀和。
+    """
+    c = np.cumsum(p, axis=axis)
+    return c + np.maximum.accumulate(a - (c - p), axis=axis)
+
+
+def _heads_tails(p_seq):
+    """Taillard 加速所需的头部完成时间 e 和尾部时间 q，形状均为 (k × m)"""
+    k, m = p_seq.shape
+    e = np.empty_like(p_seq)
+    q = np.empty_like(p_seq)
+    prev = np.zeros(k, dtype=p_seq.dtype)
+    for j in range(m):
+        prev = e[:, j] = _max_plus_scan(prev, p_seq[:, j])
+    prev = np.zeros(k, dtype=p_seq.dtype)
+    for j in range(m - 1, -1, -1):
+        prev = q[:, j] = _max_plus_scan(prev[::-1], p_seq[::-1, j])[::-1]
+    return e, q
+
+
+def _best_insertion(p, seq, job):
+    """Taillard 加速：O(k·m) 内求作业 job 插入到 seq 各位置后的最大完工时间，返回 (位置, 完工时间)"""
+    m = p.shape[1]
+    k = len(seq)
+    if k == 0:
+        return 0, p[job].sum()
+    e, q = _heads_tails(p[seq])
+    zeros = np.zeros((1, m), dtype=e.dtype)
+    e = np.vstack([zeros, e])  # e[i]：插入位置 i 之前作业的完成时间
+    q = np.vstack([q, zeros])  # q[i]：插入位置 i 之后作业的尾部时间
+    f = np.zeros(k + 1, dtype=e.dtype)
+    spans = np.zeros(k + 1, dtype=e.dtype)
+    for j in range(m):
+        f = np.maximum(f, e[:, j]) + p[job, j]
+        spans = np.maximum(spans, f + q[:, j])
+    pos = int(np.argmin(spans))
+    return pos, spans[pos]
+
+
+def _neh(p, order, deadline=None):
+    """NEH 构造：按给定顺序依次把作业插入到当前部分顺序的最佳位置
+
+    超过 deadline 时剩余作业直接接在末尾，保证按时返回完整顺序。
+    """
+    seq = []
+    span = 0
+    for k, job in enumerate(order):
+        if deadline is not None and time.perf_counter() > deadline:
+            seq.extend(order[k:])
+            return seq, batch_makespan([seq], p)[0]
+        pos, span = _best_insertion(p, seq, job)
+        seq.insert(pos, job)
+    return seq, span
+
+
+def default_time_limit(n, m):
+    """迭代贪婪的默认墙钟预算（秒）：按 Ruiz-Stützle 的计时规则取 n·m/2 × 10 毫秒，至少 1 秒
+
+    NEH 与每轮局部搜索的代价都随 n²·m 增长，固定 1 秒的预算在数百个作业时连一轮局部搜索都不够。
+    """
+    return max(1.0, n * m / 2 * 0.01)
+
+
+def neh_sequence(times, stages):
+    """NEH 启发式：按总加工时间降序逐个做最佳插入，配合 Taillard 加速共 O(n²m)
+
+    返回 (顺序, 最大完工时间)。
+    """
+    jobs, p = _processing_matrix(times, stages)
+    if not jobs:
+        return (), 0
+    # 稳定排序保证总加工时间相同的作业保持输入顺序
+    order = np.argsort(-p.sum(axis=1), kind="stable")
+    seq, span = _neh(p, order)
+    return tuple(jobs[j] for j in seq), span.item()
+
+
+def _local_search(p, seq, span, deadline):
+    """基于插入的局部搜索：逐个取出作业并重新插入最佳位置，直到一轮无改进"""
+    improved = True
+    while improved:
+        improved = False
+        for job in list(seq):
+            if deadline is not None and time.perf_counter() > deadline:
+                return seq, span
+            rest = [j for j in seq if j != job]
+            pos, new_span = _best_insertion(p, rest, job)
+            if new_span < span:
+                rest.insert(pos, job)
+                seq, span = rest, new_span
+                improved = True
+    return seq, span
+
+
+def iterated_greedy_sequence(
+    times,
+    stages,
+    time_limit=None,
+    destruction=4,
+    temperature=0.4,
+    seed=None,
+    max_iterations=None,
+):
+    """迭代贪婪（Ruiz-Stützle）：在 NEH 解基础上反复破坏-重建-局部搜索，返回 (顺序, 最大完工时间)
+
+    每轮随机移出 destruction 个作业再逐个最佳插入，按模拟退火准则接受较差解；
+    time_limit（秒）为墙钟预算，NEH 构造与局部搜索也计入其中；max_iterations 可额外限制迭代轮数。
+    两者都为 None 时使用 default_time_limit(n, m)；只给出 max_iterations 时不限时间。
+    """
+    jobs, p = _processing_matrix(times, stages)
+    n, m = p.shape
+    if n == 0:
+        return (), 0
+    rng = random.Random(seed)
+    if time_limit is None and max_iterations is None:
+        time_limit = default_time_limit(n, m)
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+
+    order = np.argsort(-p.sum(axis=1), kind="stable")
+    current, current_span = _neh(p, order, deadline)
+    current, current_span = _local_search(p, current, current_span, deadline)
+    best, best_span = list(current), current_span
+    # 接受准则的温度与平均加工时间成正比
+    temp = temperature * p.sum() / (n * m * 10)
+
+    iteration = 0
+    while (deadline is None or time.perf_counter() < deadline) and (
+        max_iterations is None or iteration < max_iterations
+    ):
+        iteration += 1
+        seq = list(current)
+        removed = [seq.pop(rng.randrange(len(seq))) for _ in range(min(destruction, n))]
+        for job in removed:
+            pos, span = _best_insertion(p, seq, job)
+            seq.insert(pos, job)
+        seq, span = _local_search(p, seq, span, deadline)
+        if span < current_span:
+            current, current_span = seq, span
+            if span < best_span:
+                best, best_span = list(seq), span
+        elif temp > 0 and rng.random() < math.exp(-(span - current_span) / temp):
+            current, current_span = seq, span
+    return tuple(jobs[j] for j in best), best_span.item()
+
+
+def branch_and_bound_sequence(times, stages, time_limit=None, initial=None):
+    """双向分支定界求置换流水作业的最优顺序，返回 (顺序, 最短完成时间, 是否已证明最优)
+
+    节点由已排定的前缀与后缀组成：前缀按正向递推各阶段完成时间，后缀按反向递推各阶段
+    到结束所需的时间，完整顺序的完工时间为 max_k (前缀_k + 后缀_k)。每个节点分别试算
+    向前缀末尾和向后缀开头追加作业，取剪枝后子节点较少的方向分支（Potts）。
+    下界先用机器下界 max_k (r_k + Σ_{未排作业} p_jk + q_k) 剪枝，剪不掉时再对每对阶段
+    求带时滞的两机器 Johnson 下界（Lageweg-Lenstra-Rinnooy Kan）。
+    time_limit（秒）用尽时返回当前最优解；time_limit 为 None 时不限时间。
+    """
+    jobs = list(times)
+    n, m = len(jobs), len(stages)
+    if n == 0:
+        return (), 0, True
+    p = [[times[j][s] for s in stages] for j in jobs]
+    # heads[j][k]、tails[j][k]：作业 j 在阶段 k 之前、之后各阶段的加工时间之和
+    heads = [[sum(row[:k]) for k in range(m)] for row in p]
+    tails = [[sum(row[k + 1 :]) for k in range(m)] for row in p]
+    # 两机器下界：每对阶段 (u, v) 视为带时滞的两台机器，时滞为 u、v 之间各阶段的加工时间之和；
+    # 按 Johnson 规则对 (p_u + 时滞, p_v + 时滞) 排序的顺序是该松弛问题的最优顺序（Mitten），
+    # 顺序与已排作业无关，只需预先算好，在节点上跳过已排作业即可
+    pairs = []
+    for u in range(m):
+        for v in range(u + 1, m):
+            lag = [sum(row[u + 1 : v]) for row in p]
+            first = {j: p[j][u] + lag[j] for j in range(n)}
+            second = {j: p[j][v] + lag[j] for j in range(n)}
+            order = johnson_sequence(range(n), first, second)
+            pairs.append((u, v, [(j, p[j][u], lag[j], p[j][v]) for j in order]))
+
+    if initial is None:
+        initial, _ = neh_sequence(times, stages)
+    index = {job: j for j, job in enumerate(jobs)}
+    best_seq = [index[job] for job in initial]
+    best = makespan(initial, times, stages)
+
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+    timed_out = False
+    nodes = 0
+    front, back = [], []  # back 按加入顺序保存，完整顺序为 front + back[::-1]
+    used = [False] * n
+
+    def two_smallest(values, rem):
+        """各阶段未排作业 values[j][k] 的最小与次小值，用于 O(1) 求去掉某作业后的最小值"""
+        result = []
+        for k in range(m):
+            a = b = float("inf")
+            for j in rem:
+                t = values[j][k]
+                if t < a:
+                    a, b = t, a
+                elif t < b:
+                    b = t
+            result.append((a, b))
+        return result
+
+    def lower_bound(j, r, q, remaining_sum):
+        """作业 j 排定后子节点的下界，r、q 为未排作业在各阶段的最早开始与最少尾部时间"""
+        lb = 0
+        for k in range(m):
+            bound = r[k] + remaining_sum[k] - p[j][k] + q[k]
+            if bound > lb:
+                lb = bound
+        if lb >= best:
+            return lb
+        # 机器下界不足以剪枝时再计算代价更高的两机器下界
+        used[j] = True
+        for u, v, order in pairs:
+            cu, cv = r[u], r[v]
+            for i, pu, lag, pv in order:
+                if not used[i]:
+                    cu += pu
+                    cv = max(cv, cu + lag) + pv
+            if cv + q[v] > lb:
+                lb = cv + q[v]
+                if lb >= best:
+                    break
+        used[j] = False
+        return lb
+
+    def dfs(start, finish, remaining_sum):
+        nonlocal best, best_seq, timed_out, nodes
+        rem = [j for j in range(n) if not used[j]]
+        if len(rem) == 1:
+            j = rem[0]
+            prev = 0
+            span = 0
+            for k in range(m):
+                prev = max(prev, start[k]) + p[j][k]
+                span = max(span, prev + finish[k])
+            if span < best:
+                best = span
+                best_seq = front + [j] + back[::-1]
+            return
+
+        # 正向：j 追加到前缀末尾；前缀或后缀为空时用未排作业的最小头部/尾部时间代替
+        min_head = two_smallest(heads, rem) if not front else None
+        min_tail = two_smallest(tails, rem) if not back else None
+        forward = []
+        for j in rem:
+            r = []
+            prev = 0
+            for k in range(m):
+                prev = max(prev, start[k]) + p[j][k]
+                r.append(prev)
+            q = finish
+            if min_tail is not None:
+                q = [b if tails[j][k] == a else a for k, (a, b) in enumerate(min_tail)]
+            lb = lower_bound(j, r, q, remaining_sum)
+            if lb < best:
+                forward.append((lb, j, r, finish))
+        backward = []
+        for j in rem:
+            q = [0] * m
+            prev = 0
+            for k in range(m - 1, -1, -1):
+                prev = max(prev, finish[k]) + p[j][k]
+                q[k] = prev
+            r = start
+            if min_head is not None:
+                r = [b if heads[j][k] == a else a for k, (a, b) in enumerate(min_head)]
+            lb = lower_bound(j, r, q, remaining_sum)
+            if lb < best:
+                backward.append((lb, j, start, q))
+        # 取剪枝后子节点较少的方向；下界小的分支优先搜索，尽早得到好的上界
+        is_forward = len(forward) <= len(backward)
+        children = sorted(forward if is_forward else backward, key=lambda c: c[:2])
+        side = front if is_forward else back
+        for lb, j, new_start, new_finish in children:
+            if lb >= best or timed_out:
+                break
+            nodes += 1
+            if deadline is not None and nodes % 256 == 0:
+                timed_out = time.perf_counter() > deadline
+            used[j] = True
+            side.append(j)
+            dfs(new_start, new_finish, [remaining_sum[k] - p[j][k] for k in range(m)])
+            side.pop()
+            used[j] = False
+
+    dfs([0] * m, [0] * m, [sum(p[j][k] for j in range(n)) for k in range(m)])
+    return tuple(jobs[j] for j in best_seq), best, not timed_out
+
+
+def find_optimal_sequence(times=None, method="auto", time_limit=None):
+    """求流水线调度的最优顺序，返回 (顺序, 最短完成时间)
+
+    参数含义同 find_optimal_schedule；需要知道结果是否已证明最优时改用 find_optimal_schedule。
+    """
+    result = find_optimal_schedule(times, method, time_limit)
+    return result.sequence, result.makespan
+
+
+def find_optimal_schedule(times=None, method="auto", time_limit=None):
+    """求流水线调度的最优顺序，返回 ScheduleResult(顺序, 最短完成时间, 是否已证明最优)
+
+    method="auto" 时，两阶段或满足化归条件的三阶段问题使用 Johnson 规则，
+    作业数不超过 20 时以迭代贪婪的结果为初始上界做分支定界，更大规模只用迭代贪婪；
+    分支定界的 time_limit 默认 1 秒，迭代贪婪默认按规模取 default_time_limit(n, m)。
+    也可指定 "johnson"、"bnb"、"neh"、"ig" 或 "brute"；"bnb" 需要不限时间时传入
+    time_limit=math.inf。分支定界在时间预算内未完成搜索时 proven 为 False。
+    """
+    if times is None:
+        # 定义各项目各阶段所需时间
+        times = {
+            "甲": {"design": 13, "manufacture": 15, "inspect": 20},
+            "乙": {"design": 10, "manufacture": 20, "inspect": 18},
+            "丙": {"design": 20, "manufacture": 16, "inspect": 10},
+            "丁": {"design": 8, "manufacture": 10, "inspect": 15},
+        }
+    stages = list(next(iter(times.values())))
+
+    if method in ("auto", "johnson"):
+        sequence = johnson_schedule(times, stages)
+        if sequence is not None:
+            return ScheduleResult(sequence, makespan(sequence, times, stages), True)
+        if method == "johnson":
+            raise ValueError("Johnson 规则仅适用于两阶段或可化归的三阶段问题")
+        # 超过 20 个作业时全部预算用于迭代贪婪，默认预算随规模增长
+        if len(times) > 20:
+            sequence, total_time = iterated_greedy_sequence(times, stages, time_limit)
+            return ScheduleResult(sequence, total_time, False)
+        # 分支定界的总预算默认 1 秒
+        budget = 1.0 if time_limit is None else time_limit
+        # 先用少量迭代贪婪取得好的上界，剩余预算做分支定界，未完成搜索时 proven 为 False
+        start = time.perf_counter()
+        incumbent, _ = iterated_greedy_sequence(
+            times, stages, budget / 4, max_iterations=50
+        )
+        remaining = max(0.0, budget - (time.perf_counter() - start))
+        return ScheduleResult(
+            *branch_and_bound_sequence(times, stages, remaining, initial=incumbent)
+        )
+    if method == "bnb":
+        if time_limit is None:
+            time_limit = 1.0
+        return ScheduleResult(*branch_and_bound_sequence(times, stages, time_limit))
+    if method == "neh":
+        return ScheduleResult(*neh_sequence(times, stages), False)
+    if method == "ig":
+        return ScheduleResult(
+            *iterated_greedy_sequence(times, stages, time_limit), False
+        )
+    if method == "brute":
+        return ScheduleResult(*brute_force_sequence(times, stages), True)
+    raise ValueError(f"未知的求解方法：{method}")
+
+
 def main():
     sequence, total_time = find_optimal_sequence()
     print(f"最优项目顺序：{'->'.join(sequence)}")
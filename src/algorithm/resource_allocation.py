@@ -1,5 +1,10 @@
+from collections import namedtuple
+
+import numpy as np
 import pulp
 
+from solver import solve, solve_matrix
+
 """
 资源分配问题
 
@@ -16,10 +21,278 @@ import pulp
 """
 
 
-def solve_material_allocation():
-    # 创建资源分配问题
-    prob = pulp.LpProblem("资源分配问题", pulp.LpMaximize)
+def _is_concave(table):
+    """判断收益表是否为凹：分配量为连续整数且边际收益单调不增"""
+    qs = sorted(table)
+    if any(b - a != 1 for a, b in zip(qs, qs[1:])):
+        return False
+    gains = [table[b] - table[a] for a, b in zip(qs, qs[1:])]
+    return all(g1 >= g2 for g1, g2 in zip(gains, gains[1:]))
+
+
+# 回溯档位表的元素数上限（uint8 时约 16MB），超过时改用分治回溯，内存保持 O(budget)
+_CHOICE_LIMIT = 1 << 24
+
+
+def _knapsack_dp(tables, units, budget, keep_choice=True):
+    """对 units 做多选择背包 DP，返回 (dp, choice, levels)
+
+    dp[b] 为恰好用掉 b 时的最大收益（不可行为 -inf），choice[k, b] 为第 k 个单位的档位下标；
+    keep_choice=False 时不保存档位表，choice 为 None。
+    """
+    levels = [list(tables[u].items()) for u in units]
+    width = max((len(lv) for lv in levels), default=1)
+    dtype = np.uint8 if width < 256 else np.uint16 if width < 65536 else np.uint32
+
+    dp = np.full(budget + 1, -np.inf)
+    dp[0] = 0.0
+    # choice[k, b]：第 k 个单位在累计用量为 b 时选择的档位
+    choice = np.zeros((len(units), budget + 1), dtype=dtype) if keep_choice else None
+    # 预分配缓冲区，循环内不再创建临时数组
+    cand = np.empty(budget + 1)
+    better = np.empty(budget + 1, dtype=bool)
+    new = np.empty(budget + 1)
+    for k, lv in enumerate(levels):
+        new.fill(-np.inf)
+        for idx, (q, profit) in enumerate(lv):
+            q = int(q)
+            if q > budget:
+                continue
+            size = budget + 1 - q
+            np.add(dp[:size], profit, out=cand[:size])
+            np.greater(cand[:size], new[q:], out=better[:size])
+            np.copyto(new[q:], cand[:size], where=better[:size])
+            if keep_choice:
+                np.copyto(choice[k, q:], idx, where=better[:size])
+        dp, new = new, dp
+    return dp, choice, levels
+
+
+def _backtrack(units, levels, choice, b):
+    """从 dp 终点 b 回溯各单位的分配量"""
+    allocation = {}
+    for k in range(len(units) - 1, -1, -1):
+        q, _ = levels[k][choice[k, b]]
+        allocation[units[k]] = q
+        b -= int(q)
+    return allocation
+
 
+def _allocate_exact(tables, units, b):
+    """恰好用掉 b 的一个最优分配；档位表超过 _CHOICE_LIMIT 时用 Hirschberg 式分治回溯
+
+    把单位分成前后两半，分别做不保存档位的 DP，取使 前半[s] + 后半[b - s] 最大的 s，
+    再对两半分别以 s、b - s 递归。内存 O(b)，时间多一个 log(单位数) 因子。
+    调用前须保证恰好用掉 b 可行。
+    """
+    if len(units) <= 1 or len(units) * (b + 1) <= _CHOICE_LIMIT:
+        _, choice, levels = _knapsack_dp(tables, units, b)
+        return _backtrack(units, levels, choice, b)
+    half = len(units) // 2
+    left, _, _ = _knapsack_dp(tables, units[:half], b, keep_choice=False)
+    right, _, _ = _knapsack_dp(tables, units[half:], b, keep_choice=False)
+    s = int(np.argmax(left + right[::-1]))
+    del left, right
+    allocation = _allocate_exact(tables, units[:half], s)
+    allocation.update(_allocate_exact(tables, units[half:], b - s))
+    return allocation
+
+
+def _concave_curve(tables, units):
+    """凹收益单位的边际贪心：所有边际收益降序排列后取前 t 个即为追加 t 个单位时的最优
+
+    返回 (最低总用量, 最低总收益, 各边际收益所属单位（降序）, 前缀和)。
+    前缀和 prefix[t] 为在最低用量基础上再追加 t 时的最大增量收益。
+    """
+    base_q = 0
+    base_p = 0.0
+    gains = []
+    owners = []
+    for k, u in enumerate(units):
+        qs = sorted(tables[u])
+        base_q += qs[0]
+        base_p += tables[u][qs[0]]
+        gains.extend(tables[u][b] - tables[u][a] for a, b in zip(qs, qs[1:]))
+        owners.extend([k] * (len(qs) - 1))
+    gains = np.asarray(gains, dtype=float)
+    order = np.argsort(-gains, kind="stable")
+    prefix = np.concatenate([[0.0], np.cumsum(gains[order])])
+    return base_q, base_p, np.asarray(owners, dtype=int)[order], prefix
+
+
+def _concave_allocation(tables, units, owners, t):
+    """取降序边际收益的前 t 个，得到各凹单位的分配量"""
+    counts = np.bincount(owners[:t], minlength=len(units))
+    return {u: min(tables[u]) + int(c) for u, c in zip(units, counts)}
+
+
+def _split_units(tables, method):
+    """校验收益表并按 method 划分为 (全部单位, 凹单位, 其余单位)"""
+    units = list(tables)
+    empty = [u for u in units if not tables[u]]
+    if empty:
+        raise ValueError(f"单位{empty}的收益表为空，每个单位至少需要一个档位")
+    if any(q < 0 or int(q) != q for u in units for q in tables[u]):
+        raise ValueError("分配量必须为非负整数")
+    if method == "dp":
+        concave = []
+    elif method == "auto":
+        concave = [u for u in units if _is_concave(tables[u])]
+    else:
+        raise ValueError(f"未知的求解方法：{method}")
+    concave_set = set(concave)
+    others = [u for u in units if u not in concave_set]
+    return units, concave, others
+
+
+def allocate_resources(tables, budget, exact=True, method="auto"):
+    """多选择背包：每个单位选一个档位，总量 == budget（exact=False 时 <= budget），最大化总收益
+
+    tables 为 {单位: {分配量: 收益}}，分配量为非负整数；允许不分配时需在表中包含 0 档。
+    method="dp" 时全部单位做动态规划：沿预算轴做 max-plus 卷积，dp[b] 为恰好用掉 b 时的
+    最大收益，每个档位一次整体平移比较，复杂度 O(单位数 × budget × 档位数)。
+    method="auto" 时逐个检测收益表是否为凹：凹单位用边际贪心得到整条最优收益曲线，
+    只有非凹单位做动态规划，两者再沿预算轴合并。
+    返回 (分配方案 {单位: 分配量}, 总收益)，无可行方案时抛出 ValueError。
+    """
+    units, concave, others = _split_units(tables, method)
+    # 档位表过大时只保留一行 dp，回溯改用分治
+    keep_choice = len(others) * (budget + 1) <= _CHOICE_LIMIT
+    dp, choice, levels = _knapsack_dp(tables, others, budget, keep_choice)
+    if concave:
+        base_q, base_p, owners, prefix = _concave_curve(tables, concave)
+        # 合并：凹单位用掉 budget - b，非凹单位恰好用掉 b
+        extra = budget - np.arange(budget + 1) - base_q
+        if exact:
+            valid = (extra >= 0) & (extra < len(prefix))
+        else:
+            # <= 模式下凹单位只追加收益为正的边际
+            extra = np.minimum(extra, int(np.count_nonzero(np.diff(prefix) > 0)))
+            valid = extra >= 0
+        total = np.full(budget + 1, -np.inf)
+        total[valid] = dp[valid] + base_p + prefix[extra[valid]]
+    else:
+        total = dp
+
+    b = budget if exact and not concave else int(np.argmax(total))
+    if not np.isfinite(total[b]):
+        raise ValueError("无可行的分配方案")
+    if keep_choice:
+        allocation = _backtrack(others, levels, choice, b)
+    else:
+        allocation = _allocate_exact(tables, others, b)
+    if concave:
+        allocation.update(_concave_allocation(tables, concave, owners, extra[b]))
+    allocation = {u: allocation[u] for u in units}
+    total_profit = sum(tables[u][q] for u, q in allocation.items())
+    return allocation, total_profit
+
+
+# 预算扫描结果：profits[b] 为预算 b 下的最优收益（不可行为 -inf），allocations[b] 为对应方案或 None
+BudgetSweep = namedtuple("BudgetSweep", ["profits", "allocations"])
+
+
+def _concave_max_plus(f, g):
+    """h[c] = max_{0<=b<=c} f[b] + g[c-b]，g 为凹函数（定义域外为 -inf），返回 (h, 最优 b)
+
+    g 为凹时最优 b 随 c 单调不减，用分治只在 [上一层最优下界, 上界] 内搜索，共 O(B log B)。
+    """
+    size = len(f)
+    h = np.full(size, -np.inf)
+    arg = np.zeros(size, dtype=int)
+    stack = [(0, size - 1, 0, size - 1)]
+    while stack:
+        lo, hi, opt_lo, opt_hi = stack.pop()
+        if lo > hi:
+            continue
+        mid = (lo + hi) // 2
+        cand = np.arange(opt_lo, min(opt_hi, mid) + 1)
+        vals = f[cand] + g[mid - cand]
+        if vals.size and np.isfinite(vals.max()):
+            k = int(np.argmax(vals))
+            h[mid], arg[mid] = vals[k], cand[k]
+            stack.append((lo, mid - 1, opt_lo, arg[mid]))
+            stack.append((mid + 1, hi, arg[mid], opt_hi))
+        else:
+            # 不可行的预算不提供单调性信息，两侧沿用原搜索区间
+            stack.append((lo, mid - 1, opt_lo, opt_hi))
+            stack.append((mid + 1, hi, opt_lo, opt_hi))
+    return h, arg
+
+
+def sweep_budgets(tables, budget, exact=True, method="auto"):
+    """一次计算出预算 0..budget 的全部最优收益与分配方案，返回 BudgetSweep
+
+    DP 表 dp[b] 本身就是恰好用掉 b 时的最优值，只需计算一次；有凹单位时，
+    其最优收益曲线与非凹单位的 dp 做一次 max-plus 卷积。exact=False 时取前缀最大值。
+    每个预算都要回溯一次，因此保留完整档位表（其大小与返回的全部方案同阶）。
+    """
+    units, concave, others = _split_units(tables, method)
+    dp, choice, levels = _knapsack_dp(tables, others, budget)
+    if concave:
+        base_q, base_p, owners, prefix = _concave_curve(tables, concave)
+        # g[x]：凹单位合计恰好用掉 x 时的最优收益
+        x = np.arange(budget + 1) - base_q
+        valid = (x >= 0) & (x < len(prefix))
+        g = np.full(budget + 1, -np.inf)
+        g[valid] = base_p + prefix[x[valid]]
+        best, split = _concave_max_plus(dp, g)
+    else:
+        best, split = dp, np.arange(budget + 1)
+
+    # source[c]：预算 c 时实际采用的总用量
+    source = np.arange(budget + 1)
+    if not exact:
+        running = np.maximum.accumulate(best)
+        source = np.maximum.accumulate(np.where(best == running, source, 0))
+        best = running
+
+    allocations = []
+    for c in range(budget + 1):
+        if not np.isfinite(best[c]):
+            allocations.append(None)
+            continue
+        used = source[c]
+        allocation = _backtrack(others, levels, choice, split[used])
+        if concave:
+            t = used - split[used] - base_q
+            allocation.update(_concave_allocation(tables, concave, owners, t))
+        allocations.append({u: allocation[u] for u in units})
+    profits = [
+        -np.inf if a is None else sum(tables[u][q] for u, q in a.items())
+        for a in allocations
+    ]
+    return BudgetSweep(profits, allocations)
+
+
+def build_allocation_arrays(tables, budget, exact=True):
+    """资源分配 0-1 模型的矩阵形式，返回 (c, A_ub, b_ub, A_eq, b_eq, keys)
+
+    keys[k] = (单位, 分配量) 对应变量 x[k]；每个单位恰好选择一个分配量，
+    总分配量 == budget（exact=False 时 <= budget）。约束矩阵为 COO 三元组。
+    """
+    keys = [(u, q) for u in tables for q in tables[u]]
+    c = np.array([tables[u][q] for u, q in keys], dtype=float)
+    levels = np.array([q for _, q in keys], dtype=float)
+    unit_index = {u: r for r, u in enumerate(tables)}
+    unit_rows = np.array([unit_index[u] for u, _ in keys], dtype=int)
+    k = np.arange(len(keys))
+    if exact:
+        # 前 len(tables) 行为各单位的选择约束，最后一行为预算约束
+        A_eq = (
+            np.concatenate([np.ones(len(keys)), levels]),
+            np.concatenate([unit_rows, np.full(len(keys), len(tables))]),
+            np.tile(k, 2),
+        )
+        return c, None, None, A_eq, np.append(np.ones(len(tables)), budget), keys
+    choose_one = (np.ones(len(keys)), unit_rows, k)
+    budget_row = (levels, np.zeros(len(keys), dtype=int), k)
+    return c, budget_row, [budget], choose_one, np.ones(len(tables)), keys
+
+
+def solve_material_allocation(backend="dp"):
+    """backend="dp" 使用内置动态规划，backend="pulp" 使用 PuLP 0-1 规划模型，
+    backend="matrix" 使用矩阵形式模型交给 solve_matrix"""
     # 定义数据
     companies = ["甲", "乙", "丙"]
     tons = range(5)  # 0-4吨
@@ -29,6 +302,31 @@ def solve_material_allocation():
         "丙": {0: 0, 1: 4, 2: 6, 3: 11, 4: 14},
     }
 
+    if backend == "dp":
+        allocation, total_profit = allocate_resources(profits, 4)
+        print(f"最大利润：{total_profit}万元")
+        print("\n具体分配方案：")
+        for i, j in allocation.items():
+            print(f"{i}公司分配{j}吨材料，获得利润{profits[i][j]}万元")
+        return
+    if backend == "matrix":
+        *arrays, keys = build_allocation_arrays(profits, 4)
+        result = solve_matrix(*arrays, ub=1.0, integrality=True, maximize=True)
+        if result.status != "Optimal":
+            print("问题无解")
+            return
+        print(f"最大利润：{round(result.objective)}万元")
+        print("\n具体分配方案：")
+        for k in np.flatnonzero(result.x > 0.5):
+            i, j = keys[k]
+            print(f"{i}公司分配{j}吨材料，获得利润{profits[i][j]}万元")
+        return
+    if backend != "pulp":
+        raise ValueError(f"未知的求解后端：{backend}")
+
+    # 创建资源分配问题
+    prob = pulp.LpProblem("资源分配问题", pulp.LpMaximize)
+
     # 决策变量：x[i][j] = 1 表示公司i分配j吨材料
     x = pulp.LpVariable.dicts(
         "x", ((i, j) for i in companies for j in tons), cat="Binary"
@@ -45,7 +343,7 @@ def solve_material_allocation():
     prob += pulp.lpSum(j * x[i, j] for i in companies for j in tons) == 4
 
     # 求解
-    prob.solve()
+    solve(prob)
 
     # 输出结果
     if pulp.LpStatus[prob.status] == "Optimal":
@@ -0,0 +1,329 @@
+"""
+统一求解层：各模块的 PuLP 模型统一通过 solve(prob) 求解。
+
+PuLP 默认的 CBC 命令行后端每次求解都要把模型写成临时 MPS 文件、启动子进程再解析解文件，
+对频繁求解的小模型而言这部分开销远大于求解本身。这里优先使用进程内求解器
+（HiGHS，通过 highspy 直接传递矩阵，无文件读写和子进程），不可用时回退到 CBC。
+
+选择求解器的开关（优先级从高到低）：
+1. solve(prob, solver="...") 的参数；
+2. set_default_solver("...")；
+3. 环境变量 ALGORITHM_SOLVER，例如 ALGORITHM_SOLVER=PULP_CBC_CMD；
+4. 自动选择 PREFERRED_SOLVERS 中第一个可用的求解器。
+
+矩阵形式的模型（目标向量 c、稀疏约束矩阵 A、上下界数组）通过 solve_matrix 求解，
+直接把数组交给 highspy 或 scipy，不为每个系数创建 Python 对象。
+"""
+
+import os
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+import pulp
+
+try:
+    import highspy
+except ImportError:  # 未安装 highspy 时使用 scipy 或 PuLP
+    highspy = None
+
+try:
+    from scipy import optimize as scipy_optimize
+    from scipy import sparse as scipy_sparse
+except ImportError:
+    scipy_optimize = scipy_sparse = None
+
+SOLVER_ENV = "ALGORITHM_SOLVER"
+
+# 自动选择顺序：进程内求解器优先，CBC 命令行作为兜底
+PREFERRED_SOLVERS = ("HiGHS", "PULP_CBC_CMD")
+
+# 有矩阵接口的 PuLP 求解器及其对应的 solve_matrix 后端
+MATRIX_SOLVERS = {"HiGHS": "highs", "HiGHS_CMD": "highs"}
+
+_default_solver = None
+
+
+@lru_cache(maxsize=None)
+def _available_solvers():
+    # listSolvers 每次都要逐个探测求解器（约 1ms），结果在进程内缓存
+    return tuple(pulp.listSolvers(onlyAvailable=True))
+
+
+def available_solvers():
+    """当前环境中可用的 PuLP 求解器名称列表"""
+    return list(_available_solvers())
+
+
+def set_default_solver(name):
+    """设置全局默认求解器，name 为 None 时恢复自动选择；同时重新探测可用求解器"""
+    global _default_solver
+    if name is not None and name not in pulp.listSolvers():
+        raise ValueError(f"未知的求解器：{name}")
+    _default_solver = name
+    _available_solvers.cache_clear()
+
+
+def solver_name(name=None):
+    """按优先级确定实际使用的求解器名称"""
+    name = name or _default_solver or os.environ.get(SOLVER_ENV)
+    if name:
+        if name not in _available_solvers():
+            raise ValueError(f"求解器不可用：{name}")
+        return name
+    available = _available_solvers()
+    for candidate in PREFERRED_SOLVERS:
+        if candidate in available:
+            return candidate
+    raise ValueError("没有可用的求解器")
+
+
+def get_solver(name=None, msg=False, **options):
+    """构造求解器实例，默认关闭求解日志；其余参数原样传给 PuLP（如 timeLimit）"""
+    return pulp.getSolver(solver_name(name), msg=msg, **options)
+
+
+def solve(prob, solver=None, **options):
+    """求解 PuLP 模型并返回状态码，用法与 prob.solve() 相同"""
+    return prob.solve(get_solver(solver, **options))
+
+
+# 矩阵形式模型的求解结果：状态（与 pulp.LpStatus 相同的字符串）、变量取值、目标值
+MatrixResult = namedtuple("MatrixResult", ["status", "x", "objective"])
+
+
+def table_to_array(table, rows=None, cols=None, fill=0.0):
+    """把 {行: {列: 值}} 形式的表格一次性转换为二维数组，返回 (数组, 行标签, 列标签)
+
+    rows、cols 缺省时按表格中出现的顺序；缺失的格子填 fill。
+    """
+    if rows is None:
+        rows = list(table)
+    if cols is None:
+        cols = list(dict.fromkeys(col for row in rows for col in table[row]))
+    array = np.full((len(rows), len(cols)), fill, dtype=float)
+    col_index = {col: j for j, col in enumerate(cols)}
+    for i, row in enumerate(rows):
+        for col, value in table[row].items():
+            array[i, col_index[col]] = value
+    return array, rows, cols
+
+
+def _to_csr(A, n_rows, n_cols):
+    """约束矩阵统一转换为 CSR 三元组 (indptr, indices, data)
+
+    A 可以是稠密数组、scipy 稀疏矩阵或 COO 三元组 (data, row, col)。
+    与 scipy 的约定相同，重复出现的 (行, 列) 元素按求和合并。
+    """
+    if A is None:
+        return np.zeros(1, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0)
+    if hasattr(A, "tocsr"):
+        A = A.tocsr()
+        if A.shape != (n_rows, n_cols):
+            raise ValueError(f"约束矩阵形状应为{(n_rows, n_cols)}，实际为{A.shape}")
+        if not A.has_canonical_format:
+            # 直接由 (data, indices, indptr) 构造的 CSR 可能含重复或乱序的列下标
+            A = A.copy()
+            A.sum_duplicates()
+        return A.indptr.astype(np.int64), A.indices.astype(np.int64), A.data
+    if isinstance(A, tuple):
+        data, row, col = (np.asarray(part) for part in A)
+        data = data.astype(float)
+    else:
+        dense = np.asarray(A, dtype=float)
+        if dense.shape != (n_rows, n_cols):
+            raise ValueError(f"约束矩阵形状应为{(n_rows, n_cols)}，实际为{dense.shape}")
+        row, col = np.nonzero(dense)
+        data = dense[row, col]
+    if len(row) and (
+        row.max() >= n_rows or col.max() >= n_cols or min(row.min(), col.min()) < 0
+    ):
+        raise ValueError("约束矩阵的行列下标越界")
+    order = np.lexsort((col, row))
+    row, col, data = row[order], col[order], data[order]
+    # 排序后相同的 (行, 列) 相邻，每段的第一个位置开始一个新元素
+    first = np.ones(len(row), dtype=bool)
+    first[1:] = (row[1:] != row[:-1]) | (col[1:] != col[:-1])
+    if not first.all():
+        starts = np.flatnonzero(first)
+        row, col, data = row[starts], col[starts], np.add.reduceat(data, starts)
+    indptr = np.zeros(n_rows + 1, dtype=np.int64)
+    np.cumsum(np.bincount(row, minlength=n_rows), out=indptr[1:])
+    return indptr, col.astype(np.int64), data
+
+
+def _stack_rows(c, A_ub, b_ub, A_eq, b_eq):
+    """合并 <= 约束与 = 约束为 row_lower <= A x <= row_upper 的 CSR 形式"""
+    n = len(c)
+    b_ub = np.zeros(0) if b_ub is None else np.asarray(b_ub, dtype=float)
+    b_eq = np.zeros(0) if b_eq is None else np.asarray(b_eq, dtype=float)
+    ub = _to_csr(A_ub, len(b_ub), n)
+    eq = _to_csr(A_eq, len(b_eq), n)
+    indptr = np.concatenate([ub[0], eq[0][1:] + ub[0][-1]])
+    indices = np.concatenate([ub[1], eq[1]])
+    data = np.concatenate([ub[2], eq[2]])
+    row_lower = np.concatenate([np.full(len(b_ub), -np.inf), b_eq])
+    row_upper = np.concatenate([b_ub, b_eq])
+    return indptr, indices, data, row_lower, row_upper
+
+
+def matrix_backend(backend=None):
+    """确定矩阵模型的求解后端：highs、scipy 或 pulp
+
+    通过 set_default_solver 或 ALGORITHM_SOLVER 指定的求解器有矩阵接口时直接使用
+    （HiGHS 对应 highs 后端），没有矩阵接口的（如 CBC）走 pulp 后端，
+    保证同一个开关对所有模块生效；未指定时优先 highspy，其次 scipy，最后回退到 PuLP。
+    """
+    if backend is not None:
+        if backend not in ("highs", "scipy", "pulp"):
+            raise ValueError(f"未知的求解后端：{backend}")
+        if backend == "highs" and highspy is None:
+            raise ValueError("求解器不可用：highspy")
+        if backend == "scipy" and scipy_optimize is None:
+            raise ValueError("求解器不可用：scipy")
+        return backend
+    name = _default_solver or os.environ.get(SOLVER_ENV)
+    if name:
+        return MATRIX_SOLVERS.get(name, "pulp") if highspy is not None else "pulp"
+    if highspy is not None:
+        return "highs"
+    if scipy_optimize is not None:
+        return "scipy"
+    return "pulp"
+
+
+def _solve_highs(c, rows, lb, ub, integrality, maximize):
+    indptr, indices, data, row_lower, row_upper = rows
+    lp = highspy.HighsLp()
+    lp.num_col_ = len(c)
+    lp.num_row_ = len(row_lower)
+    lp.col_cost_ = c
+    lp.col_lower_ = lb
+    lp.col_upper_ = ub
+    lp.row_lower_ = row_lower
+    lp.row_upper_ = row_upper
+    lp.a_matrix_.format_ = highspy.MatrixFormat.kRowwise
+    lp.a_matrix_.num_col_ = len(c)
+    lp.a_matrix_.num_row_ = len(row_lower)
+    lp.a_matrix_.start_ = indptr
+    lp.a_matrix_.index_ = indices
+    lp.a_matrix_.value_ = data
+    if maximize:
+        lp.sense_ = highspy.ObjSense.kMaximize
+    if integrality is not None:
+        lp.integrality_ = [
+            highspy.HighsVarType.kInteger if flag else highspy.HighsVarType.kContinuous
+            for flag in integrality
+        ]
+    h = highspy.Highs()
+    h.setOptionValue("output_flag", False)
+    h.passModel(lp)
+    h.run()
+    status = {
+        highspy.HighsModelStatus.kOptimal: "Optimal",
+        highspy.HighsModelStatus.kInfeasible: "Infeasible",
+        highspy.HighsModelStatus.kUnbounded: "Unbounded",
+    }.get(h.getModelStatus(), "Not Solved")
+    if status != "Optimal":
+        return MatrixResult(status, None, None)
+    x = np.array(h.getSolution().col_value)
+    return MatrixResult(status, x, h.getInfo().objective_function_value)
+
+
+def _solve_scipy(c, rows, lb, ub, integrality, maximize):
+    indptr, indices, data, row_lower, row_upper = rows
+    constraints = []
+    if len(row_lower):
+        A = scipy_sparse.csr_array(
+            (data, indices, indptr), shape=(len(row_lower), len(c))
+        )
+        constraints.append(scipy_optimize.LinearConstraint(A, row_lower, row_upper))
+    result = scipy_optimize.milp(
+        -c if maximize else c,
+        integrality=None if integrality is None else integrality.astype(int),
+        bounds=scipy_optimize.Bounds(lb, ub),
+        constraints=constraints,
+    )
+    status = {0: "Optimal", 2: "Infeasible", 3: "Unbounded"}.get(
+        result.status, "Not Solved"
+    )
+    if status != "Optimal":
+        return MatrixResult(status, None, None)
+    return MatrixResult(status, result.x, float(c @ result.x))
+
+
+def _solve_pulp(c, rows, lb, ub, integrality, maximize, solver):
+    """回退路径：按 CSR 行切片构造 PuLP 模型，再交给 solve() 选定的求解器"""
+    indptr, indices, data, row_lower, row_upper = rows
+    prob = pulp.LpProblem("matrix", pulp.LpMaximize if maximize else pulp.LpMinimize)
+    x = [
+        pulp.LpVariable(
+            f"x{j}",
+            lowBound=None if np.isinf(lb[j]) else float(lb[j]),
+            upBound=None if np.isinf(ub[j]) else float(ub[j]),
+            cat=(
+                "Integer"
+                if integrality is not None and integrality[j]
+                else "Continuous"
+            ),
+        )
+        for j in range(len(c))
+    ]
+    prob += pulp.LpAffineExpression([(x[j], float(c[j])) for j in np.flatnonzero(c)])
+    for r in range(len(row_lower)):
+        start, end = indptr[r], indptr[r + 1]
+        expr = pulp.LpAffineExpression(
+            [(x[j], float(v)) for j, v in zip(indices[start:end], data[start:end])]
+        )
+        if row_lower[r] == row_upper[r]:
+            prob += expr == float(row_upper[r])
+        else:
+            if not np.isinf(row_upper[r]):
+                prob += expr <= float(row_upper[r])
+            if not np.isinf(row_lower[r]):
+                prob += expr >= float(row_lower[r])
+    solve(prob, solver)
+    status = pulp.LpStatus[prob.status]
+    if status != "Optimal":
+        return MatrixResult(status, None, None)
+    values = np.array([var.value() or 0.0 for var in x])
+    return MatrixResult(status, values, float(c @ values))
+
+
+def solve_matrix(
+    c,
+    A_ub=None,
+    b_ub=None,
+    A_eq=None,
+    b_eq=None,
+    lb=0.0,
+    ub=np.inf,
+    integrality=None,
+    maximize=False,
+    backend=None,
+    solver=None,
+):
+    """求解矩阵形式的 LP/MIP：min/max c·x，s.t. A_ub x <= b_ub，A_eq x = b_eq，lb <= x <= ub
+
+    A_ub、A_eq 可以是稠密数组、scipy 稀疏矩阵或 COO 三元组 (data, row, col)；
+    lb、ub 为标量或数组，integrality 为布尔数组（True 表示整数变量）。
+    backend 为 None 时由 matrix_backend 自动选择，solver 仅在 pulp 后端下指定 PuLP 求解器。
+    返回 MatrixResult，非最优时 x 与 objective 为 None。
+    """
+    c = np.asarray(c, dtype=float)
+    n = len(c)
+    lb = np.broadcast_to(np.asarray(lb, dtype=float), n).copy()
+    ub = np.broadcast_to(np.asarray(ub, dtype=float), n).copy()
+    if integrality is not None:
+        integrality = np.broadcast_to(np.asarray(integrality, dtype=bool), n)
+        if not integrality.any():
+            integrality = None
+    if (A_ub is None) != (b_ub is None) or (A_eq is None) != (b_eq is None):
+        raise ValueError("约束矩阵与右端项必须同时给出")
+    rows = _stack_rows(c, A_ub, b_ub, A_eq, b_eq)
+    backend = matrix_backend(backend)
+    if backend == "highs":
+        return _solve_highs(c, rows, lb, ub, integrality, maximize)
+    if backend == "scipy":
+        return _solve_scipy(c, rows, lb, ub, integrality, maximize)
+    return _solve_pulp(c, rows, lb, ub, integrality, maximize, solver)
@@ -0,0 +1,41 @@
+import re
+import runpy
+import sys
+from pathlib import Path
+
+import pytest
+
+ALGORITHM_DIR = Path(__file__).resolve().parent.parent / "src" / "algorithm"
+
+# 各模块之间以 from solver import ... 的方式互相引用，测试与脚本一样从算法目录导入
+sys.path.insert(0, str(ALGORITHM_DIR))
+
+
+def pytest_configure(config):
+    # 脚本沿用 PuLP 3 的建模写法，忽略其面向 4.0 的弃用提示
+    config.addinivalue_line("filterwarnings", "ignore::DeprecationWarning:pulp.*")
+
+
+@pytest.fixture(scope="session")
+def load_script():
+    """按文件名加载带点号的脚本（如 assignment_problem.2.py），返回其全局命名空间"""
+    cache = {}
+
+    def load(filename):
+        if filename not in cache:
+            cache[filename] = runpy.run_path(str(ALGORITHM_DIR / filename))
+        return cache[filename]
+
+    return load
+
+
+@pytest.fixture
+def demo_output(load_script, capsys):
+    """运行脚本中的演示函数并返回其输出，整数值的浮点数（如 18.0）统一写成整数，
+    便于比较内置算法与 PuLP 后端的输出"""
+
+    def run(filename, function, backend):
+        load_script(filename)[function](backend)
+        return re.sub(r"(\d)\.0(?!\d)", r"\1", capsys.readouterr().out)
+
+    return run
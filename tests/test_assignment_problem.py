@@ -0,0 +1,142 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pulp
+import pytest
+
+from assignment_problem import (
+    bottleneck_assignment,
+    linear_sum_assignment,
+    solve_assignment_batch,
+    solve_assignment_problem,
+)
+from solver import solve
+
+
+def pulp_assignment(cost, maximize=False):
+    """PuLP 0-1 规划求指派问题的最优值，作为对照；矩形矩阵时较少的一侧全部被分配"""
+    n, m = cost.shape
+    prob = pulp.LpProblem("对照", pulp.LpMaximize if maximize else pulp.LpMinimize)
+    x = {
+        (i, j): pulp.LpVariable(f"x_{i}_{j}", cat="Binary")
+        for i in range(n)
+        for j in range(m)
+    }
+    prob += pulp.lpSum(float(cost[i, j]) * x[i, j] for i, j in x)
+    for i in range(n):
+        row = pulp.lpSum(x[i, j] for j in range(m))
+        prob += row == 1 if n <= m else row <= 1
+    for j in range(m):
+        col = pulp.lpSum(x[i, j] for i in range(n))
+        prob += col <= 1 if n <= m else col == 1
+    solve(prob)
+    assert pulp.LpStatus[prob.status] == "Optimal"
+    # 选中的单价全为 0 时 PuLP 的目标值为 None
+    return pulp.value(prob.objective) or 0
+
+
+def test_hungarian_demo_matches_pulp(capsys):
+    solve_assignment_problem(backend="hungarian")
+    hungarian = capsys.readouterr().out
+    solve_assignment_problem(backend="pulp")
+    assert hungarian == capsys.readouterr().out
+    assert "总加工时间：29" in hungarian
+
+
+def test_hungarian_machine_demo_matches_pulp(demo_output):
+    hungarian = demo_output("assignment_problem.6.py", "solve_assignment", "hungarian")
+    reference = demo_output("assignment_problem.6.py", "solve_assignment", "pulp")
+    assert hungarian == reference
+    assert hungarian.startswith("最小总成本：21百元")
+
+
+@pytest.mark.parametrize("shape", [(1, 1), (4, 4), (6, 6), (3, 5), (5, 3)])
+@pytest.mark.parametrize("maximize", [False, True])
+def test_linear_sum_assignment_matches_pulp(shape, maximize):
+    rng = np.random.default_rng(sum(shape) + maximize)
+    for _ in range(5):
+        cost = rng.integers(-20, 50, shape).astype(float)
+        rows, cols = linear_sum_assignment(cost, maximize=maximize)
+        assert len(rows) == min(shape)
+        assert len(set(rows)) == len(rows) and len(set(cols)) == len(cols)
+        assert cost[rows, cols].sum() == pytest.approx(pulp_assignment(cost, maximize))
+
+
+def test_linear_sum_assignment_rejects_inf():
+    with pytest.raises(ValueError):
+        linear_sum_assignment([[1.0, np.inf], [2.0, 3.0]])
+
+
+def pulp_bottleneck(cost):
+    """PuLP 混合整数模型求瓶颈指派的最优瓶颈值：最小化 z，z >= 被选元素"""
+    n, m = cost.shape
+    prob = pulp.LpProblem("瓶颈对照", pulp.LpMinimize)
+    x = {
+        (i, j): pulp.LpVariable(f"x_{i}_{j}", cat="Binary")
+        for i in range(n)
+        for j in range(m)
+    }
+    z = pulp.LpVariable("z")
+    prob += z
+    for (i, j), var in x.items():
+        prob += z >= float(cost[i, j]) * var
+    for i in range(n):
+        row = pulp.lpSum(x[i, j] for j in range(m))
+        prob += row == 1 if n <= m else row <= 1
+    for j in range(m):
+        col = pulp.lpSum(x[i, j] for i in range(n))
+        prob += col <= 1 if n <= m else col == 1
+    solve(prob)
+    assert pulp.LpStatus[prob.status] == "Optimal"
+    return pulp.value(z)
+
+
+@pytest.mark.parametrize("shape", [(1, 1), (5, 5), (7, 7), (4, 6), (6, 4)])
+def test_bottleneck_assignment_matches_pulp(shape):
+    rng = np.random.default_rng(shape[0] * 10 + shape[1])
+    for _ in range(4):
+        cost = rng.integers(0, 30, shape)
+        value, rows, cols = bottleneck_assignment(cost)
+        assert len(rows) == min(shape)
+        assert len(set(rows)) == len(rows) and len(set(cols)) == len(cols)
+        assert cost[rows, cols].max() == value
+        assert value == pytest.approx(pulp_bottleneck(cost))
+
+
+def test_bottleneck_assignment_empty():
+    value, rows, cols = bottleneck_assignment(np.empty((0, 3)))
+    assert value is None and len(rows) == len(cols) == 0
+
+
+@pytest.mark.parametrize("maximize", [False, True])
+def test_assignment_batch_matches_pulp(maximize):
+    rng = np.random.default_rng(maximize)
+    costs = [
+        rng.integers(0, 40, shape).astype(float)
+        for shape in [(4, 4), (3, 5), (5, 3)] * 2
+    ]
+    assignments, objectives = solve_assignment_batch(costs, maximize=maximize)
+    for cost, (rows, cols), objective in zip(costs, assignments, objectives):
+        assert cost[rows, cols].sum() == objective
+        assert objective == pytest.approx(pulp_assignment(cost, maximize))
+
+
+def test_assignment_batch_parallel_paths_agree():
+    rng = np.random.default_rng(0)
+    costs = rng.integers(0, 100, (40, 6, 6))
+    serial = solve_assignment_batch(costs, workers=1)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        threaded = solve_assignment_batch(
+            costs, parallel_threshold=0, executor=executor
+        )
+    pooled = solve_assignment_batch(costs, workers=2, parallel_threshold=0)
+    for other in (threaded, pooled):
+        assert np.array_equal(serial[1], other[1])
+        for (r1, c1), (r2, c2) in zip(serial[0], other[0]):
+            assert np.array_equal(r1, r2) and np.array_equal(c1, c2)
+
+
+def test_bottleneck_demo_matches_pulp(demo_output):
+    native = demo_output("assignment_problem.1.py", "solve_assignment", "bottleneck")
+    assert native == demo_output("assignment_problem.1.py", "solve_assignment", "pulp")
+    assert native.startswith("最短完成时间：4小时")
@@ -0,0 +1,125 @@
+import numpy as np
+import pytest
+
+import geometric_probability as geometric_probability_module
+from geometric_probability import (
+    arrival_probability,
+    geometric_probability,
+    k_bus_probability,
+    monte_carlo_simulation,
+    unequal_window_probability,
+)
+
+
+def test_monte_carlo_matches_closed_form():
+    result = monte_carlo_simulation(n_trials=400000, seed=0, chunk_size=65536)
+    assert result.n_trials == 400000
+    assert result.ci_low <= geometric_probability() <= result.ci_high
+    assert result.probability == pytest.approx(0.64, abs=5 * result.std_error)
+
+
+def test_monte_carlo_is_reproducible_across_chunk_sizes():
+    first = monte_carlo_simulation(n_trials=100000, seed=7, chunk_size=100000)
+    again = monte_carlo_simulation(n_trials=100000, seed=7, chunk_size=100000)
+    assert first == again
+    small = monte_carlo_simulation(n_trials=100000, seed=7, chunk_size=1000)
+    assert small.probability == pytest.approx(0.64, abs=5 * small.std_error)
+
+
+@pytest.mark.parametrize("kwargs", [{"n_trials": 0}, {"chunk_size": 0}])
+def test_monte_carlo_rejects_bad_sizes(kwargs):
+    with pytest.raises(ValueError):
+        monte_carlo_simulation(**kwargs)
+
+
+def test_parallel_monte_carlo_is_reproducible():
+    first = monte_carlo_simulation(n_trials=200000, seed=3, workers=2)
+    assert first == monte_carlo_simulation(n_trials=200000, seed=3, workers=2)
+    assert first.n_trials == 200000
+    assert first.probability == pytest.approx(0.64, abs=5 * first.std_error)
+
+
+def test_adaptive_monte_carlo_reaches_tolerance():
+    result = monte_carlo_simulation(tolerance=2e-3, confidence=0.99, seed=1)
+    half_width = (result.ci_high - result.ci_low) / 2
+    assert half_width <= 2e-3 * 1.01
+    assert result.probability == pytest.approx(0.64, abs=5 * result.std_error)
+
+
+def test_adaptive_monte_carlo_respects_max_trials():
+    result = monte_carlo_simulation(
+        tolerance=1e-6, batch_size=1000, max_trials=5000, seed=1
+    )
+    assert result.n_trials == 5000
+
+
+def test_adaptive_monte_carlo_ignores_n_trials():
+    result = monte_carlo_simulation(
+        n_trials=0, tolerance=1e-2, batch_size=1000, seed=1
+    )
+    assert result.n_trials >= 1000
+
+
+def test_parallel_adaptive_monte_carlo_reuses_one_pool(monkeypatch):
+    created = []
+    pool_class = geometric_probability_module.ProcessPoolExecutor
+
+    def counting_pool(*args, **kwargs):
+        created.append(kwargs)
+        return pool_class(*args, **kwargs)
+
+    monkeypatch.setattr(
+        geometric_probability_module, "ProcessPoolExecutor", counting_pool
+    )
+    # 首批 1000 次达不到目标精度，之后至少还要再模拟一批
+    result = monte_carlo_simulation(
+        tolerance=5e-3, batch_size=1000, seed=2, workers=2
+    )
+    assert result.n_trials > 1000
+    assert len(created) == 1
+    assert result == monte_carlo_simulation(
+        tolerance=5e-3, batch_size=1000, seed=2, workers=2
+    )
+
+
+def sample_probability(windows, gap, n=400000, seed=0):
+    """直接抽样估计全部车辆在 gap 跨度内到达的概率，作为解析解与数值积分的对照"""
+    rng = np.random.default_rng(seed)
+    t = np.column_stack([rng.uniform(lo, hi, n) for lo, hi in windows])
+    return np.mean(t.max(axis=1) - t.min(axis=1) <= gap)
+
+
+def test_closed_form_demo_value():
+    assert geometric_probability() == pytest.approx(0.64)
+    assert geometric_probability(10, 12) == 1.0
+
+
+@pytest.mark.parametrize(
+    "window1, window2, gap", [(10, 10, 4), (10, 6, 3), (3, 8, 5), (5, 7, 0.5)]
+)
+def test_unequal_windows_match_sampling(window1, window2, gap):
+    expected = sample_probability(((0, window1), (0, window2)), gap)
+    assert unequal_window_probability(window1, window2, gap) == pytest.approx(
+        expected, abs=5e-3
+    )
+
+
+@pytest.mark.parametrize("k", [1, 2, 3, 5])
+def test_k_bus_matches_sampling(k):
+    expected = sample_probability(((0, 10),) * k, 4)
+    assert k_bus_probability(k, 10, 4) == pytest.approx(expected, abs=5e-3)
+    assert k_bus_probability(2, 10, 4) == pytest.approx(geometric_probability())
+
+
+@pytest.mark.parametrize(
+    "windows, gap",
+    [
+        (((0, 10), (2, 6)), 3),
+        (((0, 10), (0, 10), (0, 10)), 4),
+        (((0, 10), (3, 8), (1, 4)), 4),
+        (((0, 5), (2, 9), (4, 6), (1, 7)), 3.5),
+    ],
+)
+def test_arrival_probability_matches_sampling(windows, gap):
+    expected = sample_probability(windows, gap)
+    assert arrival_probability(windows, gap) == pytest.approx(expected, abs=5e-3)
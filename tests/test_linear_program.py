@@ -0,0 +1,274 @@
+import numpy as np
+import pulp
+import pytest
+
+from linear_program import LinearModel, build_clothing_model
+from solver import solve
+
+# LinearModel 底层为 highspy，未安装时跳过本模块
+highspy = pytest.importorskip("highspy")
+
+
+def random_model_data(rng, m, n):
+    """随机生成 LinearModel 的输入 (c, A, b, senses, lb, ub)，包含三种约束与有限/无限上界"""
+    A = rng.integers(-3, 8, (m, n)).astype(float)
+    x0 = rng.integers(0, 4, n).astype(float)
+    senses = list(rng.choice(["<=", ">=", "="], m, p=[0.6, 0.25, 0.15]))
+    # 右端项围绕可行点 x0 扰动，大部分实例可行
+    shift = rng.integers(0, 6, m)
+    b = A @ x0 + np.select(
+        [np.array(senses) == "<=", np.array(senses) == ">="], [shift, -shift], 0
+    )
+    c = rng.integers(-6, 10, n).astype(float)
+    lb = np.zeros(n)
+    ub = np.where(rng.random(n) < 0.5, np.inf, x0 + rng.integers(1, 6, n))
+    return c, A, b, senses, lb, ub
+
+
+def pulp_model(c, A, b, senses, lb, ub, maximize, integer=False):
+    """用 PuLP + CBC 求同一模型，返回 (状态, 目标值)，作为对照"""
+    prob = pulp.LpProblem("对照", pulp.LpMaximize if maximize else pulp.LpMinimize)
+    cat = "Integer" if integer else "Continuous"
+    x = [
+        pulp.LpVariable(f"x{j}", lb[j], None if np.isinf(ub[j]) else ub[j], cat=cat)
+        for j in range(len(c))
+    ]
+    prob += pulp.lpSum(float(cj) * v for cj, v in zip(c, x))
+    for row, sense, r in zip(A, senses, b):
+        expr = pulp.lpSum(float(a) * v for a, v in zip(row, x))
+        prob += {"<=": expr <= r, ">=": expr >= r, "=": expr == r}[sense]
+    solve(prob, solver="PULP_CBC_CMD")
+    status = pulp.LpStatus[prob.status]
+    return status, pulp.value(prob.objective) if status == "Optimal" else None
+
+
+def check_against_pulp(result, data, maximize, integer=False):
+    status, objective = pulp_model(*data, maximize, integer)
+    if status in ("Infeasible", "Unbounded"):
+        assert result.status == status
+        return
+    assert status == result.status == "Optimal"
+    assert result.objective == pytest.approx(objective, rel=1e-6, abs=1e-5)
+    _, A, b, senses, lb, ub = data
+    activity = A @ result.x
+    for value, sense, r in zip(activity, senses, b):
+        assert {"<=": value <= r + 1e-6, ">=": value >= r - 1e-6}.get(
+            sense, abs(value - r) <= 1e-6
+        )
+    assert (result.x >= lb - 1e-6).all() and (result.x <= ub + 1e-6).all()
+
+
+def test_demos_match_pulp(demo_output):
+    for filename, function in [
+        ("linear_program.py", "solve_clothing_problem"),
+        ("assignment_problem.4.py", "solve_production_planning"),
+    ]:
+        native = demo_output(filename, function, "simplex").splitlines()
+        reference = demo_output(filename, function, "pulp").splitlines()
+        # PuLP 后端不输出灵敏度信息，只比较最优值与方案部分
+        assert native[:7] == reference[:7]
+    assert native[0] == "最大利润：34万元"
+
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("maximize", [False, True])
+def test_warm_started_resolves_match_pulp(seed, maximize):
+    rng = np.random.default_rng(seed)
+    m, n = 5, 6
+    c, A, b, senses, lb, ub = random_model_data(rng, m, n)
+    model = LinearModel(c, A, b, senses, lb, ub, maximize=maximize)
+    check_against_pulp(model.solve(), (c, A, b, senses, lb, ub), maximize)
+    for step in range(6):
+        kind = step % 3
+        if kind == 0:
+            rows = rng.choice(m, 2, replace=False)
+            b[rows] += rng.integers(-3, 4, 2)
+            model.set_rhs(rows, b[rows])
+        elif kind == 1:
+            j = int(rng.integers(n))
+            c[j] = rng.integers(-6, 10)
+            model.set_objective(j, c[j])
+        else:
+            j = int(rng.integers(n))
+            ub[j] = np.inf if ub[j] < np.inf else lb[j] + rng.integers(0, 5)
+            model.set_bounds(j, ub=ub[j])
+        check_against_pulp(model.solve(), (c, A, b, senses, lb, ub), maximize)
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_solve_integer_matches_pulp(seed):
+    rng = np.random.default_rng(seed)
+    data = random_model_data(rng, 4, 5)
+    c, A, b, senses, lb, _ = data
+    ub = np.full(5, 6.0)
+    data = (c, A, b, senses, lb, ub)
+    model = LinearModel(c, A, b, senses, lb, ub, maximize=True)
+    result = model.solve_integer()
+    check_against_pulp(result, data, True, integer=True)
+    if result.status == "Optimal":
+        assert np.array_equal(result.x, np.round(result.x))
+    # 整数规划结束后变量恢复为连续，再次 solve 得到 LP 松弛
+    check_against_pulp(model.solve(), data, True)
+
+
+def test_clothing_model_tracks_days():
+    model = build_clothing_model()
+    assert round(model.solve_integer().objective) == 211
+    A = np.zeros((5, 8))
+    A[0] = [5, 6, 7, 8, -6, -7, -8, -9]
+    A[1:, :4] = A[1:, 4:] = np.eye(4)
+    c = np.array([5, 6, 7, 8, 0, 0, 0, 0], dtype=float)
+    for days in (10, 20):
+        model.set_rhs(slice(1, None), days)
+        b = np.array([0.0] + [days] * 4)
+        data = (c, A, b, ["="] * 5, np.zeros(8), np.full(8, float(days)))
+        check_against_pulp(model.solve_integer(), data, True, integer=True)
+
+
+def test_unknown_sense_and_unsolved_sensitivity():
+    with pytest.raises(ValueError):
+        LinearModel([1.0], [[1.0]], [1.0], senses=["<"])
+    model = LinearModel([1.0], [[1.0]], [-1.0], senses=[">="])
+    assert model.solve().status == "Optimal"
+    infeasible = LinearModel([1.0], [[1.0]], [-1.0])
+    assert infeasible.solve().status == "Infeasible"
+    with pytest.raises(ValueError):
+        infeasible.sensitivity()
+
+
+def production_model_data():
+    """assignment_problem.4.py 演示模型：max 9x1 + 12x2，三种原材料 <= 约束"""
+    A = np.array([[1.0, 1.0], [4.0, 3.0], [1.0, 3.0]])
+    return np.array([9.0, 12.0]), A, np.array([4.0, 12.0, 6.0])
+
+
+def test_production_demo_sensitivity_matches_pulp_and_ranging(load_script):
+    c, A, b = production_model_data()
+    model = load_script("assignment_problem.4.py")["build_production_model"](
+        {
+            "甲": {"I": 1, "II": 1, "现有量": 4},
+            "乙": {"I": 4, "II": 3, "现有量": 12},
+            "丙": {"I": 1, "II": 3, "现有量": 6},
+        },
+        {"I": 9, "II": 12},
+    )
+    assert model.solve().objective == pytest.approx(34)
+    s = model.sensitivity()
+    assert np.allclose(s.slack, [2 / 3, 0, 0])
+    assert np.allclose(s.duals, [0, 5 / 3, 7 / 3])
+    assert np.allclose(s.rhs_ranges, [[10 / 3, np.inf], [6, 15], [3, 12]])
+    assert np.allclose(s.objective_ranges, [[4, 16], [6.75, 27]])
+
+    # PuLP + CBC 给出的影子价格与松弛量
+    prob = pulp.LpProblem("对照", pulp.LpMaximize)
+    x = [pulp.LpVariable(f"x{j}", 0) for j in range(2)]
+    prob += pulp.lpDot(c.tolist(), x)
+    rows = [pulp.lpDot(row.tolist(), x) <= r for row, r in zip(A, b)]
+    for k, row in enumerate(rows):
+        prob += row, f"r{k}"
+    solve(prob, solver="PULP_CBC_CMD")
+    constraints = [prob.constraints[f"r{k}"] for k in range(3)]
+    assert np.allclose(s.duals, [con.pi for con in constraints])
+    assert np.allclose(s.slack, [con.slack for con in constraints])
+
+    # 直接调用 HiGHS 的 getRanging：起作用约束的右端项范围与目标系数范围应一致
+    h = highspy.Highs()
+    h.setOptionValue("output_flag", False)
+    h.setOptionValue("presolve", "off")
+    lp = highspy.HighsLp()
+    lp.num_col_, lp.num_row_ = 2, 3
+    lp.col_cost_, lp.col_lower_, lp.col_upper_ = c, np.zeros(2), np.full(2, np.inf)
+    lp.row_lower_, lp.row_upper_ = np.full(3, -np.inf), b
+    lp.a_matrix_.format_ = highspy.MatrixFormat.kColwise
+    lp.a_matrix_.num_col_, lp.a_matrix_.num_row_ = 2, 3
+    lp.a_matrix_.start_ = np.array([0, 3, 6])
+    lp.a_matrix_.index_ = np.array([0, 1, 2, 0, 1, 2])
+    lp.a_matrix_.value_ = A.T.ravel()
+    lp.sense_ = highspy.ObjSense.kMaximize
+    h.passModel(lp)
+    h.run()
+    _, ranging = h.getRanging()
+    binding = s.slack < 1e-9
+    expected_rhs = np.column_stack(
+        [ranging.row_bound_dn.value_, ranging.row_bound_up.value_]
+    )
+    assert np.allclose(s.rhs_ranges[binding], expected_rhs[binding])
+    expected_cost = np.column_stack(
+        [ranging.col_cost_dn.value_[:2], ranging.col_cost_up.value_[:2]]
+    )
+    assert np.allclose(s.objective_ranges, expected_cost)
+
+
+def check_sensitivity_by_resolving(data, maximize, model, result):
+    """在右端项与目标系数范围的端点上重新求解，验证影子价格与最优解保持不变"""
+    c, A, b, senses, lb, ub = data
+    s = model.sensitivity()
+    assert np.allclose(s.slack, b - A @ result.x)
+    # 强对偶：目标值 = y·b + d·x
+    assert s.duals @ b + s.reduced_costs @ result.x == pytest.approx(result.objective)
+    for i in range(len(b)):
+        low, high = s.rhs_ranges[i]
+        assert low - 1e-9 <= b[i] <= high + 1e-9
+        for target in (low, high):
+            if not np.isfinite(target):
+                target = b[i] + np.sign(target) * 7
+            moved = b.copy()
+            moved[i] = target
+            again = LinearModel(c, A, moved, senses, lb, ub, maximize).solve()
+            assert again.status == "Optimal"
+            expected = result.objective + s.duals[i] * (target - b[i])
+            assert again.objective == pytest.approx(expected, abs=1e-6)
+    for j in range(len(c)):
+        low, high = s.objective_ranges[j]
+        assert low - 1e-9 <= c[j] <= high + 1e-9
+        for target in (low, high):
+            if not np.isfinite(target):
+                target = c[j] + np.sign(target) * 7
+            moved = c.copy()
+            moved[j] = target
+            again = LinearModel(moved, A, b, senses, lb, ub, maximize).solve()
+            assert again.objective == pytest.approx(moved @ result.x, abs=1e-6)
+
+
+def test_demo_sensitivity_holds_on_resolve():
+    c, A, b = production_model_data()
+    data = (c, A, b, ["<="] * 3, np.zeros(2), np.full(2, np.inf))
+    model = LinearModel(c, A, b, maximize=True)
+    check_sensitivity_by_resolving(data, True, model, model.solve())
+
+    clothing = build_clothing_model()
+    result = clothing.solve()
+    A = np.zeros((5, 8))
+    A[0] = [5, 6, 7, 8, -6, -7, -8, -9]
+    A[1:, :4] = A[1:, 4:] = np.eye(4)
+    c = np.array([5, 6, 7, 8, 0, 0, 0, 0], dtype=float)
+    data = (
+        c,
+        A,
+        np.array([0.0] + [15.0] * 4),
+        ["="] * 5,
+        np.zeros(8),
+        np.full(8, np.inf),
+    )
+    check_sensitivity_by_resolving(data, True, clothing, result)
+
+
+@pytest.mark.parametrize("seed", range(15))
+@pytest.mark.parametrize("maximize", [False, True])
+def test_random_sensitivity_holds_on_resolve(seed, maximize):
+    rng = np.random.default_rng(seed)
+    data = random_model_data(rng, 4, 4)
+    model = LinearModel(*data, maximize=maximize)
+    result = model.solve()
+    if result.status == "Optimal":
+        check_sensitivity_by_resolving(data, maximize, model, result)
+
+
+def test_sensitivity_without_constraint_coefficients():
+    # 约束矩阵全为零时 HiGHS 不做 ranging，改由检验数给出范围
+    model = LinearModel([2.0, -1.0], [[0.0, 0.0]], [3.0], ub=[4.0, 5.0], maximize=True)
+    result = model.solve()
+    assert np.allclose(result.x, [4, 0])
+    s = model.sensitivity()
+    assert np.allclose(s.rhs_ranges, [[0, np.inf]])
+    assert np.allclose(s.objective_ranges, [[0, np.inf], [-np.inf, 0]])
@@ -0,0 +1,140 @@
+from fractions import Fraction
+
+import numpy as np
+import pulp
+import pytest
+
+from linear_program import solve_integer_lp_2d, solve_lp_2d
+from solver import solve
+
+
+def random_constraints(rng, k, feasible=True):
+    """随机生成 k 个两变量约束 (a, b, sense, r)，feasible=True 时保证整点 p0 可行"""
+    a, b = rng.integers(-6, 7, k), rng.integers(-6, 7, k)
+    senses = rng.choice(["<=", ">=", "="], k, p=[0.55, 0.35, 0.1])
+    if feasible:
+        p0 = rng.integers(-10, 11, 2)
+        slack = rng.integers(0, 15, k)
+        r = (
+            a * p0[0]
+            + b * p0[1]
+            + np.select([senses == "<=", senses == ">="], [slack, -slack], 0)
+        )
+    else:
+        r = rng.integers(-20, 30, k)
+    return [
+        (int(ai), int(bi), str(sense), int(ri))
+        for ai, bi, sense, ri in zip(a, b, senses, r)
+    ]
+
+
+def pulp_2d(objective, constraints, maximize, integer=False):
+    """PuLP + CBC 求同一两变量模型（变量无界），返回 (状态, 目标值)"""
+    prob = pulp.LpProblem("对照", pulp.LpMaximize if maximize else pulp.LpMinimize)
+    cat = "Integer" if integer else "Continuous"
+    x, y = pulp.LpVariable("x", cat=cat), pulp.LpVariable("y", cat=cat)
+    prob += objective[0] * x + objective[1] * y
+    for a, b, sense, r in constraints:
+        expr = a * x + b * y
+        prob += {"<=": expr <= r, ">=": expr >= r, "=": expr == r}[sense]
+    solve(prob, solver="PULP_CBC_CMD")
+    status = pulp.LpStatus[prob.status]
+    return status, (pulp.value(prob.objective) or 0) if status == "Optimal" else None
+
+
+def check_feasible(point, constraints):
+    """精确检查有理数解满足全部约束"""
+    assert all(isinstance(v, Fraction) for v in point)
+    for a, b, sense, r in constraints:
+        value = a * point[0] + b * point[1]
+        assert {"<=": value <= r, ">=": value >= r, "=": value == r}[sense]
+
+
+@pytest.mark.parametrize("filename", ["linear_program.1.py", "linear_program.2.py"])
+def test_demos_match_pulp(demo_output, filename):
+    exact = demo_output(filename, "solve_linear_programming", "exact")
+    assert exact == demo_output(filename, "solve_linear_programming", "pulp")
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_seidel_matches_pulp(seed):
+    rng = np.random.default_rng(seed)
+    # 加上 |x|, |y| <= 50 的包围盒，使大部分实例有界；每隔几个实例去掉以覆盖无界情形
+    constraints = random_constraints(rng, int(rng.integers(2, 9)), seed % 5 != 0)
+    if seed % 4:
+        constraints += [
+            (1, 0, "<=", 50),
+            (1, 0, ">=", -50),
+            (0, 1, "<=", 50),
+            (0, 1, ">=", -50),
+        ]
+    objective = tuple(int(v) for v in rng.integers(-5, 6, 2))
+    for maximize in (False, True):
+        status, expected = pulp_2d(objective, constraints, maximize)
+        result = solve_lp_2d(objective, constraints, maximize, seed=seed)
+        assert result.status == status
+        if status == "Optimal":
+            check_feasible(result.x, constraints)
+            assert (
+                result.objective
+                == objective[0] * result.x[0] + objective[1] * result.x[1]
+            )
+            assert float(result.objective) == pytest.approx(
+                expected, rel=1e-6, abs=1e-5
+            )
+            # 最优点按 (目标值, x, y) 字典序唯一，随机插入顺序不影响结果
+            again = solve_lp_2d(objective, constraints, maximize, seed=seed + 1)
+            assert again.x == result.x
+
+
+@pytest.mark.parametrize("seed", range(15))
+def test_integer_2d_matches_pulp(seed):
+    rng = np.random.default_rng(100 + seed)
+    constraints = random_constraints(rng, int(rng.integers(2, 6)), seed % 5 != 0)
+    constraints += [
+        (1, 0, "<=", 20),
+        (1, 0, ">=", -20),
+        (0, 1, "<=", 20),
+        (0, 1, ">=", -20),
+    ]
+    objective = tuple(int(v) for v in rng.integers(-5, 6, 2))
+    status, expected = pulp_2d(objective, constraints, True, integer=True)
+    result = solve_integer_lp_2d(objective, constraints, maximize=True, seed=seed)
+    assert result.status == status
+    if status == "Optimal":
+        check_feasible(result.x, constraints)
+        assert all(v.denominator == 1 for v in result.x)
+        assert float(result.objective) == pytest.approx(expected, rel=1e-6, abs=1e-5)
+
+
+def test_degenerate_constraints():
+    assert solve_lp_2d((1, 1), [(0, 0, "<=", -1)]).status == "Infeasible"
+    result = solve_lp_2d((1, 1), [(0, 0, "<=", 1), (1, 0, ">=", 0), (0, 1, ">=", 0)])
+    assert result.status == "Optimal" and result.objective == 0
+    with pytest.raises(ValueError):
+        solve_lp_2d((1, 1), [(1, 0, "<", 1)])
+
+
+def test_integer_2d_requires_a_bounded_region():
+    constraints = [(-1, -1, ">=", 8), (-5, 1, "<=", 2)]
+    with pytest.raises(ValueError, match="无界"):
+        solve_integer_lp_2d((0, 0), constraints)
+    bounded = constraints + [(1, 0, ">=", -20), (0, 1, ">=", -20)]
+    result = solve_integer_lp_2d((0, 0), bounded)
+    assert result.status == "Optimal"
+    check_feasible(result.x, bounded)
+    assert result.x == (-4, -20)
+
+
+def test_integer_2d_limits_enumerated_columns():
+    box = [
+        (1, 0, ">=", 0),
+        (1, 0, "<=", 10**6),
+        (0, 1, ">=", 0),
+        (0, 1, "<=", 10**6),
+    ]
+    assert solve_integer_lp_2d((1, 1), box, max_columns=1000).status == "Not Solved"
+    # 沿较窄的坐标轴枚举，另一方向再宽也只需逐列计算区间端点
+    strip = box[:2] + [(0, 1, ">=", 0), (0, 1, "<=", 3)]
+    result = solve_integer_lp_2d((1, 1), strip, maximize=True, max_columns=1000)
+    assert result.status == "Optimal" and result.objective == 10**6 + 3
@@ -0,0 +1,129 @@
+import random
+
+import pulp
+import pytest
+
+from maximum_flow import (
+    FlowNetwork,
+    build_max_flow_model,
+    dinic_max_flow,
+    solve_max_flow,
+)
+from solver import solve
+
+
+def random_network(n, density, seed, high=20):
+    """随机生成节点 0..n-1 上的有向网络，源点 0，汇点 n-1"""
+    rng = random.Random(seed)
+    return {
+        (u, v): rng.randint(0, high)
+        for u in range(n)
+        for v in range(n)
+        if u != v and rng.random() < density
+    }
+
+
+def pulp_max_flow(capacities, source, sink):
+    """用 build_max_flow_model 构建 PuLP 模型求最大流值，作为对照"""
+    prob, _ = build_max_flow_model(capacities, source, sink)
+    solve(prob)
+    assert pulp.LpStatus[prob.status] == "Optimal"
+    return pulp.value(prob.objective) or 0
+
+
+def check_flow(capacities, result, source, sink):
+    """检查容量约束、流量守恒，以及最小割容量等于最大流值"""
+    balance = {}
+    for (u, v), f in result.flows.items():
+        assert 0 <= f <= capacities[u, v]
+        balance[u] = balance.get(u, 0) - f
+        balance[v] = balance.get(v, 0) + f
+    for node, net in balance.items():
+        if node not in (source, sink):
+            assert net == 0
+    assert balance.get(sink, 0) == result.value
+    assert source in result.source_side and sink not in result.source_side
+    assert sum(capacities[e] for e in result.cut_edges) == result.value
+
+
+def test_demo_value_matches_pulp(capsys):
+    solve_max_flow("dinic")
+    dinic = capsys.readouterr().out.splitlines()[0]
+    solve_max_flow("pulp")
+    pulp_line = capsys.readouterr().out.splitlines()[0]
+    assert dinic == "从A地到F地的最大运量是：18千人/小时"
+    assert float(pulp_line.split("：")[1].removesuffix("千人/小时")) == 18
+
+
+@pytest.mark.parametrize("seed", range(8))
+@pytest.mark.parametrize("n, density", [(6, 0.5), (12, 0.3), (25, 0.15)])
+def test_dinic_matches_pulp(n, density, seed):
+    capacities = random_network(n, density, seed)
+    capacities.setdefault((0, n - 1), 0)
+    result = dinic_max_flow(capacities, 0, n - 1)
+    assert result.value == pytest.approx(pulp_max_flow(capacities, 0, n - 1))
+    check_flow(capacities, result, 0, n - 1)
+
+
+def test_dinic_rejects_negative_capacity():
+    with pytest.raises(ValueError):
+        dinic_max_flow({("s", "t"): -1}, "s", "t")
+
+
+def test_flow_model_size_is_linear():
+    capacities = random_network(30, 0.2, seed=0)
+    prob, flows = build_max_flow_model(capacities, 0, 29)
+    nodes = {u for edge in capacities for u in edge}
+    assert len(flows) == len(prob.variables()) == len(capacities)
+    assert len(prob.constraints) == len(nodes - {0, 29})
+
+
+def test_flow_model_counts_net_outflow_of_source():
+    # 汇点到源点的回流边不能计入最大流
+    capacities = {("s", "a"): 5, ("a", "t"): 4, ("t", "s"): 3, ("a", "s"): 2}
+    assert pulp_max_flow(capacities, "s", "t") == 4
+    assert dinic_max_flow(capacities, "s", "t").value == 4
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_incremental_capacity_updates_match_pulp(seed):
+    rng = random.Random(seed)
+    capacities = random_network(12, 0.3, seed)
+    capacities.setdefault((0, 11), 0)
+    network = FlowNetwork(capacities)
+    network.max_flow(0, 11)
+    edges = list(capacities)
+    for _ in range(15):
+        edge = rng.choice(edges)
+        if rng.random() < 0.5:
+            capacities[edge] = rng.randint(0, 25)
+            value = network.set_capacity(*edge, capacities[edge])
+        else:
+            delta = rng.randint(-capacities[edge], 10)
+            capacities[edge] += delta
+            value = network.change_capacity(*edge, delta)
+        assert value == pytest.approx(pulp_max_flow(capacities, 0, 11))
+        check_flow(capacities, network.result(), 0, 11)
+
+
+def test_incremental_update_rejects_unknown_edge():
+    network = FlowNetwork({("s", "t"): 1})
+    with pytest.raises(KeyError):
+        network.set_capacity("t", "s", 1)
+
+
+def test_self_loops_carry_no_flow_and_stay_updatable():
+    capacities = {("s", "a"): 5, ("a", "a"): 7, ("a", "t"): 4, ("t", "t"): 2}
+    network = FlowNetwork(capacities)
+    result = network.max_flow("s", "t")
+    assert result.value == pulp_max_flow(capacities, "s", "t") == 4
+    assert result.flows[("a", "a")] == result.flows[("t", "t")] == 0
+    assert network.set_capacity("a", "a", 0) == 4
+    assert network.change_capacity("t", "t", 3) == 4
+    capacities.update({("a", "a"): 0, ("t", "t"): 5})
+    check_flow(capacities, network.result(), "s", "t")
+
+
+def test_max_flow_rejects_equal_source_and_sink():
+    with pytest.raises(ValueError, match="源点和汇点"):
+        dinic_max_flow({("s", "t"): 1}, "s", "s")
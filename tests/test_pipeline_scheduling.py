@@ -0,0 +1,234 @@
+import random
+import time
+from itertools import permutations
+
+import numpy as np
+import pytest
+
+from pipeline_scheduling import (
+    batch_makespan,
+    branch_and_bound_sequence,
+    brute_force_sequence,
+    default_time_limit,
+    find_optimal_schedule,
+    find_optimal_sequence,
+    johnson_schedule,
+    iterated_greedy_sequence,
+    makespan,
+    neh_sequence,
+)
+
+
+def random_times(n, stages, seed, low=1, high=20):
+    """随机生成 n 个作业在各阶段的整数加工时间"""
+    rng = random.Random(seed)
+    return {f"J{j}": {s: rng.randint(low, high) for s in stages} for j in range(n)}
+
+
+@pytest.fixture(scope="module")
+def pulp_makespan(load_script):
+    """用 pipeline_scheduling.1.py 的 PuLP 位置模型求最优最大完工时间，作为对照"""
+    solve_flow_shop = load_script("pipeline_scheduling.1.py")["solve_flow_shop"]
+
+    def optimum(times, stages):
+        result = solve_flow_shop("position", times, stages)
+        assert result is not None
+        return round(result[1])
+
+    return optimum
+
+
+def test_demo_matches_pulp(pulp_makespan):
+    assert find_optimal_sequence() == (("丁", "甲", "乙", "丙"), 84)
+    result = find_optimal_schedule()
+    times = {
+        "甲": {"design": 13, "manufacture": 15, "inspect": 20},
+        "乙": {"design": 10, "manufacture": 20, "inspect": 18},
+        "丙": {"design": 20, "manufacture": 16, "inspect": 10},
+        "丁": {"design": 8, "manufacture": 10, "inspect": 15},
+    }
+    assert result.sequence == ("丁", "甲", "乙", "丙")
+    assert result.makespan == 84 and result.proven
+    assert pulp_makespan(times, list(times["甲"])) == 84
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_johnson_two_stages_matches_pulp(seed, pulp_makespan):
+    stages = ["a", "b"]
+    times = random_times(6, stages, seed)
+    sequence = johnson_schedule(times, stages)
+    assert sorted(sequence) == sorted(times)
+    assert makespan(sequence, times, stages) == pulp_makespan(times, stages)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_johnson_reducible_three_stages_is_optimal(seed):
+    stages = ["a", "b", "c"]
+    times = random_times(6, stages, seed)
+    for t in times.values():
+        # 中间阶段不超过第一阶段的最小值，满足化归条件
+        t["b"] = min(t["b"], 5)
+        t["a"] = max(t["a"], 5)
+    sequence = johnson_schedule(times, stages)
+    assert sequence is not None
+    _, best = brute_force_sequence(times, stages)
+    assert makespan(sequence, times, stages) == best
+
+
+def test_johnson_rejects_irreducible_three_stages():
+    stages = ["a", "b", "c"]
+    times = {"x": {"a": 1, "b": 9, "c": 1}, "y": {"a": 2, "b": 8, "c": 3}}
+    assert johnson_schedule(times, stages) is None
+    with pytest.raises(ValueError):
+        find_optimal_sequence(times, method="johnson")
+
+
+@pytest.mark.parametrize("seed", range(4))
+@pytest.mark.parametrize("n, m", [(5, 3), (7, 4)])
+def test_branch_and_bound_matches_pulp(n, m, seed, pulp_makespan):
+    stages = [f"s{k}" for k in range(m)]
+    times = random_times(n, stages, seed)
+    sequence, span, proven = branch_and_bound_sequence(times, stages)
+    assert proven
+    assert sorted(sequence) == sorted(times)
+    assert makespan(sequence, times, stages) == span == pulp_makespan(times, stages)
+    auto = find_optimal_schedule(times, method="auto", time_limit=5.0)
+    assert auto.proven and auto.makespan == span
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_branch_and_bound_matches_brute_force(seed):
+    rng = random.Random(seed)
+    stages = [f"s{k}" for k in range(rng.randint(2, 5))]
+    # 加工时间范围小时并列的下界多，覆盖双向分支的方向选择
+    times = random_times(rng.randint(2, 7), stages, seed, high=rng.choice([3, 20]))
+    sequence, span, proven = branch_and_bound_sequence(times, stages)
+    assert proven and sorted(sequence) == sorted(times)
+    assert makespan(sequence, times, stages) == span
+    assert span == brute_force_sequence(times, stages)[1]
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("n, high", [(15, 20), (15, 99), (20, 99)])
+def test_branch_and_bound_proves_medium_instances(n, high, seed):
+    stages = [f"s{k}" for k in range(5)]
+    times = random_times(n, stages, seed, high=high)
+    sequence, span, proven = branch_and_bound_sequence(times, stages, time_limit=10)
+    assert proven
+    assert makespan(sequence, times, stages) == span
+    assert span <= iterated_greedy_sequence(times, stages, None, max_iterations=20)[1]
+
+
+def test_branch_and_bound_reports_unproven_on_timeout():
+    stages = [f"s{k}" for k in range(10)]
+    times = random_times(15, stages, seed=0, high=99)
+    sequence, span, proven = branch_and_bound_sequence(times, stages, time_limit=0)
+    assert not proven
+    assert makespan(sequence, times, stages) == span
+    # 显式指定 "bnb" 时同样默认只搜索 1 秒
+    start = time.perf_counter()
+    result = find_optimal_schedule(times, method="bnb")
+    assert time.perf_counter() - start < 5
+    assert makespan(result.sequence, times, stages) == result.makespan
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_neh_and_iterated_greedy_bounded_by_pulp(seed, pulp_makespan):
+    stages = [f"s{k}" for k in range(4)]
+    times = random_times(7, stages, seed)
+    best = pulp_makespan(times, stages)
+    neh, neh_span = neh_sequence(times, stages)
+    assert sorted(neh) == sorted(times)
+    assert makespan(neh, times, stages) == neh_span >= best
+    ig, ig_span = iterated_greedy_sequence(
+        times, stages, time_limit=None, seed=seed, max_iterations=200
+    )
+    assert sorted(ig) == sorted(times)
+    assert makespan(ig, times, stages) == ig_span
+    assert best <= ig_span <= neh_span
+
+
+def test_iterated_greedy_is_reproducible_with_seed():
+    stages = [f"s{k}" for k in range(5)]
+    times = random_times(20, stages, seed=1)
+    runs = [
+        iterated_greedy_sequence(
+            times, stages, time_limit=None, seed=3, max_iterations=30
+        )
+        for _ in range(2)
+    ]
+    assert runs[0] == runs[1]
+    assert runs[0][1] <= neh_sequence(times, stages)[1]
+
+
+def test_iterated_greedy_budget_covers_neh_construction():
+    stages = [f"s{k}" for k in range(10)]
+    times = random_times(600, stages, seed=0, high=99)
+    start = time.perf_counter()
+    sequence, span = iterated_greedy_sequence(times, stages, time_limit=0.02)
+    # 完整的 NEH 构造远超 0.02 秒，超时后剩余作业直接接在末尾
+    assert time.perf_counter() - start < 0.5
+    assert sorted(sequence) == sorted(times)
+    assert makespan(sequence, times, stages) == span
+
+
+def test_iterated_greedy_default_budget_scales_with_size():
+    assert default_time_limit(10, 5) == 1.0
+    assert default_time_limit(2000, 10) == pytest.approx(100.0)
+    stages = [f"s{k}" for k in range(3)]
+    times = random_times(8, stages, seed=2)
+    sequence, span = iterated_greedy_sequence(times, stages)
+    assert span == brute_force_sequence(times, stages)[1]
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_batch_makespan_matches_scalar_and_pulp(seed, pulp_makespan):
+    stages = [f"s{k}" for k in range(4)]
+    times = random_times(6, stages, seed)
+    jobs = list(times)
+    p = np.array([[times[j][s] for s in stages] for j in jobs])
+    sequences = np.array(list(permutations(range(len(jobs)))))
+    spans = batch_makespan(sequences, p)
+    expected = [makespan([jobs[k] for k in seq], times, stages) for seq in sequences]
+    assert spans.tolist() == expected
+    assert spans.min() == pulp_makespan(times, stages)
+
+
+def test_batch_makespan_edge_cases():
+    p = np.array([[3.0, 2.0], [1.0, 4.0]])
+    assert batch_makespan([0, 1], p).tolist() == [9.0]
+    assert batch_makespan(np.empty((2, 0), dtype=int), p).tolist() == [0.0, 0.0]
+    with pytest.raises(ValueError):
+        batch_makespan([0], np.array([1.0, 2.0]))
+
+
+def test_position_and_big_m_demo_output_agree(load_script, capsys):
+    solve_flow_shop = load_script("pipeline_scheduling.1.py")["solve_flow_shop"]
+    solve_flow_shop("position")
+    position = capsys.readouterr().out
+    solve_flow_shop("big_m")
+    assert position == capsys.readouterr().out
+    assert "最优生产顺序：丁->甲->乙->丙" in position
+    assert "最短完成时间：84天" in position
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_position_model_starts_are_left_shifted(seed, load_script):
+    script = load_script("pipeline_scheduling.1.py")
+    stages = [f"s{k}" for k in range(3)]
+    times = random_times(5, stages, seed)
+    for model in ("position", "big_m"):
+        sequence, span, starts = script["solve_flow_shop"](model, times, stages)
+        assert round(span) == makespan(sequence, times, stages)
+        # 每道工序都紧贴本作业上一工序或上一作业同工序的完成时间开始
+        for k, job in enumerate(sequence):
+            for idx, s in enumerate(stages):
+                ready = [0]
+                if idx > 0:
+                    ready.append(
+                        starts[job][stages[idx - 1]] + times[job][stages[idx - 1]]
+                    )
+                if k > 0:
+                    prev = sequence[k - 1]
+                    ready.append(starts[prev][s] + times[prev][s])
+                assert starts[job][s] == max(ready)
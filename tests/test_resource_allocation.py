@@ -0,0 +1,204 @@
+import re
+
+import numpy as np
+import pulp
+import pytest
+
+import resource_allocation
+from resource_allocation import (
+    allocate_resources,
+    solve_material_allocation,
+    sweep_budgets,
+)
+from solver import solve
+
+
+def random_tables(rng, units, levels, concave=False):
+    """随机生成 {单位: {分配量: 收益}}，concave=True 时边际收益单调不增"""
+    tables = {}
+    for u in range(units):
+        if concave:
+            gains = np.sort(rng.integers(0, 20, levels - 1))[::-1]
+        else:
+            gains = rng.integers(-3, 20, levels - 1)
+        profits = np.concatenate([[0], np.cumsum(gains)])
+        tables[f"U{u}"] = {q: int(p) for q, p in enumerate(profits)}
+    return tables
+
+
+def pulp_allocation(tables, budget, exact=True):
+    """PuLP 0-1 规划求最优总收益，作为对照；无可行方案时返回 None"""
+    prob = pulp.LpProblem("对照", pulp.LpMaximize)
+    x = {
+        (u, q): pulp.LpVariable(f"x_{k}", cat="Binary")
+        for k, (u, q) in enumerate((u, q) for u in tables for q in tables[u])
+    }
+    prob += pulp.lpSum(tables[u][q] * var for (u, q), var in x.items())
+    for u in tables:
+        prob += pulp.lpSum(x[u, q] for q in tables[u]) == 1
+    used = pulp.lpSum(q * var for (_, q), var in x.items())
+    prob += used == budget if exact else used <= budget
+    solve(prob)
+    if pulp.LpStatus[prob.status] != "Optimal":
+        return None
+    return pulp.value(prob.objective)
+
+
+def check_allocation(tables, budget, exact, allocation, profit):
+    """检查方案合法且收益与收益表一致"""
+    assert set(allocation) == set(tables)
+    used = sum(allocation.values())
+    assert used == budget if exact else used <= budget
+    assert profit == sum(tables[u][q] for u, q in allocation.items())
+
+
+def test_demo_matches_pulp(capsys):
+    solve_material_allocation("dp")
+    dp = capsys.readouterr().out
+    solve_material_allocation("pulp")
+    reference = capsys.readouterr().out
+    assert dp.startswith("最大利润：17万元")
+    assert reference.startswith("最大利润：17.0万元")
+    assert dp.splitlines()[1:] == reference.splitlines()[1:]
+
+
+@pytest.mark.parametrize("seed", range(8))
+@pytest.mark.parametrize("exact", [True, False])
+def test_dp_matches_pulp(seed, exact):
+    rng = np.random.default_rng(seed)
+    tables = random_tables(rng, 5, 6)
+    for budget in (0, 7, 12, 30):
+        expected = pulp_allocation(tables, budget, exact)
+        if expected is None:
+            with pytest.raises(ValueError):
+                allocate_resources(tables, budget, exact, method="dp")
+            continue
+        allocation, profit = allocate_resources(tables, budget, exact, method="dp")
+        check_allocation(tables, budget, exact, allocation, profit)
+        assert profit == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_divide_and_conquer_backtracking_matches_pulp(seed, monkeypatch):
+    # 档位表上限设为 0，强制走 O(budget) 内存的分治回溯
+    monkeypatch.setattr(resource_allocation, "_CHOICE_LIMIT", 0)
+    rng = np.random.default_rng(seed)
+    tables = random_tables(rng, 7, 5)
+    for exact in (True, False):
+        allocation, profit = allocate_resources(tables, 15, exact, method="dp")
+        check_allocation(tables, 15, exact, allocation, profit)
+        assert profit == pytest.approx(pulp_allocation(tables, 15, exact))
+
+
+def test_dp_rejects_fractional_levels():
+    with pytest.raises(ValueError):
+        allocate_resources({"甲": {0.5: 1}}, 1)
+
+
+@pytest.mark.parametrize("method", ["dp", "auto"])
+def test_empty_level_table_is_rejected(method):
+    tables = {"甲": {0: 0, 1: 4}, "乙": {}}
+    with pytest.raises(ValueError, match="收益表为空"):
+        allocate_resources(tables, 1, method=method)
+    with pytest.raises(ValueError, match="收益表为空"):
+        sweep_budgets(tables, 1, method=method)
+
+
+@pytest.mark.parametrize("seed", range(8))
+@pytest.mark.parametrize("exact", [True, False])
+def test_concave_greedy_matches_pulp(seed, exact):
+    rng = np.random.default_rng(seed)
+    # 前 4 个单位为凹收益表，走边际贪心；其余 2 个单位仍做动态规划
+    tables = random_tables(rng, 4, 6, concave=True)
+    for u, table in random_tables(rng, 2, 6).items():
+        tables[f"N{u}"] = table
+    for budget in (0, 9, 17, 33):
+        expected = pulp_allocation(tables, budget, exact)
+        if expected is None:
+            with pytest.raises(ValueError):
+                allocate_resources(tables, budget, exact)
+            continue
+        allocation, profit = allocate_resources(tables, budget, exact)
+        check_allocation(tables, budget, exact, allocation, profit)
+        assert profit == pytest.approx(expected)
+
+
+def test_concave_units_with_minimum_level():
+    tables = {
+        "甲": {2: 10, 3: 16, 4: 20},
+        "乙": {1: 3, 2: 9, 3: 14, 4: 15},
+        "丙": {0: 0, 1: 4, 2: 6, 3: 11},
+    }
+    for budget in range(3, 12):
+        for exact in (True, False):
+            expected = pulp_allocation(tables, budget, exact)
+            allocation, profit = allocate_resources(tables, budget, exact)
+            check_allocation(tables, budget, exact, allocation, profit)
+            assert profit == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("method", ["dp", "auto"])
+@pytest.mark.parametrize("exact", [True, False])
+def test_budget_sweep_matches_pulp(seed, method, exact):
+    rng = np.random.default_rng(seed)
+    tables = random_tables(rng, 3, 5, concave=True)
+    tables.update({f"N{u}": t for u, t in random_tables(rng, 2, 5).items()})
+    budget = 22
+    sweep = sweep_budgets(tables, budget, exact, method)
+    assert len(sweep.profits) == len(sweep.allocations) == budget + 1
+    for b in range(budget + 1):
+        expected = pulp_allocation(tables, b, exact)
+        if expected is None:
+            assert sweep.allocations[b] is None and sweep.profits[b] == -np.inf
+            continue
+        check_allocation(tables, b, exact, sweep.allocations[b], sweep.profits[b])
+        assert sweep.profits[b] == pytest.approx(expected)
+
+
+# 演示脚本的收益表 {单位: {分配量: 收益}}、总量与是否必须恰好分完
+INVESTMENT_TABLES = {
+    "甲": {1: 4, 2: 6, 3: 9, 4: 10},
+    "乙": {1: 3, 2: 9, 3: 10, 4: 11},
+    "丙": {1: 5, 2: 8, 3: 11, 4: 15},
+}
+STORE_TABLES = {
+    "甲": {1: 4, 2: 6, 3: 7, 4: 7, 5: 7},
+    "乙": {1: 2, 2: 4, 3: 6, 4: 8, 5: 9},
+    "丙": {1: 3, 2: 6, 3: 7, 4: 8, 5: 8},
+    "丁": {1: 4, 2: 5, 3: 6, 4: 6, 5: 6},
+}
+
+
+@pytest.mark.parametrize(
+    "filename, function, tables, budget, exact, optimum",
+    [
+        (
+            "assignment_problem.3.py",
+            "solve_investment",
+            INVESTMENT_TABLES,
+            4,
+            False,
+            18,
+        ),
+        ("assignment_problem.5.py", "solve_assignment", STORE_TABLES, 5, True, 16),
+    ],
+)
+@pytest.mark.parametrize("backend", ["dp", "pulp"])
+def test_knapsack_demos_print_optimal_plans(
+    demo_output, filename, function, tables, budget, exact, optimum, backend
+):
+    # 存在并列最优解，不同后端可能输出不同方案，因此逐行检查方案可行且达到最优值
+    output = demo_output(filename, function, backend)
+    assert re.match(rf"最大\w+：{optimum}百", output)
+    plan = re.findall(r"(?:项目|商店)(\S)(?:投资|分配)(\d+)\D+?(\d+)百", output)
+    units = [u for u, _, _ in plan]
+    assert len(units) == len(set(units))
+    for u, amount, profit in plan:
+        assert tables[u][int(amount)] == int(profit)
+    used = sum(int(amount) for _, amount, _ in plan)
+    assert used == budget if exact else used <= budget
+    assert sum(int(profit) for _, _, profit in plan) == optimum
+    assert pulp_allocation(
+        {u: {0: 0, **t} for u, t in tables.items()}, budget, exact
+    ) == pytest.approx(optimum)
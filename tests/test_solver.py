@@ -0,0 +1,223 @@
+import numpy as np
+import pulp
+import pytest
+
+import solver
+from solver import (
+    available_solvers,
+    matrix_backend,
+    set_default_solver,
+    solve,
+    solve_matrix,
+    solver_name,
+)
+
+try:
+    from scipy import sparse
+except ImportError:
+    sparse = None
+
+# 进程内 HiGHS（highspy）与 scipy 都是可选依赖，未安装时跳过依赖它们的用例
+requires_highs = pytest.mark.skipif(
+    "HiGHS" not in available_solvers(), reason="未安装 highspy"
+)
+requires_scipy = pytest.mark.skipif(sparse is None, reason="未安装 scipy")
+MATRIX_BACKENDS = [
+    pytest.param("highs", marks=requires_highs),
+    pytest.param("scipy", marks=requires_scipy),
+    "pulp",
+]
+
+
+@pytest.fixture(autouse=True)
+def restore_default_solver(monkeypatch):
+    """每个测试结束后恢复自动选择，避免影响其他测试"""
+    monkeypatch.delenv(solver.SOLVER_ENV, raising=False)
+    yield
+    set_default_solver(None)
+
+
+def random_lp(rng, n, m, integer=False):
+    """随机生成有界可行的 max c·x，A x <= b，0 <= x <= 10 的 PuLP 模型"""
+    prob = pulp.LpProblem("随机模型", pulp.LpMaximize)
+    cat = "Integer" if integer else "Continuous"
+    x = [pulp.LpVariable(f"x{j}", 0, 10, cat=cat) for j in range(n)]
+    prob += pulp.lpSum(float(c) * v for c, v in zip(rng.integers(-5, 10, n), x))
+    for _ in range(m):
+        row = rng.integers(0, 8, n)
+        prob += pulp.lpSum(float(a) * v for a, v in zip(row, x)) <= float(
+            rng.integers(10, 60)
+        )
+    return prob
+
+
+@requires_highs
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("integer", [False, True])
+def test_in_process_solver_matches_cbc(seed, integer):
+    objectives = {}
+    for name in ("HiGHS", "PULP_CBC_CMD"):
+        prob = random_lp(np.random.default_rng(seed), 8, 5, integer)
+        solve(prob, solver=name)
+        assert pulp.LpStatus[prob.status] == "Optimal"
+        objectives[name] = pulp.value(prob.objective)
+    assert objectives["HiGHS"] == pytest.approx(objectives["PULP_CBC_CMD"])
+
+
+@requires_highs
+def test_solver_selection_priority(monkeypatch):
+    assert "HiGHS" in available_solvers()
+    assert solver_name() == "HiGHS"
+    monkeypatch.setenv(solver.SOLVER_ENV, "PULP_CBC_CMD")
+    assert solver_name() == "PULP_CBC_CMD"
+    set_default_solver("HiGHS")
+    assert solver_name() == "HiGHS"
+    assert solver_name("PULP_CBC_CMD") == "PULP_CBC_CMD"
+
+
+def test_unknown_solver_is_rejected():
+    with pytest.raises(ValueError):
+        set_default_solver("没有这个求解器")
+    with pytest.raises(ValueError):
+        solver_name("没有这个求解器")
+
+
+def test_available_solvers_is_cached_and_refreshed(monkeypatch):
+    calls = []
+
+    def list_solvers(onlyAvailable=False):
+        calls.append(onlyAvailable)
+        return ["HiGHS", "PULP_CBC_CMD"]
+
+    set_default_solver(None)
+    monkeypatch.setattr(pulp, "listSolvers", list_solvers)
+    available_solvers()
+    available_solvers()
+    assert calls.count(True) == 1
+    set_default_solver("HiGHS")
+    available_solvers()
+    assert calls.count(True) == 2
+
+
+@requires_highs
+def test_matrix_backend_follows_configured_solver(monkeypatch):
+    assert matrix_backend() == "highs"
+    set_default_solver("PULP_CBC_CMD")
+    assert matrix_backend() == "pulp"
+    set_default_solver("HiGHS")
+    assert matrix_backend() == "highs"
+    set_default_solver(None)
+    monkeypatch.setenv(solver.SOLVER_ENV, "PULP_CBC_CMD")
+    assert matrix_backend() == "pulp"
+    assert matrix_backend("scipy") == "scipy"
+    with pytest.raises(ValueError):
+        matrix_backend("没有这个后端")
+
+
+def random_matrix_model(rng, n, m_ub, m_eq):
+    """随机生成有界且可行的矩阵模型 (c, A_ub, b_ub, A_eq, b_eq)，可行点取 x0"""
+    x0 = rng.integers(0, 5, n).astype(float)
+    A_ub = rng.integers(-2, 6, (m_ub, n)).astype(float)
+    A_eq = rng.integers(0, 4, (m_eq, n)).astype(float)
+    b_ub = A_ub @ x0 + rng.integers(0, 10, m_ub)
+    return rng.integers(-9, 10, n).astype(float), A_ub, b_ub, A_eq, A_eq @ x0
+
+
+def pulp_matrix(c, A_ub, b_ub, A_eq, b_eq, ub, integer, maximize):
+    """把矩阵模型逐个系数写成 PuLP 模型求解，作为对照"""
+    sense = pulp.LpMaximize if maximize else pulp.LpMinimize
+    prob = pulp.LpProblem("矩阵对照", sense)
+    cat = "Integer" if integer else "Continuous"
+    x = [pulp.LpVariable(f"x{j}", 0, ub, cat=cat) for j in range(len(c))]
+    prob += pulp.lpSum(float(cj) * v for cj, v in zip(c, x))
+    for row, b in zip(A_ub, b_ub):
+        prob += pulp.lpSum(float(a) * v for a, v in zip(row, x)) <= float(b)
+    for row, b in zip(A_eq, b_eq):
+        prob += pulp.lpSum(float(a) * v for a, v in zip(row, x)) == float(b)
+    solve(prob, solver="PULP_CBC_CMD")
+    assert pulp.LpStatus[prob.status] == "Optimal"
+    return pulp.value(prob.objective)
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("integer", [False, True])
+@pytest.mark.parametrize("backend", MATRIX_BACKENDS)
+def test_solve_matrix_matches_pulp_model(seed, integer, backend):
+    rng = np.random.default_rng(seed)
+    c, A_ub, b_ub, A_eq, b_eq = random_matrix_model(rng, 7, 4, 2)
+    for maximize in (False, True):
+        expected = pulp_matrix(c, A_ub, b_ub, A_eq, b_eq, 8, integer, maximize)
+        result = solve_matrix(
+            c,
+            A_ub,
+            b_ub,
+            A_eq,
+            b_eq,
+            ub=8,
+            integrality=integer,
+            maximize=maximize,
+            backend=backend,
+        )
+        assert result.status == "Optimal"
+        assert result.objective == pytest.approx(expected, abs=1e-6)
+        assert (A_ub @ result.x <= b_ub + 1e-6).all()
+        assert np.allclose(A_eq @ result.x, b_eq, atol=1e-6)
+
+
+@pytest.mark.parametrize("backend", MATRIX_BACKENDS)
+def test_solve_matrix_sums_duplicate_coo_entries(backend):
+    rng = np.random.default_rng(0)
+    c, A_ub, b_ub, A_eq, b_eq = random_matrix_model(rng, 5, 3, 1)
+    dense = solve_matrix(c, A_ub, b_ub, A_eq, b_eq, ub=8, backend=backend)
+    # 每个非零元拆成两个重复的三元组，并打乱顺序
+    row, col = np.nonzero(A_ub)
+    data = A_ub[row, col]
+    order = rng.permutation(2 * len(data))
+    coo = (
+        np.concatenate([data / 4, data * 3 / 4])[order],
+        np.tile(row, 2)[order],
+        np.tile(col, 2)[order],
+    )
+    split = solve_matrix(c, coo, b_ub, A_eq, b_eq, ub=8, backend=backend)
+    assert split.objective == pytest.approx(dense.objective)
+    if sparse is not None:
+        # 直接由 (data, indices, indptr) 构造的 CSR 保留重复且乱序的列下标
+        by_row = np.lexsort((order, coo[1]))
+        csr = sparse.csr_matrix(
+            (
+                coo[0][by_row],
+                coo[2][by_row],
+                np.searchsorted(coo[1][by_row], np.arange(len(b_ub) + 1)),
+            ),
+            shape=A_ub.shape,
+        )
+        assert not csr.has_canonical_format
+        for A in (csr, csr.tocoo()):
+            result = solve_matrix(c, A, b_ub, A_eq, b_eq, ub=8, backend=backend)
+            assert result.objective == pytest.approx(dense.objective)
+
+
+def test_solve_matrix_reports_infeasible():
+    result = solve_matrix([1.0], [[1.0]], [-1.0])
+    assert result.status == "Infeasible"
+    assert result.x is None and result.objective is None
+    with pytest.raises(ValueError):
+        solve_matrix([1.0], [[1.0]], None)
+
+
+@pytest.mark.parametrize(
+    "filename, function, native",
+    [
+        ("assignment_problem.py", "solve_assignment_problem", "hungarian"),
+        ("assignment_problem.2.py", "solve_transportation", "simplex"),
+        ("resource_allocation.py", "solve_material_allocation", "dp"),
+    ],
+)
+@pytest.mark.parametrize(
+    "name", [pytest.param("HiGHS", marks=requires_highs), "PULP_CBC_CMD"]
+)
+def test_matrix_demos_match_native(demo_output, filename, function, native, name):
+    expected = demo_output(filename, function, native)
+    # 同一个开关同时决定 solve_matrix 的后端
+    set_default_solver(name)
+    assert demo_output(filename, function, "matrix") == expected
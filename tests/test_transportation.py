@@ -0,0 +1,203 @@
+import numpy as np
+import pulp
+import pytest
+
+from solver import solve
+
+
+@pytest.fixture(scope="module")
+def transportation(load_script):
+    return load_script("assignment_problem.2.py")
+
+
+def pulp_transportation(transportation, supply, demand, lanes):
+    """用稀疏 PuLP 运输模型求最小成本，作为对照；供应点与需求点以下标命名"""
+    build = transportation["build_sparse_transportation_model"]
+    prob, _ = build(dict(enumerate(supply)), dict(enumerate(demand)), lanes)
+    solve(prob)
+    assert pulp.LpStatus[prob.status] == "Optimal"
+    return pulp.value(prob.objective) or 0
+
+
+def random_instance(rng, m, n, forbidden=0.0):
+    """随机生成供应量不小于需求量的运输问题，forbidden 为禁止线路的比例"""
+    demand = rng.integers(1, 30, n).astype(float)
+    supply = rng.integers(1, 30, m).astype(float)
+    supply *= np.ceil(demand.sum() / supply.sum())
+    cost = rng.integers(1, 50, (m, n)).astype(float)
+    cost[rng.random((m, n)) < forbidden] = np.inf
+    return supply, demand, cost
+
+
+def check_result(result, supply, demand, cost):
+    """检查运量非负、供需约束成立，且总成本与运量一致"""
+    flows = result.flows
+    assert (flows >= -1e-9).all()
+    assert np.allclose(flows.sum(axis=1) + result.unused_supply, supply)
+    assert np.allclose(flows.sum(axis=0), demand)
+    assert not np.any(result.unmet_demand > 1e-9)
+    used = flows > 1e-9
+    assert np.isfinite(cost[used]).all()
+    assert result.cost == pytest.approx((flows[used] * cost[used]).sum())
+
+
+@pytest.mark.parametrize("backend", ["pulp"])
+def test_demo_output_matches(transportation, backend, capsys):
+    transportation["solve_transportation"]("simplex")
+    simplex = capsys.readouterr().out
+    transportation["solve_transportation"](backend)
+    assert simplex == capsys.readouterr().out
+    assert simplex.startswith("最小运输成本：83.0万元")
+
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("m, n, forbidden", [(3, 4, 0.0), (6, 5, 0.0), (8, 12, 0.3)])
+def test_dense_simplex_matches_pulp(transportation, m, n, forbidden, seed):
+    rng = np.random.default_rng(seed)
+    supply, demand, cost = random_instance(rng, m, n, forbidden)
+    lanes = [
+        (i, j, cost[i, j]) for i in range(m) for j in range(n) if cost[i, j] < np.inf
+    ]
+    try:
+        expected = pulp_transportation(transportation, supply, demand, lanes)
+    except ValueError:
+        with pytest.raises(ValueError):
+            transportation["transportation_simplex"](supply, demand, cost)
+        return
+    result = transportation["transportation_simplex"](supply, demand, cost)
+    check_result(result, supply, demand, cost)
+    assert result.cost == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_triple_simplex_matches_pulp(transportation, seed):
+    rng = np.random.default_rng(seed)
+    m, n = 15, 20
+    supply, demand, cost = random_instance(rng, m, n)
+    # 每个需求点至少保留一条线路，其余线路随机稀疏化
+    keep = rng.random((m, n)) < 0.4
+    keep[rng.integers(0, m, n), np.arange(n)] = True
+    cost[~keep] = np.inf
+    lanes = [(i, j, cost[i, j]) for i, j in zip(*np.nonzero(keep))]
+    try:
+        expected = pulp_transportation(transportation, supply, demand, lanes)
+    except ValueError:
+        with pytest.raises(ValueError):
+            transportation["transportation_simplex"](supply, demand, lanes=lanes)
+        return
+    result = transportation["transportation_simplex"](supply, demand, lanes=lanes)
+    check_result(result, supply, demand, cost)
+    assert result.cost == pytest.approx(expected)
+
+
+def test_simplex_reports_unmet_demand_when_supply_is_short(transportation):
+    cost = np.array([[1.0, 2.0], [3.0, 1.0]])
+    result = transportation["transportation_simplex"]([5, 5], [8, 6], cost)
+    assert result.unmet_demand.sum() == pytest.approx(4)
+    assert result.flows.sum() == pytest.approx(10)
+
+
+def test_simplex_max_iterations_guard(transportation):
+    rng = np.random.default_rng(0)
+    supply, demand, _ = random_instance(rng, 6, 6)
+    lanes = [(i, j, float(rng.integers(1, 50))) for i in range(6) for j in range(6)]
+    with pytest.raises(ValueError):
+        transportation["transportation_simplex"](
+            supply, demand, lanes=lanes, max_iterations=1
+        )
+
+
+def test_sparse_model_only_creates_given_lanes(transportation):
+    lanes = [("A", "X", 3), ("A", "Y", 1), ("B", "Y", 2)]
+    prob, x = transportation["build_sparse_transportation_model"](
+        {"A": 5, "B": 4}, {"X": 3, "Y": 6}, lanes
+    )
+    assert set(x) == {("A", "X"), ("A", "Y"), ("B", "Y")}
+    assert len(prob.variables()) == 3
+    solve(prob)
+    assert pulp.value(prob.objective) == pytest.approx(3 * 3 + 2 * 1 + 4 * 2)
+
+
+def test_supply_constraints_are_equalities_only_when_balanced(transportation):
+    lanes = [("A", "X", 3), ("A", "Y", 1), ("B", "Y", 2)]
+    build = transportation["build_sparse_transportation_model"]
+    prob, _ = build({"A": 5, "B": 4}, {"X": 3, "Y": 6}, lanes)
+    assert all(c.sense == pulp.LpConstraintEQ for c in prob.constraints.values())
+
+    prob, x = build({"A": 7, "B": 4}, {"X": 3, "Y": 6}, lanes)
+    senses = [c.sense for c in prob.constraints.values()]
+    assert senses.count(pulp.LpConstraintLE) == 2
+    solve(prob)
+    assert pulp.value(prob.objective) == pytest.approx(3 * 3 + 4 * 1 + 2 * 2)
+    assert sum(v.value() for v in x.values()) == pytest.approx(9)
+
+
+def test_duplicate_lanes_keep_the_cheapest(transportation):
+    lanes = [("A", "X", 3), ("A", "Y", 1), ("A", "X", 2), ("B", "Y", 2), ("A", "X", 5)]
+    supply, demand = {"A": 5, "B": 4}, {"X": 3, "Y": 6}
+    prob, x = transportation["build_sparse_transportation_model"](supply, demand, lanes)
+    assert set(x) == {("A", "X"), ("A", "Y"), ("B", "Y")}
+    assert set(prob.variables()) == set(x.values())
+    solve(prob)
+    expected = 3 * 2 + 2 * 1 + 4 * 2
+    assert pulp.value(prob.objective) == pytest.approx(expected)
+    assert sum(v.value() for v in x.values()) == pytest.approx(9)
+    c, *_, keys = transportation["build_transportation_arrays"](supply, demand, lanes)
+    assert sorted(zip(keys, c)) == [(("A", "X"), 2), (("A", "Y"), 1), (("B", "Y"), 2)]
+
+
+@pytest.mark.parametrize(
+    "supply, demand, lanes",
+    [
+        ({"A": 3}, {"X": 4}, [("A", "X", 1)]),
+        ({"A": 5, "B": 5}, {"X": 2, "Y": 2}, [("A", "X", 1)]),
+        # X、Y 只能由 A 供应，总需求 6 超过 A 的供应量 5
+        (
+            {"A": 5, "B": 5},
+            {"X": 3, "Y": 3, "Z": 1},
+            [("A", "X", 1), ("A", "Y", 1), ("B", "Z", 1)],
+        ),
+    ],
+)
+def test_infeasible_lanes_are_rejected(transportation, supply, demand, lanes):
+    with pytest.raises(ValueError, match="无可行解"):
+        transportation["build_sparse_transportation_model"](supply, demand, lanes)
+    with pytest.raises(ValueError, match="无可行解"):
+        transportation["build_transportation_arrays"](supply, demand, lanes)
+    index = {s: i for i, s in enumerate(supply)} | {d: j for j, d in enumerate(demand)}
+    triples = [(index[s], index[d], c) for s, d, c in lanes]
+    if sum(supply.values()) >= sum(demand.values()):
+        with pytest.raises(ValueError):
+            transportation["transportation_simplex"](
+                list(supply.values()), list(demand.values()), lanes=triples
+            )
+
+
+def test_feasibility_check_accepts_empty_input(transportation):
+    check = transportation["check_transportation_feasibility"]
+    check({}, {}, [])
+    check({"A": 1}, {}, [])
+    check({}, {"X": 0}, [])
+    result = transportation["transportation_simplex"]([], [], lanes=[])
+    assert result.cost == 0
+
+
+def test_simplex_takes_lane_arrays_only_through_lanes(transportation):
+    simplex = transportation["transportation_simplex"]
+    triples = np.array([[0, 0, 1], [1, 1, 1], [2, 2, 1]])
+    supply = demand = [5, 5, 5]
+    # 3×3 的三元组数组作为 lanes 时只有对角线路，作为 costs 时是稠密成本矩阵
+    assert simplex(supply, demand, lanes=triples).cost == pytest.approx(15)
+    assert simplex(supply, demand, lanes=list(triples)).cost == pytest.approx(15)
+    dense = [(i, j, triples[i, j]) for i in range(3) for j in range(3)]
+    assert simplex(supply, demand, triples).cost == pytest.approx(
+        pulp_transportation(transportation, supply, demand, dense)
+    )
+    with pytest.raises(ValueError, match="形状"):
+        simplex(supply, demand, np.array([[0, 0, 1], [1, 1, 1]]))
+    with pytest.raises(ValueError, match="形状"):
+        simplex(supply, demand, lanes=np.ones((3, 2)))
+    with pytest.raises(ValueError):
+        simplex(supply, demand)
+    with pytest.raises(ValueError):
+        simplex(supply, demand, triples, lanes=triples)